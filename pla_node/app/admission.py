@@ -0,0 +1,152 @@
+"""
+Admission control for PLA Node ingest.
+- Token buckets keyed by device_id and by API key (or client address when no key is sent)
+- A global cap on ingest requests being handled at once
+- Limits can be changed at runtime; existing buckets pick up the new rate immediately
+
+Not thread-safe: call it from the event loop only.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RateLimiter:
+    """Token buckets (rate tokens/second, up to burst) for many keys, LRU-bounded.
+
+    rate <= 0 disables the limiter. A request costing more than burst is let
+    through once the bucket is full and leaves the bucket in debt.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 50000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = burst
+        if not self.enabled:
+            self._buckets.clear()
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Take cost tokens; returns 0 if admitted, else seconds until it would be."""
+        if not self.enabled:
+            return 0.0
+        now = self._clock()
+        burst = max(self.burst, 1.0)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [burst, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        needed = min(cost, burst)
+        if bucket[0] >= needed:
+            bucket[0] -= cost
+            return 0.0
+        return (needed - bucket[0]) / self.rate
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        device_rate: float = 0.0,
+        device_burst: float = 0.0,
+        key_rate: float = 0.0,
+        key_burst: float = 0.0,
+        max_in_flight: int = 0,
+        max_keys: int = 50000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.devices = RateLimiter(device_rate, device_burst, max_keys=max_keys, clock=clock)
+        self.keys = RateLimiter(key_rate, key_burst, max_keys=max_keys, clock=clock)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected: Dict[str, int] = {"device_rate": 0, "key_rate": 0, "in_flight": 0}
+
+    def enter(self) -> bool:
+        """Claim an in-flight slot; pair every True with leave()."""
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            self.rejected["in_flight"] += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def leave(self) -> None:
+        self.in_flight -= 1
+
+    def check_key(self, key: str, cost: float = 1.0) -> float:
+        wait = self.keys.acquire(key, cost)
+        if wait:
+            self.rejected["key_rate"] += 1
+        return wait
+
+    def check_device(self, device_id: str, cost: float = 1.0) -> float:
+        wait = self.devices.acquire(device_id, cost)
+        if wait:
+            self.rejected["device_rate"] += 1
+        return wait
+
+    def configure(self, limits: Dict[str, Any]) -> None:
+        """Apply a partial update; raises ValueError on unknown or negative values."""
+        unknown = set(limits) - set(self.limits())
+        if unknown:
+            raise ValueError(f"unknown limits: {', '.join(sorted(unknown))}")
+        for name, value in limits.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{name} must be a non-negative number")
+        if "device_rate" in limits or "device_burst" in limits:
+            self.devices.configure(limits.get("device_rate"), limits.get("device_burst"))
+        if "key_rate" in limits or "key_burst" in limits:
+            self.keys.configure(limits.get("key_rate"), limits.get("key_burst"))
+        if "max_in_flight" in limits:
+            self.max_in_flight = int(limits["max_in_flight"])
+
+    def limits(self) -> Dict[str, float]:
+        return {
+            "device_rate": self.devices.rate,
+            "device_burst": self.devices.burst,
+            "key_rate": self.keys.rate,
+            "key_burst": self.keys.burst,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.limits(),
+            "in_flight": self.in_flight,
+            "tracked_devices": len(self.devices),
+            "tracked_keys": len(self.keys),
+            "rejected": dict(self.rejected),
+        }
+
+
+def retry_after_header(wait: float) -> str:
+    """Whole seconds for a Retry-After header, at least 1."""
+    return str(max(1, math.ceil(wait)))
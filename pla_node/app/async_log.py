@@ -0,0 +1,110 @@
+"""
+Non-blocking log pipeline for the PLA Node hot path.
+- emit() only appends a preformatted line to a bounded in-memory ring
+- A dedicated writer thread drains the ring in batches into a sink (file handler)
+- Overflow policy when the ring is full:
+    drop_debug_first  evict the oldest debug line to make room; drop the new line if none
+    block             wait for the writer to make room (applies backpressure to the caller)
+    drop_new          drop the new line
+  Every dropped line is counted per level.
+"""
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+POLICIES = ("drop_debug_first", "block", "drop_new")
+
+Sink = Callable[[List[str]], None]
+
+
+class AsyncLogWriter:
+    """Bounded ring buffer with a background writer thread."""
+
+    def __init__(self, sink: Sink, capacity: int = 10000, policy: str = "drop_debug_first", batch_size: int = 500):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown log overflow policy {policy!r}; expected one of {POLICIES}")
+        self.sink = sink
+        self.capacity = max(1, capacity)
+        self.policy = policy
+        self.batch_size = max(1, batch_size)
+        self.dropped: Dict[str, int] = {"debug": 0, "info": 0}
+        self.written = 0
+        self.sink_errors = 0
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        # Debug and other lines live in separate queues so debug can be evicted
+        # first; sequence numbers restore the original order when draining.
+        self._debug: Deque[Tuple[int, str]] = deque()
+        self._main: Deque[Tuple[int, str]] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._debug) + len(self._main)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._cond:
+            if self.running:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="pla-node-log-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is buffered and stop the writer thread."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def emit(self, line: str, level: str = "info") -> bool:
+        """Queue one line; returns False if it was dropped."""
+        debug = level == "debug"
+        with self._cond:
+            if self.depth >= self.capacity:
+                if self.policy == "block" and self.running:
+                    while self.depth >= self.capacity and self.running:
+                        self._cond.wait(0.1)
+                elif self.policy == "drop_debug_first" and not debug and self._debug:
+                    self._debug.popleft()
+                    self.dropped["debug"] += 1
+                else:
+                    self.dropped["debug" if debug else "info"] += 1
+                    return False
+            (self._debug if debug else self._main).append((next(self._seq), line))
+            self._cond.notify_all()
+        return True
+
+    def _take(self) -> List[str]:
+        batch: List[str] = []
+        while len(batch) < self.batch_size and (self._debug or self._main):
+            if not self._debug or (self._main and self._main[0][0] < self._debug[0][0]):
+                batch.append(self._main.popleft()[1])
+            else:
+                batch.append(self._debug.popleft()[1])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self.depth and not self._stopping:
+                    self._cond.wait()
+                if not self.depth and self._stopping:
+                    return
+                batch = self._take()
+                self._cond.notify_all()
+            try:
+                self.sink(batch)
+                self.written += len(batch)
+            except Exception:  # noqa: BLE001
+                self.sink_errors += 1
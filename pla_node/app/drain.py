@@ -0,0 +1,130 @@
+"""
+Spool drain engine for PLA Node.
+- Reads the spool from its cursor in chunks and replays up to `parallelism` chunks at once
+- Commits the longest delivered prefix so the cursor never skips an undelivered record
+- Exponential backoff with jitter after failures, reset on the first success
+- Optional rate cap (events/second) so a recovering Brain Receiver is not stampeded
+- Tracks recent throughput and an estimated time-to-empty for /status
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .spool import SegmentedSpool, SpoolGroup, SpoolPosition
+
+Deliver = Callable[[List[bytes]], Awaitable[None]]
+
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+class SpoolDrainer:
+    """Replays spooled records in parallel batches until the spool is empty."""
+
+    def __init__(
+        self,
+        spool: Union[SegmentedSpool, SpoolGroup],
+        deliver: Deliver,
+        batch_size: int = 100,
+        parallelism: int = 4,
+        max_rate: float = 0.0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        idle_interval: float = 3.0,
+    ) -> None:
+        self.spool = spool
+        self.deliver = deliver
+        self.batch_size = max(1, batch_size)
+        self.parallelism = max(1, parallelism)
+        self.max_rate = max_rate
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.idle_interval = idle_interval
+        self.drained_total = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.backoff_seconds = 0.0
+        self._next_send = 0.0
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_total = 0
+
+    async def run(self) -> None:
+        while True:
+            records = await asyncio.to_thread(self.spool.read_batch, self.batch_size * self.parallelism)
+            if not records:
+                await asyncio.to_thread(self.spool.sync)
+                await asyncio.sleep(self.idle_interval)
+                continue
+            delivered = await self.drain_once(records)
+            if delivered < len(records):
+                self.backoff_seconds = self._backoff()
+                await asyncio.sleep(self.backoff_seconds)
+
+    async def drain_once(self, records: List[Tuple[bytes, SpoolPosition]]) -> int:
+        """Replay one read of records; returns how many were committed."""
+        chunks = [records[i : i + self.batch_size] for i in range(0, len(records), self.batch_size)]
+        await self._throttle(len(records))
+        outcomes = await asyncio.gather(
+            *(self.deliver([line for line, _ in chunk]) for chunk in chunks),
+            return_exceptions=True,
+        )
+        committed = 0
+        last_position: Optional[SpoolPosition] = None
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, BaseException):
+                self.failures += 1
+                self.last_error = str(outcome)
+                break
+            committed += len(chunk)
+            last_position = chunk[-1][1]
+        if last_position is not None:
+            await asyncio.to_thread(self.spool.commit, last_position, committed)
+            self.drained_total += committed
+            self._window.append((time.monotonic(), committed))
+            self._window_total += committed
+        if committed == len(records):
+            self.failures = 0
+            self.backoff_seconds = 0.0
+        return committed
+
+    def throughput(self) -> float:
+        """Events/second drained over the recent window."""
+        now = time.monotonic()
+        while self._window and now - self._window[0][0] > THROUGHPUT_WINDOW_SECONDS:
+            self._window_total -= self._window.popleft()[1]
+        if not self._window:
+            return 0.0
+        span = max(now - self._window[0][0], 1.0)
+        return self._window_total / span
+
+    def stats(self) -> Dict[str, Any]:
+        rate = self.throughput()
+        depth = self.spool.depth
+        return {
+            "batch_size": self.batch_size,
+            "parallelism": self.parallelism,
+            "max_rate": self.max_rate,
+            "drained_total": self.drained_total,
+            "throughput_eps": round(rate, 2),
+            "eta_seconds": int(depth / rate) if rate > 0 else (0 if depth == 0 else None),
+            "consecutive_failures": self.failures,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "last_error": self.last_error,
+        }
+
+    def _backoff(self) -> float:
+        # Equal jitter: half the exponential step is fixed, half is random.
+        cap = min(self.backoff_max, self.backoff_base * (2 ** max(0, self.failures - 1)))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def _throttle(self, count: int) -> None:
+        if self.max_rate <= 0:
+            return
+        now = time.monotonic()
+        if self._next_send > now:
+            await asyncio.sleep(self._next_send - now)
+            now = self._next_send
+        self._next_send = now + count / self.max_rate
@@ -0,0 +1,229 @@
+"""
+Precompiled validator for the flat event envelope schema (contracts/event.schema.json).
+
+The schema is compiled once into per-property check closures that run in the
+same keyword order as jsonschema, so the first error raised carries the same
+message, path and validator name as Draft202012Validator(...).validate().
+Only the keywords the envelope uses are supported; anything else raises
+UnsupportedSchema so callers can fall back to jsonschema.
+
+Kept in sync with software/brain_receiver/event_validator.py;
+the test suites of both services fail if the two copies differ.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jsonschema import Draft202012Validator, FormatChecker, ValidationError
+
+# Keywords that never produce errors.
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "examples", "default"}
+
+Check = Callable[[Any], Optional[Tuple[str, str, Any]]]
+
+
+class UnsupportedSchema(ValueError):
+    """The schema uses keywords the fast path does not implement."""
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "null": lambda value: value is None,
+}
+
+
+def _compile_type(types: Any) -> Check:
+    names = [types] if isinstance(types, str) else list(types)
+    try:
+        checks = [_TYPE_CHECKS[name] for name in names]
+    except KeyError as exc:
+        raise UnsupportedSchema(f"unsupported type {exc.args[0]!r}") from None
+    reprs = ", ".join(repr(name) for name in names)
+
+    def check(value: Any) -> Optional[Tuple[str, str, Any]]:
+        for is_type in checks:
+            if is_type(value):
+                return None
+        return "type", f"{value!r} is not of type {reprs}", types
+
+    return check
+
+
+def _compile_min_length(limit: int) -> Check:
+    def check(value: Any) -> Optional[Tuple[str, str, Any]]:
+        if isinstance(value, str) and len(value) < limit:
+            return "minLength", f"{value!r} is too short", limit
+        return None
+
+    return check
+
+
+def _compile_minimum(limit: Any) -> Check:
+    def check(value: Any) -> Optional[Tuple[str, str, Any]]:
+        if _is_number(value) and value < limit:
+            return "minimum", f"{value!r} is less than the minimum of {limit!r}", limit
+        return None
+
+    return check
+
+
+def _compile_format(name: str, format_checker: Optional[FormatChecker]) -> Optional[Check]:
+    # Mirror jsonschema: formats without a registered checker are not asserted.
+    if format_checker is None or name not in format_checker.checkers:
+        return None
+    func, raises = format_checker.checkers[name]
+
+    def check(value: Any) -> Optional[Tuple[str, str, Any]]:
+        try:
+            if func(value):
+                return None
+        except raises:
+            pass
+        return "format", f"{value!r} is not a {name!r}", name
+
+    return check
+
+
+def _compile_property(subschema: Dict[str, Any], format_checker: Optional[FormatChecker]) -> List[Check]:
+    checks: List[Check] = []
+    for keyword, value in subschema.items():
+        if keyword in _ANNOTATIONS:
+            continue
+        if keyword == "type":
+            checks.append(_compile_type(value))
+        elif keyword == "minLength":
+            checks.append(_compile_min_length(value))
+        elif keyword == "minimum":
+            checks.append(_compile_minimum(value))
+        elif keyword == "format":
+            check = _compile_format(value, format_checker)
+            if check is not None:
+                checks.append(check)
+        else:
+            raise UnsupportedSchema(f"unsupported property keyword {keyword!r}")
+    return checks
+
+
+class EnvelopeValidator:
+    """Drop-in replacement for Draft202012Validator.validate on flat object schemas."""
+
+    def __init__(self, schema: Dict[str, Any], format_checker: Optional[FormatChecker] = None) -> None:
+        self.schema = schema
+        self._steps: List[str] = []
+        self._type: Optional[Check] = None
+        self._additional_allowed = True
+        self._required: Sequence[str] = ()
+        self._properties: List[Tuple[str, Dict[str, Any], List[Check]]] = []
+        for keyword, value in schema.items():
+            if keyword in _ANNOTATIONS:
+                continue
+            if keyword == "type":
+                self._type = _compile_type(value)
+            elif keyword == "additionalProperties":
+                if not isinstance(value, bool):
+                    raise UnsupportedSchema("additionalProperties must be a boolean")
+                self._additional_allowed = value
+            elif keyword == "required":
+                self._required = value
+            elif keyword == "properties":
+                self._properties = [
+                    (name, subschema, _compile_property(subschema, format_checker))
+                    for name, subschema in value.items()
+                ]
+            else:
+                raise UnsupportedSchema(f"unsupported keyword {keyword!r}")
+            self._steps.append(keyword)
+        self._known = frozenset(name for name, _, _ in self._properties)
+
+    def validate(self, instance: Any) -> None:
+        for step in self._steps:
+            if step == "type":
+                assert self._type is not None
+                failure = self._type(instance)
+                if failure is not None:
+                    raise self._error(failure, instance, self.schema, (), ("type",))
+            elif not isinstance(instance, dict):
+                # additionalProperties / required / properties only apply to objects.
+                continue
+            elif step == "additionalProperties":
+                if not self._additional_allowed:
+                    extras = [key for key in instance if key not in self._known]
+                    if extras:
+                        raise self._additional_error(extras, instance)
+            elif step == "required":
+                for name in self._required:
+                    if name not in instance:
+                        failure = ("required", f"{name!r} is a required property", self._required)
+                        raise self._error(failure, instance, self.schema, (), ("required",))
+            elif step == "properties":
+                for name, subschema, checks in self._properties:
+                    if name not in instance:
+                        continue
+                    value = instance[name]
+                    for check in checks:
+                        failure = check(value)
+                        if failure is not None:
+                            raise self._error(
+                                failure, value, subschema, (name,), ("properties", name, failure[0])
+                            )
+
+    def is_valid(self, instance: Any) -> bool:
+        try:
+            self.validate(instance)
+        except ValidationError:
+            return False
+        return True
+
+    @staticmethod
+    def _error(
+        failure: Tuple[str, str, Any],
+        instance: Any,
+        schema: Dict[str, Any],
+        path: Sequence[Any],
+        schema_path: Sequence[Any],
+    ) -> ValidationError:
+        keyword, message, value = failure
+        return ValidationError(
+            message,
+            validator=keyword,
+            validator_value=value,
+            instance=instance,
+            schema=schema,
+            path=deque(path),
+            schema_path=deque(schema_path),
+        )
+
+    def _additional_error(self, extras: List[Any], instance: Any) -> ValidationError:
+        extras = sorted(set(extras), key=str)
+        verb = "was" if len(extras) == 1 else "were"
+        joined = ", ".join(repr(extra) for extra in extras)
+        failure = (
+            "additionalProperties",
+            f"Additional properties are not allowed ({joined} {verb} unexpected)",
+            False,
+        )
+        return self._error(failure, instance, self.schema, (), ("additionalProperties",))
+
+
+def build_validator(schema: Dict[str, Any], format_checker: Optional[FormatChecker] = None) -> Any:
+    """Fast envelope validator when the schema allows it, jsonschema otherwise."""
+    try:
+        return EnvelopeValidator(schema, format_checker=format_checker)
+    except UnsupportedSchema:
+        return Draft202012Validator(schema, format_checker=format_checker)
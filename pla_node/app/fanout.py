@@ -0,0 +1,128 @@
+"""
+In-memory fan-out of accepted events to live subscribers (GET /events/stream).
+- publish() never blocks or awaits: it appends the already-encoded event to each
+  matching subscriber's bounded queue
+- Subscribers filter server-side by device_id and/or event_type
+- Slow consumers: "drop_oldest" discards the oldest queued event and counts it;
+  "disconnect" closes the subscription once its queue is full
+
+Not thread-safe: call it from the event loop only.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, List, Optional
+
+POLICIES = ("drop_oldest", "disconnect")
+
+
+class Subscriber:
+    def __init__(
+        self,
+        device_ids: FrozenSet[str],
+        event_types: FrozenSet[str],
+        queue_size: int,
+        policy: str,
+    ) -> None:
+        self.device_ids = device_ids
+        self.event_types = event_types
+        self.policy = policy
+        self.queue: Deque[bytes] = deque(maxlen=max(1, queue_size))
+        self.dropped = 0
+        self.unreported_drops = 0
+        self.delivered = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def matches(self, payload: Dict[str, Any]) -> bool:
+        if self.device_ids and payload.get("device_id") not in self.device_ids:
+            return False
+        return not self.event_types or payload.get("event_type") in self.event_types
+
+    def offer(self, encoded: bytes) -> None:
+        if len(self.queue) == self.queue.maxlen:
+            if self.policy == "disconnect":
+                self.close()
+                return
+            self.dropped += 1
+            self.unreported_drops += 1
+        self.queue.append(encoded)
+        self._ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next queued event; None on timeout. Raises EOFError once closed and drained."""
+        while not self.queue:
+            if self.closed:
+                raise EOFError
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self.delivered += 1
+        return self.queue.popleft()
+
+
+class EventHub:
+    def __init__(self, queue_size: int = 1000, policy: str = "drop_oldest", max_subscribers: int = 100) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown slow-consumer policy {policy!r}; expected one of {POLICIES}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.disconnected = 0
+        self._dropped_gone = 0
+        self._subscribers: List[Subscriber] = []
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, device_ids=(), event_types=()) -> Optional[Subscriber]:
+        """New subscription, or None when max_subscribers are already connected."""
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(frozenset(device_ids), frozenset(event_types), self.queue_size, self.policy)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            self._dropped_gone += subscriber.dropped
+        subscriber.close()
+
+    def publish(self, payload: Dict[str, Any], encoded: bytes) -> None:
+        if not self._subscribers:
+            return
+        self.published += 1
+        for subscriber in self._subscribers:
+            if subscriber.closed or not subscriber.matches(payload):
+                continue
+            subscriber.offer(encoded)
+            if subscriber.closed:
+                self.disconnected += 1
+
+    def close(self) -> None:
+        for subscriber in list(self._subscribers):
+            self.unsubscribe(subscriber)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped_gone + sum(subscriber.dropped for subscriber in self._subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "queue_size": self.queue_size,
+            "policy": self.policy,
+            "published": self.published,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
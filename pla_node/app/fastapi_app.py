@@ -1,17 +1,39 @@
 """
 FastAPI-based PLA Node gateway.
 - Validates incoming events against contracts/event.schema.json
+- Accepts batches of events (JSON array or NDJSON) at /ingest/batch
 - Optional API key guard via header X-API-Key
-- Forwards events to Brain Receiver at 127.0.0.1:8788/event with X-Request-ID
-- Spools failed forwards to pla_node/spool and retries in the background
-- Exposes host introspection endpoints for operations
+- Forwards events to Brain Receiver in micro-batches (127.0.0.1:8788/events) over a pooled
+  asyncio client; /ingest returns 503 + Retry-After when the forward queue is full
+- Balances batches across several Brain Receivers with per-endpoint circuit breakers and
+  health-checked ejection; with none available, batches are spooled immediately
+- Optional passthrough mode forwards the client's original JSON bytes as NDJSON with a
+  content hash instead of re-encoding the parsed event
+- Journals every accepted event (group-committed fsync) before answering 202; the journal
+  cursor advances only once Brain Receiver acknowledges the batch or the event is spooled
+- Spools failed forwards to an append-only segment log in pla_node/spool and drains it in
+  parallel batches with jittered backoff and a rate cap
+- Tracks per-device sequence numbers: drops duplicate (device_id, seq) pairs, counts gaps
+  and out-of-order arrivals, and reports per-device loss rates at /devices
+- Admission control on /ingest*: token buckets per device_id and per API key (429) and a
+  global in-flight cap (503), adjustable at runtime via PUT /limits
+- Streams accepted events to live subscribers as Server-Sent Events at /events/stream
+- Writes NDJSON logs from a background thread fed by a bounded ring buffer
+- Runs under several uvicorn workers (PLA_WORKERS): each worker spools and journals in
+  its own slot directory, one elected worker drains every spool, and /metrics and
+  /status merge the workers' published snapshots
+- Exposes Prometheus metrics (latency histograms, per-outcome counters, queue gauges) at /metrics
+- Exposes host introspection endpoints for operations, read from /proc and /sys where
+  possible; subprocess-backed probes are served from a cache refreshed in the background
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import platform
+import re
 import shutil
 import subprocess
 import threading
@@ -21,19 +43,53 @@ from datetime import datetime, timezone
 from json import JSONDecodeError
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 from uuid import uuid4
 
-import requests
-from fastapi import BackgroundTasks, Depends, FastAPI, Header, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
-from jsonschema import Draft202012Validator, FormatChecker, ValidationError
+from fastapi import Depends, FastAPI, Header, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from jsonschema import FormatChecker, ValidationError
+
+from . import codec, host_info, workers
+from .admission import AdmissionController, retry_after_header
+from .async_log import AsyncLogWriter
+from .drain import SpoolDrainer
+from .event_validator import build_validator
+from .fanout import EventHub
+from .forwarder import Forwarder
+from .journal import IngestJournal
+from .metrics_registry import Registry, merge_collections, render_collection
+from .probe_cache import ProbeCache
+from .seq_tracker import DUPLICATE, GAP, NEW, RESET, SequenceTracker
+from .spool import SegmentedSpool, SpoolGroup, SpoolPosition
+from .upstreams import UpstreamPool
 
 APP_VERSION = "0.3.0"
 BRAIN_RECEIVER_URL = os.getenv("BRAIN_RECEIVER_URL", "http://127.0.0.1:8788/event")
+BRAIN_RECEIVER_BATCH_URL = os.getenv(
+    "BRAIN_RECEIVER_BATCH_URL", BRAIN_RECEIVER_URL.rsplit("/", 1)[0] + "/events"
+)
+BRAIN_RECEIVER_BATCH_URLS = [
+    url.strip() for url in os.getenv("BRAIN_RECEIVER_BATCH_URLS", BRAIN_RECEIVER_BATCH_URL).split(",") if url.strip()
+]
+RECEIVER_POLICY = os.getenv("PLA_RECEIVER_POLICY", "round_robin")
+RECEIVER_ATTEMPTS = int(os.getenv("PLA_RECEIVER_ATTEMPTS", "2"))
+RECEIVER_HEALTH_INTERVAL = float(os.getenv("PLA_RECEIVER_HEALTH_INTERVAL", "5"))
+BREAKER_FAILURES = int(os.getenv("PLA_BREAKER_FAILURES", "3"))
+BREAKER_OPEN_SECONDS = float(os.getenv("PLA_BREAKER_OPEN_SECONDS", "10"))
 PORT = int(os.getenv("PLA_NODE_PORT", "8787"))
 API_KEY = os.getenv("PLA_API_KEY")
 EVENT_VERSION = os.getenv("PLA_EVENT_VERSION", "1.0")
+BATCH_MAX_ITEMS = int(os.getenv("PLA_BATCH_MAX_ITEMS", "5000"))
+FORWARD_CONCURRENCY = int(os.getenv("PLA_FORWARD_CONCURRENCY", "8"))
+FORWARD_QUEUE_SIZE = int(os.getenv("PLA_FORWARD_QUEUE_SIZE", "10000"))
+FORWARD_TIMEOUT = float(os.getenv("PLA_FORWARD_TIMEOUT", "3.0"))
+FORWARD_BATCH_SIZE = int(os.getenv("PLA_FORWARD_BATCH_SIZE", "100"))
+FORWARD_FLUSH_MS = int(os.getenv("PLA_FORWARD_FLUSH_MS", "50"))
+FORWARD_DRAIN_SECONDS = float(os.getenv("PLA_FORWARD_DRAIN_SECONDS", "10"))
+FORWARD_MODE = os.getenv("PLA_FORWARD_MODE", "encode")
+if FORWARD_MODE not in ("encode", "passthrough"):
+    raise RuntimeError(f"PLA_FORWARD_MODE must be 'encode' or 'passthrough', got {FORWARD_MODE!r}")
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 SCHEMA_PATH = REPO_ROOT / "contracts" / "event.schema.json"
@@ -43,10 +99,52 @@ if not SCHEMA_PATH.exists():
 with SCHEMA_PATH.open("r", encoding="utf-8") as schema_file:
     EVENT_SCHEMA: Dict[str, Any] = json.load(schema_file)
 
-VALIDATOR = Draft202012Validator(EVENT_SCHEMA, format_checker=FormatChecker())
+VALIDATOR = build_validator(EVENT_SCHEMA, format_checker=FormatChecker())
 
-SPOOL_DIR = REPO_ROOT / "pla_node" / "spool"
+SPOOL_DIR = Path(os.getenv("PLA_SPOOL_DIR", str(REPO_ROOT / "pla_node" / "spool")))
 SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+SPOOL_SEGMENT_BYTES = int(os.getenv("PLA_SPOOL_SEGMENT_BYTES", "4000000"))
+SPOOL_FSYNC_BATCH = int(os.getenv("PLA_SPOOL_FSYNC_BATCH", "256"))
+SPOOL_FSYNC_MS = int(os.getenv("PLA_SPOOL_FSYNC_MS", "1000"))
+SPOOL_IDLE_SECONDS = 3.0
+JOURNAL_ENABLED = os.getenv("PLA_JOURNAL", "1") != "0"
+JOURNAL_DIR = Path(os.getenv("PLA_JOURNAL_DIR", str(REPO_ROOT / "pla_node" / "journal")))
+JOURNAL_COMMIT_MS = float(os.getenv("PLA_JOURNAL_COMMIT_MS", "0"))
+# Off by default: a batch charges one token per item, so a device sending batches
+# larger than PLA_DEVICE_BURST would have the excess rejected.
+DEVICE_RATE = float(os.getenv("PLA_DEVICE_RATE", "0"))
+DEVICE_BURST = float(os.getenv("PLA_DEVICE_BURST", "100"))
+KEY_RATE = float(os.getenv("PLA_KEY_RATE", "0"))
+KEY_BURST = float(os.getenv("PLA_KEY_BURST", "0"))
+MAX_IN_FLIGHT = int(os.getenv("PLA_MAX_IN_FLIGHT", "256"))
+PROBE_TIMEOUT = float(os.getenv("PLA_PROBE_TIMEOUT", "5"))
+PROBE_USB_TTL = float(os.getenv("PLA_PROBE_USB_TTL", "30"))
+PROBE_IP_TTL = float(os.getenv("PLA_PROBE_IP_TTL", "30"))
+PROBE_DOCKER_TTL = float(os.getenv("PLA_PROBE_DOCKER_TTL", "10"))
+PROBE_IDLE_SECONDS = float(os.getenv("PLA_PROBE_IDLE_SECONDS", "300"))
+STREAM_QUEUE_SIZE = int(os.getenv("PLA_STREAM_QUEUE_SIZE", "1000"))
+STREAM_SLOW_POLICY = os.getenv("PLA_STREAM_SLOW_POLICY", "drop_oldest")
+STREAM_MAX_SUBSCRIBERS = int(os.getenv("PLA_STREAM_MAX_SUBSCRIBERS", "100"))
+STREAM_KEEPALIVE_SECONDS = 15.0
+SEQ_DEDUP = os.getenv("PLA_SEQ_DEDUP", "1") != "0"
+SEQ_WINDOW = int(os.getenv("PLA_SEQ_WINDOW", "1024"))
+SEQ_MAX_DEVICES = int(os.getenv("PLA_SEQ_MAX_DEVICES", "50000"))
+DRAIN_BATCH_SIZE = int(os.getenv("PLA_DRAIN_BATCH_SIZE", "100"))
+DRAIN_PARALLELISM = int(os.getenv("PLA_DRAIN_PARALLELISM", "4"))
+DRAIN_MAX_RATE = float(os.getenv("PLA_DRAIN_MAX_RATE", "500"))
+DRAIN_BACKOFF_MS = int(os.getenv("PLA_DRAIN_BACKOFF_MS", "500"))
+DRAIN_BACKOFF_MAX_MS = int(os.getenv("PLA_DRAIN_BACKOFF_MAX_MS", "30000"))
+WORKERS = int(os.getenv("PLA_WORKERS", "1"))
+STATE_DIR = Path(os.getenv("PLA_STATE_DIR", str(REPO_ROOT / "pla_node" / "state")))
+METRICS_SYNC_MS = int(os.getenv("PLA_METRICS_SYNC_MS", "1000"))
+WORKER_SCAN_SECONDS = 5.0
+
+# Multi-worker mode: this process owns one slot; its spool and journal live in slot subdirectories.
+worker_slot: Optional[workers.FileLock] = None
+WORKER_NAME = "main"
+if WORKERS > 1:
+    _slot_index, worker_slot = workers.claim_slot(STATE_DIR, WORKERS * 2)
+    WORKER_NAME = workers.slot_name(_slot_index)
 
 start_monotonic = time.monotonic()
 
@@ -58,38 +156,202 @@ metrics: Dict[str, Any] = {
     "forward_failure_count": 0,
 }
 
-spool_lock = threading.Lock()
+spool = SegmentedSpool(
+    SPOOL_DIR / WORKER_NAME if worker_slot else SPOOL_DIR,
+    segment_max_bytes=SPOOL_SEGMENT_BYTES,
+    fsync_batch=SPOOL_FSYNC_BATCH,
+    fsync_interval=SPOOL_FSYNC_MS / 1000,
+    # With several workers the drain owner replays this spool through its own follower.
+    write_only=worker_slot is not None,
+)
+journal = IngestJournal(
+    SegmentedSpool(JOURNAL_DIR / WORKER_NAME if worker_slot else JOURNAL_DIR, segment_max_bytes=SPOOL_SEGMENT_BYTES),
+    commit_interval=JOURNAL_COMMIT_MS / 1000,
+)
 metrics_lock = threading.Lock()
-retry_thread: Optional[threading.Thread] = None
-
-LOG_PATH = REPO_ROOT / "logs" / "events.ndjson"
+admission = AdmissionController(
+    device_rate=DEVICE_RATE,
+    device_burst=DEVICE_BURST,
+    key_rate=KEY_RATE,
+    key_burst=KEY_BURST,
+    max_in_flight=MAX_IN_FLIGHT,
+)
+event_hub = EventHub(
+    queue_size=STREAM_QUEUE_SIZE, policy=STREAM_SLOW_POLICY, max_subscribers=STREAM_MAX_SUBSCRIBERS
+)
+seq_tracker = SequenceTracker(window=SEQ_WINDOW, max_devices=SEQ_MAX_DEVICES)
+retry_task: Optional[asyncio.Task] = None
+drainer: Optional[SpoolDrainer] = None
+# Multi-worker mode only: the drain lease, the spools its holder replays, and metric snapshots.
+drain_lease = workers.FileLock(STATE_DIR / "drain.lock")
+drain_group = SpoolGroup()
+snapshots = workers.SnapshotStore(STATE_DIR, WORKER_NAME) if worker_slot else None
+snapshot_task: Optional[asyncio.Task] = None
+upstreams = UpstreamPool(
+    BRAIN_RECEIVER_BATCH_URLS,
+    policy=RECEIVER_POLICY,
+    failure_threshold=BREAKER_FAILURES,
+    open_seconds=BREAKER_OPEN_SECONDS,
+    health_interval=RECEIVER_HEALTH_INTERVAL,
+)
+forwarder = Forwarder(
+    BRAIN_RECEIVER_BATCH_URLS[0],
+    concurrency=FORWARD_CONCURRENCY,
+    queue_size=FORWARD_QUEUE_SIZE,
+    timeout=FORWARD_TIMEOUT,
+    batch_size=FORWARD_BATCH_SIZE,
+    flush_interval=FORWARD_FLUSH_MS / 1000,
+    drain_timeout=FORWARD_DRAIN_SECONDS,
+)
+
+LOG_PATH = Path(os.getenv("PLA_LOG_PATH", str(REPO_ROOT / "logs" / "pla_node.ndjson")))
+if worker_slot:
+    # RotatingFileHandler cannot share a file between processes.
+    LOG_PATH = LOG_PATH.with_name(f"{LOG_PATH.stem}.{WORKER_NAME}{LOG_PATH.suffix}")
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 logger = logging.getLogger("pla_node")
 logger.setLevel(logging.INFO)
-_file_handler = RotatingFileHandler(LOG_PATH, maxBytes=5_000_000, backupCount=5)
+# delay: the file is created on the first record, not when the module is imported.
+_file_handler = RotatingFileHandler(LOG_PATH, maxBytes=5_000_000, backupCount=5, delay=True)
 _file_handler.setFormatter(logging.Formatter("%(message)s"))
 logger.handlers = [_file_handler]
 logger.propagate = False
+LOG_BUFFER_LINES = int(os.getenv("PLA_LOG_BUFFER_LINES", "10000"))
+LOG_OVERFLOW_POLICY = os.getenv("PLA_LOG_OVERFLOW", "drop_debug_first")
+LOG_WRITE_BATCH = int(os.getenv("PLA_LOG_WRITE_BATCH", "500"))
+log_writer = AsyncLogWriter(
+    lambda lines: logger.info("\n".join(lines)),
+    capacity=LOG_BUFFER_LINES,
+    policy=LOG_OVERFLOW_POLICY,
+    batch_size=LOG_WRITE_BATCH,
+)
+
+class QueuedEvent(NamedTuple):
+    """Accepted event plus its one-time encoding, reused for spooling and forwarding."""
+
+    payload: Dict[str, Any]
+    request_id: str
+    encoded: bytes
+    position: Optional[SpoolPosition] = None  # journal record, acked once handed over
+
+
+def _new_drainer(source: Any) -> SpoolDrainer:
+    return SpoolDrainer(
+        source,
+        _replay_batch,
+        batch_size=DRAIN_BATCH_SIZE,
+        parallelism=DRAIN_PARALLELISM,
+        max_rate=DRAIN_MAX_RATE,
+        backoff_base=DRAIN_BACKOFF_MS / 1000,
+        backoff_max=DRAIN_BACKOFF_MAX_MS / 1000,
+        idle_interval=SPOOL_IDLE_SECONDS,
+    )
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    global retry_thread
-    log_json("pla_node_start", version=APP_VERSION, port=PORT)
-    if retry_thread is None or not retry_thread.is_alive():
-        retry_thread = threading.Thread(target=_process_spool_loop, daemon=True)
-        retry_thread.start()
-    yield
+    global retry_task, drainer, snapshot_task
+    log_writer.start()
+    log_json("pla_node_start", version=APP_VERSION, port=PORT, worker=WORKER_NAME)
+    if worker_slot is None:
+        # With several workers the drain owner imports these instead.
+        await asyncio.to_thread(_import_legacy_spool, spool)
+    journal.start()
+    recovered = await asyncio.to_thread(journal.recover, spool)
+    if recovered:
+        log_json("journal_recovered", records=recovered)
+    await forwarder.start(_forward_batch_or_spool)
+    await upstreams.start()
+    if worker_slot is None:
+        drainer = _new_drainer(spool)
+        retry_task = asyncio.create_task(drainer.run())
+    else:
+        retry_task = asyncio.create_task(_run_drain_election())
+        snapshot_task = asyncio.create_task(_publish_snapshots())
+    probes.start()
+    try:
+        yield
+    finally:
+        background = [task for task in (retry_task, snapshot_task) if task is not None]
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        if snapshots is not None:
+            snapshots.remove()
+            drain_lease.release()
+            drain_group.close()
+        await probes.stop()
+        event_hub.close()
+        # Queued events were already answered 202: forward or spool them before exiting.
+        await forwarder.stop()
+        await upstreams.stop()
+        # Batches cut off here stay unacknowledged and are recovered on the next start.
+        await journal.stop()
+        journal.spool.close()
+        spool.close()
+        await asyncio.to_thread(log_writer.stop)
 
 
 app = FastAPI(title="PLA Node", version=APP_VERSION, docs_url=None, redoc_url=None, lifespan=lifespan)
 
+REGISTRY = Registry()
+INGEST_SECONDS = REGISTRY.histogram(
+    "pla_node_ingest_duration_seconds", "Time to handle an ingest request.", ["endpoint", "status"]
+)
+JSON_PARSE_SECONDS = REGISTRY.histogram(
+    "pla_node_json_parse_duration_seconds", "Time to decode an ingest request body.", ["endpoint"]
+)
+VALIDATION_SECONDS = REGISTRY.histogram(
+    "pla_node_validation_duration_seconds", "Time to validate one event against the schema."
+)
+FORWARD_SECONDS = REGISTRY.histogram(
+    "pla_node_forward_duration_seconds",
+    "Round trip of one forwarded batch to Brain Receiver.",
+    ["source", "outcome"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+EVENTS_TOTAL = REGISTRY.counter(
+    "pla_node_events_total", "Events seen at ingest by outcome.", ["event_type", "device_class", "outcome"]
+)
+VALIDATION_FAILURES = REGISTRY.counter(
+    "pla_node_validation_failures_total", "Events rejected by schema validation.", ["validator"]
+)
+JOURNAL_SECONDS = REGISTRY.histogram(
+    "pla_node_journal_append_seconds", "Time an ingest request waits for its journal group commit."
+)
+FORWARD_BATCHES = REGISTRY.counter(
+    "pla_node_forward_batches_total", "Batches sent to Brain Receiver.", ["source", "outcome"]
+)
+_DEVICE_CLASS_RE = re.compile(r"[A-Za-z]+")
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _backlog() -> Any:
+    """The spool(s) this process drains: its own spool, every slot's spool, or none."""
+    if worker_slot is None:
+        return spool
+    return drain_group if drain_lease.held else None
+
+
 def _spool_queue_depth() -> int:
-    return len(list(SPOOL_DIR.glob("*.ndjson")))
+    return _spool_gauges()["depth"]
+
+
+def _spool_gauges() -> Dict[str, Any]:
+    """Backlog gauges from in-memory counters; safe to call on every scrape."""
+    source = _backlog()
+    if source is None:
+        return {"depth": 0, "bytes": 0, "oldest_age_seconds": None, "drain_rate_eps": 0.0}
+    age = source.oldest_age()
+    return {
+        "depth": source.depth,
+        "bytes": source.pending_bytes,
+        "oldest_age_seconds": round(age, 3) if age is not None else None,
+        "drain_rate_eps": round(drainer.throughput(), 2) if drainer else 0.0,
+    }
 
 
 def _event_id(payload: Dict[str, Any]) -> str:
@@ -104,107 +366,343 @@ def _request_id(payload: Dict[str, Any], header_rid: Optional[str]) -> str:
     return payload.get("request_id") or str(uuid4())
 
 
-def log_json(message: str, **extra: Any) -> None:
+def log_json(message: str, level: str = "info", **extra: Any) -> None:
+    """Queue one NDJSON log line; the writer thread does the file I/O.
+
+    level="debug" marks high-volume per-event lines that the overflow policy may drop first.
+    """
     entry = {"ts": _now_iso(), "msg": message}
     entry.update(extra)
-    logger.info(json.dumps(entry, separators=(",", ":")))
+    log_writer.emit(codec.dumps_text(entry), level)
 
 
 def _validate_event(payload: Dict[str, Any]) -> None:
-    VALIDATOR.validate(payload)
-    if payload.get("event_version") != EVENT_VERSION:
-        raise ValidationError(f"event_version must be '{EVENT_VERSION}'")
-
-
-def _write_spool(payload: Dict[str, Any]) -> None:
-    filename = f"event-{int(time.time()*1000)}-{threading.get_ident()}.ndjson"
-    path = SPOOL_DIR / filename
-    with spool_lock:
-        with path.open("w", encoding="utf-8") as fp:
-            fp.write(json.dumps(payload, separators=(",", ":")) + "\n")
+    start = time.perf_counter()
+    try:
+        VALIDATOR.validate(payload)
+        if payload.get("event_version") != EVENT_VERSION:
+            raise ValidationError(f"event_version must be '{EVENT_VERSION}'", validator="event_version")
+    except ValidationError as err:
+        VALIDATION_FAILURES.inc(validator=str(err.validator))
+        raise
+    finally:
+        VALIDATION_SECONDS.observe(time.perf_counter() - start)
+
+
+def _device_class(device_id: Any) -> str:
+    """Bounded label for a device: its leading alphabetic prefix (esp32-07 -> esp)."""
+    match = _DEVICE_CLASS_RE.match(device_id) if isinstance(device_id, str) else None
+    return match.group(0).lower()[:32] if match else "other"
+
+
+def _count_event(payload: Any, outcome: str) -> None:
+    if isinstance(payload, dict):
+        event_type = payload.get("event_type")
+        device_class = _device_class(payload.get("device_id"))
+    else:
+        event_type, device_class = None, "other"
+    EVENTS_TOTAL.inc(
+        event_type=event_type if isinstance(event_type, str) else "unknown",
+        device_class=device_class,
+        outcome=outcome,
+    )
 
 
-def _forward_event(payload: Dict[str, Any], request_id: str, timeout: float = 3.0) -> None:
-    resp = requests.post(
-        BRAIN_RECEIVER_URL,
-        json=payload,
-        headers={"X-Request-ID": request_id},
-        timeout=timeout,
-    )
+def _is_duplicate(payload: Dict[str, Any], pending: Optional[Set[Tuple[str, int]]] = None) -> bool:
+    """True if this (device_id, seq) was already accepted; the duplicate is counted.
+
+    pending holds keys seen earlier in the same batch and is updated in place.
+    """
+    if not SEQ_DEDUP:
+        return False
+    key = (payload["device_id"], int(payload["seq"]))
+    if (pending is None or key not in pending) and not seq_tracker.is_duplicate(*key, payload.get("ts")):
+        if pending is not None:
+            pending.add(key)
+        return False
+    seq_tracker.record_duplicate(payload["device_id"])
+    _count_event(payload, "duplicate")
+    return True
+
+
+def _track_sequence(payload: Dict[str, Any]) -> None:
+    """Record an accepted event; called only once it is queued so a 503 can be retried."""
+    device_id = payload["device_id"]
+    seq = int(payload["seq"])
+    verdict = seq_tracker.observe(device_id, seq, payload.get("ts"))
+    if verdict == NEW or verdict == DUPLICATE:
+        return
+    if verdict == GAP:
+        log_json("seq_gap", device_id=device_id, seq=seq, missing=seq_tracker.device(device_id)["missing"])
+    elif verdict == RESET:
+        log_json("seq_reset", device_id=device_id, seq=seq)
+    else:
+        log_json("seq_out_of_order", level="debug", device_id=device_id, seq=seq)
+
+
+def _validation_detail(err: ValidationError) -> str:
+    path = "/".join([str(p) for p in err.path])
+    return err.message if not path else f"{err.message} at {path}"
+
+
+def _encode(payload: Dict[str, Any], raw: Optional[bytes]) -> bytes:
+    """Bytes to spool and forward: the client's own line in passthrough mode, else a fresh encoding."""
+    if FORWARD_MODE == "passthrough" and raw is not None:
+        line = codec.single_line(raw)
+        if line is not None:
+            return line
+    return codec.dumps(payload)
+
+
+def _parse_batch(body: bytes, content_type: str) -> List[Tuple[Any, Optional[bytes]]]:
+    """Split a batch body into (item, raw bytes) pairs: a JSON array, or NDJSON (one event per line).
+
+    Only NDJSON lines carry their raw bytes; array items have raw None. Lines that
+    fail to parse are returned as a JSONDecodeError instance so the caller can
+    reject that index without failing the whole batch.
+    """
+    if "ndjson" in content_type:
+        items: List[Tuple[Any, Optional[bytes]]] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append((codec.loads(line), line))
+            except JSONDecodeError as exc:
+                items.append((exc, None))
+        return items
+    parsed = codec.loads(body)
+    if not isinstance(parsed, list):
+        raise ValueError("batch body must be a JSON array")
+    return [(item, None) for item in parsed]
+
+
+def _import_legacy_spool(target: SegmentedSpool) -> None:
+    """Move events left by the old one-file-per-event spool into the segment log."""
+    legacy = sorted(SPOOL_DIR.glob("event-*.ndjson"))
+    if not legacy:
+        return
+    for path in legacy:
+        records = [line.strip().encode("utf-8") for line in path.read_text(encoding="utf-8").splitlines()]
+        target.append([record for record in records if record])
+        path.unlink(missing_ok=True)
+    target.sync()
+    log_json("spool_legacy_imported", files=len(legacy))
+
+
+def _observe_forward(source: str, outcome: str, start: float) -> None:
+    FORWARD_SECONDS.observe(time.perf_counter() - start, source=source, outcome=outcome)
+    FORWARD_BATCHES.inc(source=source, outcome=outcome)
+
+
+async def _journal_append(encoded: List[bytes]) -> List[Optional[SpoolPosition]]:
+    if not JOURNAL_ENABLED:
+        return [None] * len(encoded)
+    with JOURNAL_SECONDS.time():
+        return await journal.append(encoded)
+
+
+def _spool_handoff(encoded: List[bytes]) -> None:
+    """Spool failed events; fsync first when their journal records are about to be released."""
+    spool.append(encoded)
+    if JOURNAL_ENABLED:
+        spool.sync()
+
+
+async def _submit(events: List[QueuedEvent]) -> bool:
+    """Journal events, then queue them for forwarding.
+
+    False (and nothing kept) when the forward queue is full; the client retries.
+    """
+    if not forwarder.has_room(len(events)):
+        return False
+    positions = await _journal_append([event.encoded for event in events])
+    journaled = [event._replace(position=position) for event, position in zip(events, positions)]
+    if forwarder.try_submit(journaled):
+        return True
+    # The queue filled up while this request waited for its group commit.
+    await journal.ack(positions)
+    return False
+
+
+def _journal_unavailable_response(exc: Exception) -> JSONResponse:
+    log_json("journal_write_failed", error=str(exc))
+    return JSONResponse({"ok": False, "error": "journal_unavailable"}, status_code=503, headers={"Retry-After": "1"})
+
+
+async def _forward_batch(encoded: List[bytes], request_id: str) -> Dict[str, Any]:
+    """Send one batch to a Brain Receiver, failing over to another endpoint up to RECEIVER_ATTEMPTS times.
+
+    Raises if no endpoint acknowledged it; when every endpoint is ejected or its breaker
+    is open this happens without any network I/O.
+    """
+    headers: Optional[Dict[str, str]] = None
+    if FORWARD_MODE == "passthrough":
+        body = codec.join_lines(encoded)
+        headers = {"Content-Type": "application/x-ndjson", codec.CONTENT_HASH_HEADER: codec.content_hash(body)}
+    else:
+        body = codec.join_array(encoded)
+    tried = []
+    error: Optional[Exception] = None
+    for _ in range(max(1, RECEIVER_ATTEMPTS)):
+        lease = upstreams.acquire(exclude=tried)
+        if lease is None:
+            break
+        tried.append(lease.upstream)
+        try:
+            result = await _post_to_receiver(lease.url, body, headers, request_id)
+        except Exception as exc:  # noqa: BLE001
+            upstreams.release(lease, ok=False, error=str(exc))
+            error = exc
+            continue
+        except BaseException:
+            upstreams.release(lease, ok=None)
+            raise
+        upstreams.release(lease, ok=True)
+        return result
+    if error is None:
+        raise RuntimeError("no Brain Receiver available")
+    raise error
+
+
+async def _post_to_receiver(
+    url: str, body: bytes, headers: Optional[Dict[str, str]], request_id: str
+) -> Dict[str, Any]:
+    resp = await forwarder.post_batch(body, request_id, headers, url=url)
     if resp.status_code != 200:
         raise RuntimeError(f"forward failed status={resp.status_code}")
-
-
-def _forward_or_spool(payload: Dict[str, Any], request_id: str) -> None:
-    event_id = _event_id(payload)
+    body = codec.loads(resp.content)
+    # The receiver echoes the batch ID it processed; anything else is not an acknowledgement.
+    if body.get("request_id") != request_id:
+        raise RuntimeError(f"batch {request_id} not acknowledged")
+    return body
+
+
+async def _forward_batch_or_spool(batch: List[QueuedEvent]) -> None:
+    encoded = [event.encoded for event in batch]
+    event_ids = [_event_id(event.payload) for event in batch]
+    batch_rid = str(uuid4())
+    start = time.perf_counter()
     try:
-        _forward_event(payload, request_id)
-        with metrics_lock:
-            metrics["forward_success_count"] += 1
-            metrics["last_forward_success_ts"] = _now_iso()
-        log_json("forward_success", event_id=event_id, event_type=payload.get("event_type"), request_id=request_id)
+        body = await _forward_batch(encoded, batch_rid)
     except Exception as exc:  # noqa: BLE001
+        _observe_forward("live", "error", start)
         with metrics_lock:
-            metrics["forward_failure_count"] += 1
+            metrics["forward_failure_count"] += len(batch)
             metrics["last_forward_failure_ts"] = _now_iso()
-        _write_spool(payload)
+        await asyncio.to_thread(_spool_handoff, encoded)
+        await journal.ack(event.position for event in batch)
+        log_json("forward_failed_spooled", event_ids=event_ids, request_id=batch_rid, error=str(exc))
+        return
+
+    await journal.ack(event.position for event in batch)
+
+    _observe_forward("live", "ok", start)
+    rejected = [r for r in body.get("results", []) if not r.get("ok")]
+    with metrics_lock:
+        metrics["forward_success_count"] += len(batch) - len(rejected)
+        metrics["last_forward_success_ts"] = _now_iso()
+    log_json("forward_success", level="debug", event_ids=event_ids, request_id=batch_rid)
+    for result in rejected:
+        # Receiver rejected an event that passed local validation; retrying cannot help.
+        index = result.get("index")
+        valid = isinstance(index, int) and not isinstance(index, bool) and 0 <= index < len(event_ids)
         log_json(
-            "forward_failed_spooled",
-            event_id=event_id,
-            event_type=payload.get("event_type"),
-            request_id=request_id,
-            error=str(exc),
+            "forward_rejected",
+            event_id=event_ids[index] if valid else None,
+            request_id=batch_rid,
+            details=result.get("details"),
         )
 
 
-def _process_spool_loop() -> None:
-    while True:
-        files = sorted(SPOOL_DIR.glob("*.ndjson"))
-        if not files:
-            time.sleep(3)
+async def _replay_batch(lines: List[bytes]) -> None:
+    """Deliver one chunk of spooled records; raises so the drainer keeps them spooled."""
+    encoded: List[bytes] = []
+    event_ids: List[str] = []
+    for line in lines:
+        try:
+            payload = codec.loads(line)
+        except JSONDecodeError:
+            log_json("retry_spool_record_corrupt", size=len(line))
             continue
-        for path in files:
-            try:
-                with path.open("r", encoding="utf-8") as fp:
-                    line = fp.readline()
-                    payload = json.loads(line)
-                rid = _request_id(payload, None)
-                _forward_event(payload, rid)
-                with metrics_lock:
-                    metrics["forward_success_count"] += 1
-                    metrics["last_forward_success_ts"] = _now_iso()
-                log_json(
-                    "retry_forward_success",
-                    event_id=_event_id(payload),
-                    event_type=payload.get("event_type"),
-                    request_id=rid,
-                )
-                path.unlink(missing_ok=True)
-            except Exception as exc:  # noqa: BLE001
-                with metrics_lock:
-                    metrics["forward_failure_count"] += 1
-                    metrics["last_forward_failure_ts"] = _now_iso()
-                log_json("retry_forward_failed", error=str(exc))
-                time.sleep(2)
-                break
-
-
-def _uptime_seconds() -> Optional[int]:
+        # The spooled bytes are forwarded as-is; decoding only screens out corrupt lines.
+        encoded.append(line)
+        event_ids.append(_event_id(payload) if isinstance(payload, dict) else "unknown")
+    if not encoded:
+        return
+    batch_rid = str(uuid4())
+    start = time.perf_counter()
     try:
-        with open("/proc/uptime", "r", encoding="utf-8") as fp:
-            return int(float(fp.read().split()[0]))
-    except Exception:
-        return None
+        await _forward_batch(encoded, batch_rid)
+    except Exception as exc:
+        _observe_forward("replay", "error", start)
+        with metrics_lock:
+            metrics["forward_failure_count"] += len(encoded)
+            metrics["last_forward_failure_ts"] = _now_iso()
+        log_json("retry_forward_failed", event_ids=event_ids, request_id=batch_rid, error=str(exc))
+        raise
+    _observe_forward("replay", "ok", start)
+    with metrics_lock:
+        metrics["forward_success_count"] += len(encoded)
+        metrics["last_forward_success_ts"] = _now_iso()
+    log_json("retry_forward_success", level="debug", event_ids=event_ids, request_id=batch_rid)
+
+
+async def _run_drain_election() -> None:
+    """Multi-worker mode: take the drain lease when it is free, then drain every slot's spool."""
+    global drainer
+    drain_task: Optional[asyncio.Task] = None
+    try:
+        while True:
+            if drain_lease.try_acquire():
+                await asyncio.to_thread(_adopt_spools)
+                if drain_task is None:
+                    log_json("drain_owner_elected", worker=WORKER_NAME)
+                    drainer = _new_drainer(drain_group)
+                    drain_task = asyncio.create_task(drainer.run())
+            await asyncio.sleep(WORKER_SCAN_SECONDS)
+    finally:
+        if drain_task is not None:
+            drain_task.cancel()
+            await asyncio.gather(drain_task, return_exceptions=True)
+
+
+def _adopt_spools() -> None:
+    """Drain owner: follow every slot's spool and recover journals of slots no worker holds."""
+    if "root" not in drain_group:
+        # Spool left by single-worker mode, plus any legacy per-event files.
+        root = SegmentedSpool(SPOOL_DIR, segment_max_bytes=SPOOL_SEGMENT_BYTES, follow_writes=True)
+        _import_legacy_spool(root)
+        drain_group.add("root", root)
+    for path in workers.slot_dirs(JOURNAL_DIR):
+        lock = workers.slot_lock(STATE_DIR, int(path.name[len(workers.SLOT_PREFIX) :]))
+        if not lock.try_acquire():
+            continue  # a live worker owns it and recovered it at startup
+        try:
+            orphan = IngestJournal(SegmentedSpool(path, segment_max_bytes=SPOOL_SEGMENT_BYTES))
+            target = SegmentedSpool(SPOOL_DIR / path.name, segment_max_bytes=SPOOL_SEGMENT_BYTES, write_only=True)
+            moved = orphan.recover(target)
+            target.close()
+            orphan.spool.close()
+            if moved:
+                log_json("journal_recovered", worker=path.name, records=moved)
+        finally:
+            lock.release()
+    for path in workers.slot_dirs(SPOOL_DIR):
+        if path.name not in drain_group:
+            drain_group.add(path.name, SegmentedSpool(path, segment_max_bytes=SPOOL_SEGMENT_BYTES, follow_writes=True))
 
 
 def _run_command(cmd: List[str]) -> Dict[str, Any]:
     try:
-        proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        proc = subprocess.run(cmd, check=False, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
         if proc.returncode != 0:
             return {"ok": False, "stderr": proc.stderr.strip(), "stdout": proc.stdout.strip()}
         return {"ok": True, "stdout": proc.stdout.strip()}
     except FileNotFoundError:
         return {"ok": False, "error": "command_not_found"}
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "error": "timeout"}
 
 
 def _usb_list() -> Dict[str, Any]:
@@ -244,6 +742,62 @@ def _docker_ps() -> Dict[str, Any]:
     return {"ok": True, "containers": entries}
 
 
+cpu_sampler = host_info.CpuSampler()
+probes = ProbeCache(idle_after=PROBE_IDLE_SECONDS)
+probes.register("usb", _usb_list, ttl=PROBE_USB_TTL)
+probes.register("ip", _ip_addresses, ttl=PROBE_IP_TTL)
+probes.register("docker", _docker_ps, ttl=PROBE_DOCKER_TTL)
+
+
+def _backpressure_response() -> JSONResponse:
+    return JSONResponse(
+        {"ok": False, "error": "forwarder_saturated"},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+def _rate_limited_response(scope: str, wait: float) -> JSONResponse:
+    return JSONResponse(
+        {"ok": False, "error": "rate_limited", "scope": scope, "retry_after": round(wait, 3)},
+        status_code=429,
+        headers={"Retry-After": retry_after_header(wait)},
+    )
+
+
+def _client_key(request: Request) -> str:
+    """Rate-limit identity: the API key if one was sent, else the client address."""
+    key = request.headers.get("X-API-Key")
+    if key:
+        return f"key:{key}"
+    return f"addr:{request.client.host}" if request.client else "addr:unknown"
+
+
+@app.middleware("http")
+async def admission_gate(request: Request, call_next):
+    if not request.url.path.startswith("/ingest"):
+        return await call_next(request)
+    if not admission.enter():
+        log_json("ingest_overloaded", in_flight=admission.in_flight, limit=admission.max_in_flight)
+        return JSONResponse({"ok": False, "error": "overloaded"}, status_code=503, headers={"Retry-After": "1"})
+    try:
+        return await call_next(request)
+    finally:
+        admission.leave()
+
+
+@app.middleware("http")
+async def observe_ingest_latency(request: Request, call_next):
+    if not request.url.path.startswith("/ingest"):
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    INGEST_SECONDS.observe(
+        time.perf_counter() - start, endpoint=request.url.path, status=str(response.status_code)
+    )
+    return response
+
+
 @app.middleware("http")
 async def api_key_guard(request: Request, call_next):
     if request.url.path in {"/health", "/openapi.json"}:
@@ -257,31 +811,156 @@ async def api_key_guard(request: Request, call_next):
 @app.post("/ingest")
 async def ingest(
     request: Request,
-    background_tasks: BackgroundTasks,
-    x_request_id: Optional[str] = Header(default=None, convert_underscores=False),
+    x_request_id: Optional[str] = Header(default=None, alias="X-Request-ID"),
 ):
     with metrics_lock:
         metrics["last_ingest_ts"] = _now_iso()
+    wait = admission.check_key(_client_key(request))
+    if wait:
+        return _rate_limited_response("api_key", wait)
+    body = await request.body()
     try:
-        payload = await request.json()
+        with JSON_PARSE_SECONDS.time(endpoint="/ingest"):
+            payload = codec.loads(body)
     except JSONDecodeError:
+        _count_event(None, "invalid_json")
         log_json("ingest_invalid_json")
         return JSONResponse({"ok": False, "error": "invalid_json"}, status_code=400)
 
     try:
         _validate_event(payload)
     except ValidationError as err:
-        path = "/".join([str(p) for p in err.path])
-        detail = err.message if not path else f"{err.message} at {path}"
+        _count_event(payload, "schema_failed")
+        detail = _validation_detail(err)
         log_json("ingest_schema_failed", details=detail)
         return JSONResponse({"ok": False, "error": "schema_validation_failed", "details": detail}, status_code=400)
 
     rid = _request_id(payload, x_request_id)
-    log_json("ingest_accepted", event_id=_event_id(payload), event_type=payload.get("event_type"), request_id=rid)
-    background_tasks.add_task(_forward_or_spool, payload, rid)
+    wait = admission.check_device(payload["device_id"])
+    if wait:
+        _count_event(payload, "rate_limited")
+        log_json("ingest_rate_limited", level="debug", device_id=payload["device_id"], request_id=rid)
+        return _rate_limited_response("device", wait)
+    if _is_duplicate(payload):
+        log_json("ingest_duplicate", level="debug", event_id=_event_id(payload), request_id=rid)
+        return JSONResponse({"ok": True, "accepted": False, "duplicate": True, "request_id": rid})
+    encoded = _encode(payload, body)
+    try:
+        submitted = await _submit([QueuedEvent(payload, rid, encoded)])
+    except (OSError, RuntimeError) as exc:
+        return _journal_unavailable_response(exc)
+    if not submitted:
+        _count_event(payload, "backpressure")
+        log_json("ingest_backpressure", event_id=_event_id(payload), request_id=rid)
+        return _backpressure_response()
+    _track_sequence(payload)
+    _count_event(payload, "accepted")
+    event_hub.publish(payload, encoded)
+    log_json(
+        "ingest_accepted",
+        level="debug",
+        event_id=_event_id(payload),
+        event_type=payload.get("event_type"),
+        request_id=rid,
+    )
     return JSONResponse({"ok": True, "accepted": True, "request_id": rid}, status_code=202)
 
 
+@app.post("/ingest/batch")
+async def ingest_batch(
+    request: Request,
+    x_request_id: Optional[str] = Header(default=None, alias="X-Request-ID"),
+):
+    with metrics_lock:
+        metrics["last_ingest_ts"] = _now_iso()
+    body = await request.body()
+    try:
+        with JSON_PARSE_SECONDS.time(endpoint="/ingest/batch"):
+            items = _parse_batch(body, request.headers.get("content-type", ""))
+    except (JSONDecodeError, ValueError):
+        log_json("ingest_batch_invalid_json")
+        return JSONResponse({"ok": False, "error": "invalid_json"}, status_code=400)
+    if len(items) > BATCH_MAX_ITEMS:
+        log_json("ingest_batch_too_large", items=len(items), limit=BATCH_MAX_ITEMS)
+        return JSONResponse(
+            {"ok": False, "error": "batch_too_large", "limit": BATCH_MAX_ITEMS},
+            status_code=413,
+        )
+    wait = admission.check_key(_client_key(request), cost=max(len(items), 1))
+    if wait:
+        return _rate_limited_response("api_key", wait)
+
+    batch_rid = x_request_id or str(uuid4())
+    results: List[Dict[str, Any]] = []
+    accepted: List[QueuedEvent] = []
+    pending: Set[Tuple[str, int]] = set()
+    duplicates = 0
+    for index, (item, raw) in enumerate(items):
+        if isinstance(item, JSONDecodeError):
+            _count_event(None, "invalid_json")
+            results.append({"index": index, "ok": False, "error": "invalid_json"})
+            continue
+        try:
+            _validate_event(item)
+        except ValidationError as err:
+            _count_event(item, "schema_failed")
+            results.append(
+                {
+                    "index": index,
+                    "ok": False,
+                    "error": "schema_validation_failed",
+                    "details": _validation_detail(err),
+                }
+            )
+            continue
+        rid = f"{batch_rid}-{index}"
+        wait = admission.check_device(item["device_id"])
+        if wait:
+            _count_event(item, "rate_limited")
+            results.append({"index": index, "ok": False, "error": "rate_limited", "retry_after": round(wait, 3)})
+            continue
+        if _is_duplicate(item, pending):
+            duplicates += 1
+            results.append({"index": index, "ok": True, "duplicate": True, "request_id": rid})
+            continue
+        accepted.append(QueuedEvent(item, rid, _encode(item, raw)))
+        results.append({"index": index, "ok": True, "request_id": rid})
+
+    rejected = len(results) - len(accepted) - duplicates
+    try:
+        submitted = not accepted or await _submit(accepted)
+    except (OSError, RuntimeError) as exc:
+        return _journal_unavailable_response(exc)
+    if not submitted:
+        for event in accepted:
+            _count_event(event.payload, "backpressure")
+        log_json("ingest_batch_backpressure", items=len(accepted), request_id=batch_rid)
+        return _backpressure_response()
+    for event in accepted:
+        _track_sequence(event.payload)
+        _count_event(event.payload, "accepted")
+        event_hub.publish(event.payload, event.encoded)
+    log_json(
+        "ingest_batch_accepted",
+        level="debug",
+        accepted=len(accepted),
+        rejected=rejected,
+        duplicates=duplicates,
+        request_id=batch_rid,
+    )
+    return JSONResponse(
+        {
+            "ok": True,
+            "request_id": batch_rid,
+            "accepted": len(accepted),
+            "rejected": rejected,
+            "duplicates": duplicates,
+            "results": results,
+        },
+        status_code=202,
+    )
+
+
 @app.get("/health")
 async def health():
     return {"ok": True, "status": "ready"}
@@ -292,7 +971,7 @@ async def status():
     uptime_seconds = int(time.monotonic() - start_monotonic)
     with metrics_lock:
         snapshot = metrics.copy()
-    retry_alive = retry_thread.is_alive() if retry_thread else False
+    retry_alive = retry_task is not None and not retry_task.done()
     snapshot.update(
         {
             "service": "pla_node",
@@ -300,31 +979,238 @@ async def status():
             "ok": True,
             "uptime_seconds": uptime_seconds,
             "spool_queue_depth": _spool_queue_depth(),
+            "spool": _spool_gauges(),
             "retry_active": retry_alive,
+            "drain": drainer.stats() if drainer else None,
+            "forwarder": forwarder.stats(),
+            "upstreams": upstreams.stats(),
+            "sequence": seq_tracker.stats(),
+            "admission": admission.stats(),
+            "probes": probes.stats(),
+            "journal": {"enabled": JOURNAL_ENABLED, **journal.stats()},
+            "stream": event_hub.stats(),
+            "workers": {"count": 1, "worker": WORKER_NAME, "drain_owner": WORKER_NAME},
         }
     )
+    if snapshots is not None:
+        _merge_worker_status(snapshot, await asyncio.to_thread(snapshots.peers))
     return snapshot
 
 
+_STATUS_COUNTERS = ("forward_success_count", "forward_failure_count")
+_STATUS_TIMESTAMPS = ("last_ingest_ts", "last_forward_success_ts", "last_forward_failure_ts")
+
+
+def _merge_worker_status(status: Dict[str, Any], peers: List[Dict[str, Any]]) -> None:
+    """Fold other workers' snapshots into this worker's /status.
+
+    Counters are summed, timestamps take the latest, and the spool/drain sections come
+    from whichever worker holds the drain lease. Other sections stay per worker.
+    """
+    owner = WORKER_NAME if drain_lease.held else None
+    for peer in peers:
+        peer_status = peer["status"]
+        for key in _STATUS_COUNTERS:
+            status[key] += peer_status.get(key, 0)
+        for key in _STATUS_TIMESTAMPS:
+            status[key] = max(filter(None, (status[key], peer_status.get(key))), default=None)
+        if peer.get("drain_owner"):
+            owner = peer["worker"]
+            status["spool"] = peer_status["spool"]
+            status["spool_queue_depth"] = peer_status["spool"]["depth"]
+            status["drain"] = peer_status["drain"]
+            status["retry_active"] = True
+    status["workers"] = {
+        "count": 1 + len(peers),
+        "worker": WORKER_NAME,
+        "drain_owner": owner,
+        "members": sorted([WORKER_NAME] + [peer["worker"] for peer in peers]),
+    }
+
+
+def _worker_snapshot() -> Dict[str, Any]:
+    with metrics_lock:
+        counters = {key: metrics[key] for key in _STATUS_COUNTERS + _STATUS_TIMESTAMPS}
+    return {
+        "pid": os.getpid(),
+        "drain_owner": drain_lease.held,
+        "status": {**counters, "spool": _spool_gauges(), "drain": drainer.stats() if drainer else None},
+        "registry": REGISTRY.collect(),
+    }
+
+
+async def _publish_snapshots() -> None:
+    assert snapshots is not None
+    while True:
+        # Collected on the event loop, which owns the counters; only the file write is offloaded.
+        snapshot = _worker_snapshot()
+        try:
+            await asyncio.to_thread(snapshots.publish, snapshot)
+        except OSError as exc:
+            log_json("metrics_snapshot_failed", error=str(exc))
+        await asyncio.sleep(METRICS_SYNC_MS / 1000)
+
+
+def _filter_values(values: Optional[List[str]]) -> List[str]:
+    """Accept both repeated query params and comma-separated lists."""
+    return [part for value in values or [] for part in value.split(",") if part]
+
+
+@app.get("/events/stream")
+async def events_stream(
+    device_id: Optional[List[str]] = Query(None),
+    event_type: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """SSE feed of accepted events; limit ends the stream after that many events."""
+    subscriber = event_hub.subscribe(_filter_values(device_id), _filter_values(event_type))
+    if subscriber is None:
+        return JSONResponse(
+            {"ok": False, "error": "too_many_subscribers", "limit": event_hub.max_subscribers},
+            status_code=503,
+            headers={"Retry-After": "5"},
+        )
+    log_json("stream_subscribed", subscribers=len(event_hub))
+
+    async def frames():
+        sent = 0
+        try:
+            yield b": connected\n\n"
+            while limit is None or sent < limit:
+                try:
+                    encoded = await subscriber.next(timeout=STREAM_KEEPALIVE_SECONDS)
+                except EOFError:
+                    break
+                if encoded is None:
+                    yield b": keepalive\n\n"
+                    continue
+                if subscriber.unreported_drops:
+                    yield b"event: dropped\ndata: " + codec.dumps({"dropped": subscriber.unreported_drops}) + b"\n\n"
+                    subscriber.unreported_drops = 0
+                yield b"event: event\ndata: " + encoded + b"\n\n"
+                sent += 1
+        finally:
+            event_hub.unsubscribe(subscriber)
+            log_json("stream_closed", delivered=subscriber.delivered, dropped=subscriber.dropped)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/limits")
+async def get_limits():
+    return {"ok": True, **admission.stats()}
+
+
+@app.put("/limits")
+async def put_limits(request: Request):
+    """Change admission limits at runtime; send only the fields to change (0 disables a limit)."""
+    try:
+        changes = codec.loads(await request.body())
+    except JSONDecodeError:
+        return JSONResponse({"ok": False, "error": "invalid_json"}, status_code=400)
+    if not isinstance(changes, dict):
+        return JSONResponse({"ok": False, "error": "invalid_limits", "details": "expected an object"}, status_code=400)
+    try:
+        admission.configure(changes)
+    except ValueError as err:
+        return JSONResponse({"ok": False, "error": "invalid_limits", "details": str(err)}, status_code=400)
+    log_json("limits_updated", **admission.limits())
+    return {"ok": True, **admission.limits()}
+
+
+@app.get("/devices")
+async def devices(limit: int = Query(100, ge=1, le=10000), min_loss: float = Query(0.0, ge=0.0)):
+    """Per-device sequence state, highest loss rate first."""
+    return {"ok": True, **seq_tracker.stats(), "items": seq_tracker.devices(limit=limit, min_loss=min_loss)}
+
+
+@app.get("/devices/{device_id}")
+async def device_detail(device_id: str):
+    state = seq_tracker.device(device_id)
+    if state is None:
+        return JSONResponse({"ok": False, "error": "unknown_device"}, status_code=404)
+    return {"ok": True, **state}
+
+
+def _metric_snapshot(key: str) -> float:
+    with metrics_lock:
+        return metrics[key]
+
+
+REGISTRY.callback("pla_node_uptime_seconds", "Seconds since the process started.",
+                  lambda: int(time.monotonic() - start_monotonic), merge="max")
+REGISTRY.callback("pla_node_workers", "Worker processes reporting metrics.", lambda: 1)
+REGISTRY.callback("pla_node_forward_success_total", "Events delivered to Brain Receiver.",
+                  lambda: _metric_snapshot("forward_success_count"), kind="counter")
+REGISTRY.callback("pla_node_forward_failure_total", "Event deliveries that failed and were spooled.",
+                  lambda: _metric_snapshot("forward_failure_count"), kind="counter")
+REGISTRY.callback("pla_node_spool_queue_depth", "Events waiting in the spool.",
+                  lambda: _spool_gauges()["depth"])
+REGISTRY.callback("pla_node_spool_bytes", "Bytes waiting in the spool.", lambda: _spool_gauges()["bytes"])
+REGISTRY.callback("pla_node_spool_oldest_age_seconds", "Age of the oldest spooled event.",
+                  lambda: _spool_gauges()["oldest_age_seconds"] or 0, merge="max")
+REGISTRY.callback("pla_node_spool_drain_rate", "Events/second drained from the spool over the last minute.",
+                  lambda: drainer.throughput() if drainer else 0)
+REGISTRY.callback("pla_node_forward_queue_depth", "Events queued for forwarding.", lambda: forwarder.queued)
+REGISTRY.callback("pla_node_forward_queue_capacity", "Size of the forward queue.", lambda: forwarder.queue_size)
+REGISTRY.callback("pla_node_forward_in_flight", "Batches currently being forwarded.", lambda: forwarder.in_flight)
+REGISTRY.callback("pla_node_log_queue_depth", "Log lines buffered for the writer thread.",
+                  lambda: log_writer.depth)
+REGISTRY.callback("pla_node_log_written_total", "Log lines written to disk.",
+                  lambda: log_writer.written, kind="counter")
+REGISTRY.callback("pla_node_log_dropped_total", "Log lines dropped on buffer overflow.",
+                  lambda: {(level,): count for level, count in log_writer.dropped.items()},
+                  kind="counter", labelnames=["level"])
+REGISTRY.callback("pla_node_seq_devices_tracked", "Devices in the sequence tracking table.", lambda: len(seq_tracker))
+REGISTRY.callback("pla_node_seq_missing_events", "Events never received according to per-device sequence gaps.",
+                  lambda: seq_tracker.totals["missing"])
+REGISTRY.callback("pla_node_seq_anomalies_total", "Sequence anomalies seen at ingest.",
+                  lambda: {(kind,): seq_tracker.totals[kind] for kind in ("duplicates", "out_of_order", "resets")},
+                  kind="counter", labelnames=["kind"])
+REGISTRY.callback("pla_node_seq_evicted_total", "Devices evicted from the sequence table (LRU).",
+                  lambda: seq_tracker.totals["evicted"], kind="counter")
+REGISTRY.callback("pla_node_ingest_in_flight", "Ingest requests being handled.", lambda: admission.in_flight)
+REGISTRY.callback("pla_node_admission_rejected_total", "Ingest requests or events refused by admission control.",
+                  lambda: {(reason,): count for reason, count in admission.rejected.items()},
+                  kind="counter", labelnames=["reason"])
+REGISTRY.callback("pla_node_stream_subscribers", "Connected /events/stream subscribers.", lambda: len(event_hub))
+REGISTRY.callback("pla_node_stream_dropped_total", "Events dropped for slow stream subscribers.",
+                  lambda: event_hub.dropped, kind="counter")
+REGISTRY.callback("pla_node_journal_unacked", "Journaled events not yet acknowledged or spooled.",
+                  lambda: journal.unacked)
+REGISTRY.callback("pla_node_journal_commits_total", "Journal group commits (one fsync each).",
+                  lambda: journal.commits, kind="counter")
+REGISTRY.callback("pla_node_forward_concurrency", "Maximum batches forwarded at once.",
+                  lambda: forwarder.concurrency)
+REGISTRY.callback("pla_node_receiver_up", "1 if a Brain Receiver endpoint is healthy and its breaker is not open.",
+                  lambda: {(u.url,): int(u.healthy and u.state != "open") for u in upstreams.upstreams},
+                  labelnames=["url"], merge="max")
+REGISTRY.callback("pla_node_receiver_outstanding", "Batches in flight to each Brain Receiver endpoint.",
+                  lambda: {(u.url,): u.outstanding for u in upstreams.upstreams}, labelnames=["url"])
+REGISTRY.callback("pla_node_receiver_failures_total", "Failed batches per Brain Receiver endpoint.",
+                  lambda: {(u.url,): u.failures for u in upstreams.upstreams}, kind="counter", labelnames=["url"])
+REGISTRY.callback("pla_node_receiver_short_circuits_total",
+                  "Batches spooled without a request because no endpoint was available.",
+                  lambda: upstreams.short_circuits, kind="counter")
+
+
 @app.get("/metrics")
 async def metrics_endpoint():
-    uptime_seconds = int(time.monotonic() - start_monotonic)
-    with metrics_lock:
-        success = metrics["forward_success_count"]
-        failure = metrics["forward_failure_count"]
-    lines = [
-        f"pla_node_uptime_seconds {uptime_seconds}",
-        f"pla_node_forward_success_total {success}",
-        f"pla_node_forward_failure_total {failure}",
-        f"pla_node_spool_queue_depth {_spool_queue_depth()}",
-    ]
-    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+    if snapshots is None:
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+    peers = await asyncio.to_thread(snapshots.peers)
+    merged = merge_collections([REGISTRY.collect()] + [peer["registry"] for peer in peers])
+    return PlainTextResponse(render_collection(merged), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/os-info")
 async def os_info():
     uname = platform.uname()
-    uptime = _uptime_seconds()
+    uptime = host_info.uptime_seconds()
     return {
         "ok": True,
         "hostname": uname.node,
@@ -334,6 +1220,8 @@ async def os_info():
         "machine": uname.machine,
         "processor": uname.processor,
         "uptime_seconds": uptime,
+        "cpu": host_info.cpu_info(cpu_sampler),
+        "memory": host_info.memory_info(),
     }
 
 
@@ -351,17 +1239,19 @@ async def disk():
 
 @app.get("/usb-list")
 async def usb_list():
-    return _usb_list()
+    result = host_info.usb_devices()
+    return result if result["ok"] else await probes.get("usb")
 
 
 @app.get("/ip")
 async def ip_info():
-    return _ip_addresses()
+    result = host_info.ip_addresses()
+    return result if result["ok"] else await probes.get("ip")
 
 
 @app.get("/docker/ps")
 async def docker_ps():
-    return _docker_ps()
+    return await probes.get("docker")
 
 
-# retry thread started in lifespan
\ No newline at end of file
+# retry task and forwarder started in lifespan
\ No newline at end of file
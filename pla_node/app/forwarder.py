@@ -0,0 +1,190 @@
+"""
+Asyncio forwarding engine for PLA Node -> Brain Receiver.
+- One persistent httpx.AsyncClient (keep-alive pool) shared by all in-flight batches
+- Bounded queue drained by a batcher that flushes every batch_size events or
+  flush_interval seconds, whichever comes first
+- At most `concurrency` batches in flight at once
+- try_submit() refuses work instead of blocking so /ingest can signal backpressure
+- stop() refuses new work, hands everything still queued to the handler and waits up
+  to drain_timeout seconds for in-flight batches before cancelling them
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+# Opaque to the forwarder; fastapi_app queues its QueuedEvent records.
+Item = Tuple[Any, ...]
+BatchHandler = Callable[[List[Item]], Awaitable[None]]
+
+logger = logging.getLogger("pla_node.forwarder")
+
+
+class Forwarder:
+    """Micro-batching worker pool that hands queued events to an async batch handler."""
+
+    def __init__(
+        self,
+        batch_url: str,
+        concurrency: int = 8,
+        queue_size: int = 1000,
+        timeout: float = 3.0,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        drain_timeout: float = 10.0,
+    ) -> None:
+        self.batch_url = batch_url
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.drain_timeout = max(0.0, drain_timeout)
+        self.in_flight = 0
+        self.abandoned = 0
+        self._closing = False
+        # Items the batcher has taken off the queue but not yet dispatched.
+        self._held: List[Item] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._handler: Optional[BatchHandler] = None
+
+    @property
+    def running(self) -> bool:
+        return self._batcher is not None and not self._batcher.done()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def saturated(self) -> bool:
+        return self._queue is None or self._queue.full()
+
+    async def start(self, handler: BatchHandler) -> None:
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._closing = False
+        self._handler = handler
+        self._batcher = asyncio.create_task(self._run_batcher(handler))
+
+    async def stop(self) -> None:
+        """Stop accepting work, flush the queue through the handler, then shut down."""
+        self._closing = True
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+            self._batcher = None
+        if self._queue is not None and self._handler is not None:
+            leftover, self._held = self._held, []
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+            for start in range(0, len(leftover), self.batch_size):
+                # Dispatched without waiting for a slot: the deadline below bounds them all.
+                self._spawn(self._handler, leftover[start : start + self.batch_size], slotted=False)
+        if self._tasks:
+            _, late = await asyncio.wait(set(self._tasks), timeout=self.drain_timeout)
+            for task in late:
+                task.cancel()
+            await asyncio.gather(*late, return_exceptions=True)
+            if late:
+                logger.warning("forwarder stopped with %d events still in flight", self.abandoned)
+        self._tasks.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def has_room(self, count: int) -> bool:
+        return self._queue is not None and not self._closing and self._queue.maxsize - self._queue.qsize() >= count
+
+    def try_submit(self, items: List[Item]) -> bool:
+        """Queue all items or none of them; False means the pool is saturated."""
+        if not self.has_room(len(items)):
+            return False
+        for item in items:
+            self._queue.put_nowait(item)
+        return True
+
+    async def post_batch(
+        self,
+        body: bytes,
+        request_id: str,
+        headers: Optional[Dict[str, str]] = None,
+        url: Optional[str] = None,
+    ) -> httpx.Response:
+        """POST an already-encoded batch (JSON array unless headers say otherwise).
+
+        Goes to `url` when given, else to the forwarder's default batch endpoint.
+        """
+        if self._client is None:
+            raise RuntimeError("forwarder not started")
+        request_headers = {"X-Request-ID": request_id, "Content-Type": "application/json"}
+        request_headers.update(headers or {})
+        return await self._client.post(url or self.batch_url, content=body, headers=request_headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queue_size": self.queue_size,
+            "saturated": self.saturated,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+        }
+
+    async def _next_batch(self) -> List[Item]:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        batch = self._held = [await self._queue.get()]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batcher(self, handler: BatchHandler) -> None:
+        assert self._slots is not None
+        while True:
+            batch = await self._next_batch()
+            await self._slots.acquire()
+            self._held = []
+            self._spawn(handler, batch, slotted=True)
+
+    def _spawn(self, handler: BatchHandler, batch: List[Item], slotted: bool) -> None:
+        task = asyncio.create_task(self._dispatch(handler, batch, slotted))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, handler: BatchHandler, batch: List[Item], slotted: bool) -> None:
+        assert self._slots is not None
+        self.in_flight += 1
+        try:
+            await handler(batch)
+        except asyncio.CancelledError:
+            self.abandoned += len(batch)
+            raise
+        except Exception:  # noqa: BLE001
+            logger.exception("forward handler crashed")
+        finally:
+            self.in_flight -= 1
+            if slotted:
+                self._slots.release()
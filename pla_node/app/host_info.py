@@ -0,0 +1,260 @@
+"""
+Host introspection read straight from procfs/sysfs (Linux), no subprocesses.
+- usb_devices(): /sys/bus/usb/devices, lsusb-style lines plus structured entries
+- ip_addresses(): /sys/class/net, /proc/net/dev and /proc/net/if_inet6, ip -br style
+  interfaces plus MAC, MTU and byte/packet counters; IPv4 addresses, secondary and
+  alias ones included, come from a netlink RTM_GETADDR dump
+- cpu_info(), memory_info(), uptime_seconds(): /proc/stat, /proc/loadavg, /proc/meminfo, /proc/uptime
+Every reader takes a root path so tests can point it at a fake tree.
+"""
+from __future__ import annotations
+
+import ipaddress
+import os
+import socket
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path("/")
+# rtnetlink constants (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h).
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_RTM_NEWADDR = 20
+_RTM_GETADDR = 22
+_NLM_F_REQUEST_DUMP = 0x1 | 0x300
+_IFA_ADDRESS = 1
+_IFA_LOCAL = 2
+_NLMSG_HEADER = struct.Struct("=LHHLL")
+_IFADDRMSG = struct.Struct("=BBBBL")
+_RTATTR = struct.Struct("=HH")
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        return None
+
+
+def available(root: Path = ROOT) -> bool:
+    return (root / "sys" / "class" / "net").is_dir()
+
+
+def uptime_seconds(root: Path = ROOT) -> Optional[int]:
+    text = _read(root / "proc" / "uptime")
+    try:
+        return int(float(text.split()[0])) if text else None
+    except (ValueError, IndexError):
+        return None
+
+
+def usb_devices(root: Path = ROOT) -> Dict[str, Any]:
+    base = root / "sys" / "bus" / "usb" / "devices"
+    if not base.is_dir():
+        return {"ok": False, "error": "usb_sysfs_unavailable"}
+    entries: List[Dict[str, Any]] = []
+    for path in base.iterdir():
+        # Interfaces ("1-1:1.0") sit next to devices; only devices carry busnum.
+        if ":" in path.name:
+            continue
+        bus, dev = _read(path / "busnum"), _read(path / "devnum")
+        if not bus or not dev:
+            continue
+        entries.append(
+            {
+                "bus": int(bus),
+                "device": int(dev),
+                "vendor_id": _read(path / "idVendor") or "",
+                "product_id": _read(path / "idProduct") or "",
+                "manufacturer": _read(path / "manufacturer"),
+                "product": _read(path / "product"),
+                "speed_mbps": _read(path / "speed"),
+            }
+        )
+    entries.sort(key=lambda entry: (entry["bus"], entry["device"]))
+    lines = []
+    for entry in entries:
+        name = " ".join(part for part in (entry["manufacturer"], entry["product"]) if part)
+        line = f"Bus {entry['bus']:03d} Device {entry['device']:03d}: ID {entry['vendor_id']}:{entry['product_id']}"
+        lines.append(f"{line} {name}" if name else line)
+    return {"ok": True, "devices": lines, "details": entries}
+
+
+def _net_counters(root: Path) -> Dict[str, Dict[str, int]]:
+    text = _read(root / "proc" / "net" / "dev") or ""
+    counters: Dict[str, Dict[str, int]] = {}
+    for line in text.splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        fields = rest.split()
+        if len(fields) < 16:
+            continue
+        counters[name.strip()] = {
+            "rx_bytes": int(fields[0]),
+            "rx_packets": int(fields[1]),
+            "rx_errors": int(fields[2]),
+            "rx_dropped": int(fields[3]),
+            "tx_bytes": int(fields[8]),
+            "tx_packets": int(fields[9]),
+            "tx_errors": int(fields[10]),
+            "tx_dropped": int(fields[11]),
+        }
+    return counters
+
+
+def _ipv6_addresses(root: Path) -> Dict[str, List[str]]:
+    text = _read(root / "proc" / "net" / "if_inet6") or ""
+    addresses: Dict[str, List[str]] = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) != 6:
+            continue
+        address = ipaddress.IPv6Address(int(fields[0], 16))
+        addresses.setdefault(fields[5], []).append(f"{address.compressed}/{int(fields[2], 16)}")
+    return addresses
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _ipv4_addresses() -> Optional[Dict[str, List[str]]]:
+    """Every IPv4 address/prefix by interface name, in kernel order; None without netlink."""
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    except (AttributeError, OSError):  # not Linux, or netlink blocked
+        return None
+    addresses: Dict[str, List[str]] = {}
+    request = _IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0)
+    header = _NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(request), _RTM_GETADDR, _NLM_F_REQUEST_DUMP, 1, 0)
+    with sock:
+        try:
+            sock.settimeout(1.0)
+            sock.sendto(header + request, (0, 0))
+            while True:
+                data = sock.recv(65536)
+                offset = 0
+                while offset + _NLMSG_HEADER.size <= len(data):
+                    length, kind = _NLMSG_HEADER.unpack_from(data, offset)[:2]
+                    if kind == _NLMSG_DONE:
+                        return addresses
+                    if kind == _NLMSG_ERROR or length < _NLMSG_HEADER.size:
+                        return None
+                    if kind == _RTM_NEWADDR:
+                        _add_ipv4(addresses, data[offset + _NLMSG_HEADER.size : offset + length])
+                    offset += _align(length)
+        except OSError:
+            return None
+
+
+def _add_ipv4(addresses: Dict[str, List[str]], message: bytes) -> None:
+    family, prefix, _, _, index = _IFADDRMSG.unpack_from(message)
+    attrs: Dict[int, bytes] = {}
+    position = _IFADDRMSG.size
+    while position + _RTATTR.size <= len(message):
+        length, kind = _RTATTR.unpack_from(message, position)
+        if length < _RTATTR.size:
+            break
+        attrs[kind] = message[position + _RTATTR.size : position + length]
+        position += _align(length)
+    # IFA_LOCAL is the interface's own address; IFA_ADDRESS is the peer on point-to-point links.
+    address = attrs.get(_IFA_LOCAL) or attrs.get(_IFA_ADDRESS)
+    if family != socket.AF_INET or address is None or len(address) != 4:
+        return
+    try:
+        name = socket.if_indextoname(index)
+    except OSError:  # interface went away during the dump
+        return
+    addresses.setdefault(name, []).append(f"{socket.inet_ntoa(address)}/{prefix}")
+
+
+def ip_addresses(root: Path = ROOT) -> Dict[str, Any]:
+    base = root / "sys" / "class" / "net"
+    if not base.is_dir():
+        return {"ok": False, "error": "net_sysfs_unavailable"}
+    ipv4 = _ipv4_addresses()
+    if ipv4 is None:
+        return {"ok": False, "error": "netlink_unavailable"}
+    counters = _net_counters(root)
+    ipv6 = _ipv6_addresses(root)
+    interfaces: List[Dict[str, Any]] = []
+    for path in sorted(base.iterdir(), key=lambda p: int(_read(p / "ifindex") or 0)):
+        name = path.name
+        addresses = ipv4.get(name, []) + ipv6.get(name, [])
+        mtu = _read(path / "mtu")
+        interfaces.append(
+            {
+                "interface": name,
+                "state": (_read(path / "operstate") or "unknown").upper(),
+                "addresses": addresses,
+                "mac": _read(path / "address"),
+                "mtu": int(mtu) if mtu and mtu.isdigit() else None,
+                **counters.get(name, {}),
+            }
+        )
+    return {"ok": True, "interfaces": interfaces}
+
+
+class CpuSampler:
+    """CPU utilisation between successive calls, from the aggregate /proc/stat line."""
+
+    def __init__(self, root: Path = ROOT) -> None:
+        self.root = root
+        self._last: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _sample(self) -> Optional[Tuple[int, int]]:
+        text = _read(self.root / "proc" / "stat") or ""
+        first = text.splitlines()[0].split() if text else []
+        if not first or first[0] != "cpu":
+            return None
+        values = [int(value) for value in first[1:]]
+        # idle + iowait count as idle; guest time is already included in user/nice.
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        return idle, sum(values[:8])
+
+    def usage_percent(self) -> Optional[float]:
+        sample = self._sample()
+        if sample is None:
+            return None
+        with self._lock:
+            last, self._last = self._last, sample
+        if last is None or sample[1] <= last[1]:
+            return None
+        idle, total = sample[0] - last[0], sample[1] - last[1]
+        return round(100.0 * (total - idle) / total, 1)
+
+
+def cpu_info(sampler: CpuSampler, root: Path = ROOT) -> Dict[str, Any]:
+    load = (_read(root / "proc" / "loadavg") or "").split()
+    return {
+        "count": os.cpu_count(),
+        "usage_percent": sampler.usage_percent(),
+        "load_average": [float(value) for value in load[:3]] if len(load) >= 3 else None,
+    }
+
+
+def memory_info(root: Path = ROOT) -> Dict[str, Any]:
+    text = _read(root / "proc" / "meminfo") or ""
+    kib: Dict[str, int] = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts and parts[0].isdigit():
+            kib[key] = int(parts[0])
+    if "MemTotal" not in kib:
+        return {"ok": False, "error": "meminfo_unavailable"}
+    total = kib["MemTotal"] * 1024
+    available_bytes = kib.get("MemAvailable", kib.get("MemFree", 0)) * 1024
+    return {
+        "ok": True,
+        "total_bytes": total,
+        "available_bytes": available_bytes,
+        "used_bytes": total - available_bytes,
+        "free_bytes": kib.get("MemFree", 0) * 1024,
+        "buffers_bytes": kib.get("Buffers", 0) * 1024,
+        "cached_bytes": kib.get("Cached", 0) * 1024,
+        "swap_total_bytes": kib.get("SwapTotal", 0) * 1024,
+        "swap_free_bytes": kib.get("SwapFree", 0) * 1024,
+    }
@@ -0,0 +1,145 @@
+"""
+Ingest journal (write-ahead log) for PLA Node.
+- Every accepted event is appended to a SegmentedSpool and fsynced before /ingest answers
+- Group commit: appends that arrive while a commit is running share the next fsync,
+  optionally waiting commit_interval for more to join
+- ack() marks records as handed over (receiver acknowledged the batch, or the event was
+  durably spooled); the journal cursor only advances over the contiguous acked prefix
+- After a crash, recover() moves unacknowledged records into the retry spool
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .spool import SegmentedSpool, SpoolPosition
+
+
+class IngestJournal:
+    def __init__(self, spool: SegmentedSpool, commit_interval: float = 0.0) -> None:
+        self.spool = spool
+        self.commit_interval = commit_interval
+        self.commits = 0
+        self.committed_records = 0
+        self.last_commit_seconds = 0.0
+        self._pending: List[Tuple[List[bytes], asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._committer: Optional[asyncio.Task] = None
+        # Appended but not yet acknowledged, in journal order: [position, acked].
+        self._outstanding: Deque[List[Any]] = deque()
+        self._by_position: Dict[SpoolPosition, List[Any]] = {}
+        self._commit_lock = asyncio.Lock()
+
+    @property
+    def unacked(self) -> int:
+        return len(self._outstanding)
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._committer = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._committer is not None:
+            self._committer.cancel()
+            await asyncio.gather(self._committer, return_exceptions=True)
+            self._committer = None
+        for _, future in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("journal stopped"))
+        self._pending.clear()
+        self._outstanding.clear()
+        self._by_position.clear()
+
+    async def append(self, records: List[bytes]) -> List[SpoolPosition]:
+        """Durably append records; returns their positions once they are fsynced."""
+        if self._wakeup is None:
+            raise RuntimeError("journal not started")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((records, future))
+        self._wakeup.set()
+        return await future
+
+    async def ack(self, positions: Iterable[Optional[SpoolPosition]]) -> None:
+        """Mark records as handed over and advance the cursor over the acked prefix."""
+        for position in positions:
+            entry = self._by_position.pop(position, None) if position is not None else None
+            if entry is not None:
+                entry[1] = True
+        # Serialised so cursor commits land in journal order.
+        async with self._commit_lock:
+            count = 0
+            last: Optional[SpoolPosition] = None
+            while self._outstanding and self._outstanding[0][1]:
+                last = self._outstanding.popleft()[0]
+                count += 1
+            if last is not None:
+                # The cursor file is not fsynced; losing it only means extra replays.
+                await asyncio.to_thread(self.spool.commit, last, count)
+
+    def recover(self, into: SegmentedSpool, batch: int = 1000) -> int:
+        """Move records left unacknowledged by a previous run into the retry spool."""
+        moved = 0
+        while True:
+            records = self.spool.read_batch(batch)
+            if not records:
+                return moved
+            into.append([line for line, _ in records])
+            into.sync()
+            self.spool.commit(records[-1][1], len(records))
+            moved += len(records)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "unacked": self.unacked,
+            "depth": self.spool.depth,
+            "bytes": self.spool.pending_bytes,
+            "commits": self.commits,
+            "records_per_commit": round(self.committed_records / self.commits, 2) if self.commits else 0.0,
+            "last_commit_ms": round(self.last_commit_seconds * 1000, 3),
+        }
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            if self.commit_interval > 0:
+                await asyncio.sleep(self.commit_interval)
+            self._wakeup.clear()
+            group, self._pending = self._pending, []
+            if not group:
+                continue
+            records = [record for chunk, _ in group for record in chunk]
+            start = time.perf_counter()
+            try:
+                positions = await asyncio.to_thread(self._write, records)
+            except Exception as exc:  # noqa: BLE001
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.last_commit_seconds = time.perf_counter() - start
+            self.commits += 1
+            self.committed_records += len(records)
+            for position in positions:
+                entry = [position, False]
+                self._outstanding.append(entry)
+                self._by_position[position] = entry
+            index = 0
+            abandoned: List[SpoolPosition] = []
+            for chunk, future in group:
+                chunk_positions = positions[index : index + len(chunk)]
+                index += len(chunk)
+                if future.done():
+                    # The request went away before it was acknowledged; nobody owns these.
+                    abandoned.extend(chunk_positions)
+                else:
+                    future.set_result(chunk_positions)
+            if abandoned:
+                await self.ack(abandoned)
+
+    def _write(self, records: List[bytes]) -> List[SpoolPosition]:
+        positions = self.spool.append(records)
+        self.spool.sync()
+        return positions
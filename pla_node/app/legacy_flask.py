@@ -52,7 +52,7 @@ metrics: Dict[str, Any] = {
 spool_lock = threading.Lock()
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
-LOG_PATH = REPO_ROOT / "logs" / "events.ndjson"
+LOG_PATH = REPO_ROOT / "logs" / "pla_node.ndjson"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 logger = logging.getLogger("pla_node")
@@ -0,0 +1,295 @@
+"""
+Minimal Prometheus metrics registry for PLA Node (text exposition format 0.0.4).
+- Counter, Gauge and Histogram with fixed label names
+- Callback series evaluated at scrape time for values owned elsewhere (queues, spool)
+- Per-metric series cap: label sets beyond max_series collapse into one overflow series
+- collect() exports raw series as plain data; merge_collections() combines exports from
+  several processes and render_collection() prints the result like render()
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+OVERFLOW_LABEL = "_overflow_"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = "untyped"
+    # How series from several processes combine: "sum" or "max".
+    merge = "sum"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), max_series: int = 1000) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+
+    def _key(self, series: Dict, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        if key not in series and len(series) >= self.max_series:
+            key = tuple(OVERFLOW_LABEL for _ in self.labelnames)
+        return key
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+    def series(self) -> Dict[LabelValues, Any]:
+        raise NotImplementedError
+
+    def collect(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "merge": self.merge,
+            "series": [[list(key), value] for key, value in sorted(self.series().items())],
+        }
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        with self._lock:
+            key = self._key(self._values, labels)
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0.0)
+
+    def series(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        items = sorted(self.series().items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(self._values, labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            key = self._key(self._series, labels)
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def series(self) -> Dict[LabelValues, Any]:
+        # Per series: bucket counts (last one is +Inf) followed by the sum.
+        with self._lock:
+            return {key: list(counts) + [total[0]] for key, (counts, total) in self._series.items()}
+
+    def collect(self) -> Dict[str, Any]:
+        return {**super().collect(), "buckets": list(self.buckets)}
+
+    def render(self) -> List[str]:
+        return _render_histogram(self.name, self.labelnames, self.buckets, sorted(self.series().items()))
+
+
+class _Callback(_Metric):
+    """Series computed at scrape time.
+
+    Without labels fn returns one value (None hides the series); with labels it
+    returns a mapping of label-value tuples to values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        fn: Callable[[], Any],
+        labelnames: Sequence[str] = (),
+        merge: str = "sum",
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.kind = kind
+        self.fn = fn
+        self.merge = merge
+
+    def series(self) -> Dict[LabelValues, Any]:
+        value = self.fn()
+        if not self.labelnames:
+            return {} if value is None else {(): value}
+        return {tuple(str(part) for part in key): v for key, v in value.items()}
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in sorted(self.series().items())
+        ]
+
+
+class Registry:
+    """Ordered collection of metrics rendered together on /metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets=buckets))  # type: ignore[return-value]
+
+    def callback(
+        self,
+        name: str,
+        help_text: str,
+        fn: Callable[[], Any],
+        kind: str = "gauge",
+        labelnames: Sequence[str] = (),
+        merge: str = "sum",
+    ) -> None:
+        self._add(_Callback(name, help_text, kind, fn, labelnames, merge))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Every metric's raw series as JSON-serialisable data, in registration order."""
+        return {name: metric.collect() for name, metric in self._metrics.items()}
+
+
+def _render_histogram(
+    name: str, labelnames: Sequence[str], buckets: Sequence[float], items: List[Tuple[LabelValues, List[float]]]
+) -> List[str]:
+    lines: List[str] = []
+    bucket_names = tuple(labelnames) + ("le",)
+    for key, values in items:
+        counts, total = values[:-1], values[-1]
+        cumulative = 0
+        for bound, count in zip(tuple(buckets) + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(bucket_names, tuple(key) + (_format_value(bound),))
+            lines.append(f"{name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(labelnames, key)
+        lines.append(f"{name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{name}_count{labels} {_format_value(cumulative)}")
+    return lines
+
+
+def merge_collections(collections: Sequence[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Combine collect() exports: series with equal labels are summed (or maxed), histograms bucket-wise."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    values: Dict[str, Dict[LabelValues, Any]] = {}
+    for collection in collections:
+        for name, metric in collection.items():
+            if name not in merged:
+                merged[name] = {key: value for key, value in metric.items() if key != "series"}
+                values[name] = {}
+            series = values[name]
+            for labels, value in metric["series"]:
+                key = tuple(labels)
+                if key not in series:
+                    series[key] = list(value) if isinstance(value, list) else value
+                elif metric["kind"] == "histogram":
+                    series[key] = [a + b for a, b in zip(series[key], value)]
+                elif metric.get("merge") == "max":
+                    series[key] = max(series[key], value)
+                else:
+                    series[key] = series[key] + value
+    for name, metric in merged.items():
+        metric["series"] = [[list(key), value] for key, value in sorted(values[name].items())]
+    return merged
+
+
+def render_collection(collection: Dict[str, Dict[str, Any]]) -> str:
+    """Text exposition of a collect()/merge_collections() result; matches Registry.render()."""
+    lines: List[str] = []
+    for name, metric in collection.items():
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric["labelnames"]
+        items = [(tuple(labels), value) for labels, value in metric["series"]]
+        if metric["kind"] == "histogram":
+            lines.extend(_render_histogram(name, labelnames, metric["buckets"], items))
+        else:
+            lines.extend(f"{name}{_format_labels(labelnames, key)} {_format_value(v)}" for key, v in items)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,113 @@
+"""
+Snapshot cache for host-introspection probes (lsusb, ip, docker ps).
+- Probes are plain blocking callables; they always run in a worker thread
+- A background collector refreshes each probe when its TTL expires, but only while
+  someone has read it within idle_after seconds
+- Readers get the last snapshot plus its age; a reader with no snapshot yet waits
+  for the first refresh, and concurrent refreshes of one probe share a single run
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+ProbeFn = Callable[[], Dict[str, Any]]
+
+
+@dataclass
+class _Probe:
+    fn: ProbeFn
+    ttl: float
+    snapshot: Optional[Dict[str, Any]] = None
+    refreshed_at: float = 0.0
+    last_read: float = 0.0
+    refreshes: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class ProbeCache:
+    def __init__(self, idle_after: float = 300.0, tick: float = 1.0) -> None:
+        self.idle_after = idle_after
+        self.tick = tick
+        self._probes: Dict[str, _Probe] = {}
+        self._collector: Optional[asyncio.Task] = None
+
+    def register(self, name: str, fn: ProbeFn, ttl: float) -> None:
+        self._probes[name] = _Probe(fn=fn, ttl=ttl)
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        probe = self._probes[name]
+        probe.last_read = time.monotonic()
+        if probe.snapshot is None:
+            await self.refresh(name)
+        elif self._expired(probe):
+            # Serve the old snapshot now; the next reader sees the fresh one.
+            self._start_refresh(name)
+        assert probe.snapshot is not None
+        return {
+            **probe.snapshot,
+            "age_seconds": round(time.monotonic() - probe.refreshed_at, 3),
+        }
+
+    async def refresh(self, name: str) -> None:
+        await asyncio.shield(self._start_refresh(name))
+
+    def _start_refresh(self, name: str) -> asyncio.Task:
+        probe = self._probes[name]
+        if probe.task is None or probe.task.done():
+            probe.task = asyncio.create_task(self._run_probe(probe))
+        return probe.task
+
+    @staticmethod
+    async def _run_probe(probe: _Probe) -> None:
+        try:
+            snapshot = await asyncio.to_thread(probe.fn)
+        except Exception as exc:  # noqa: BLE001
+            snapshot = {"ok": False, "error": "probe_failed", "detail": str(exc)}
+        probe.snapshot = snapshot
+        probe.refreshed_at = time.monotonic()
+        probe.refreshes += 1
+
+    def _expired(self, probe: _Probe) -> bool:
+        return time.monotonic() - probe.refreshed_at >= probe.ttl
+
+    def _active(self, probe: _Probe) -> bool:
+        return probe.last_read > 0 and time.monotonic() - probe.last_read < self.idle_after
+
+    async def _collect(self) -> None:
+        while True:
+            for name, probe in self._probes.items():
+                if self._active(probe) and self._expired(probe):
+                    self._start_refresh(name)
+            await asyncio.sleep(self.tick)
+
+    def start(self) -> None:
+        if self._collector is None or self._collector.done():
+            self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        tasks = []
+        for probe in self._probes.values():
+            if probe.task is not None and not probe.task.done():
+                tasks.append(probe.task)
+            probe.task = None
+        if self._collector is not None:
+            tasks.append(self._collector)
+            self._collector = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            name: {
+                "ttl_seconds": probe.ttl,
+                "age_seconds": round(now - probe.refreshed_at, 3) if probe.snapshot is not None else None,
+                "refreshes": probe.refreshes,
+                "active": self._active(probe),
+            }
+            for name, probe in self._probes.items()
+        }
@@ -0,0 +1,174 @@
+"""
+Per-device sequence tracking for PLA Node ingest.
+- One small state record per device: highest seq seen plus a sliding bitmap of the
+  `window` sequence numbers below it, so duplicate checks are O(1)
+- Jumps ahead are counted as gaps (missing events); late arrivals that fill a gap are
+  counted as out-of-order and reduce the missing count
+- A device restart resets its state. It is recognised by a seq more than half the window
+  below the highest seen, or by a seq at or below it whose event ts is later than the ts
+  of the highest seq (a retried event keeps its original ts; a rebooted device counting
+  again from 1 does not)
+- The table is an LRU capped at max_devices; the least recently seen device is evicted
+
+Not thread-safe: call it from the event loop only.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+NEW = "new"
+GAP = "gap"
+OUT_OF_ORDER = "out_of_order"
+DUPLICATE = "duplicate"
+RESET = "reset"
+
+
+class DeviceState:
+    __slots__ = ("base", "high", "high_ts", "bits", "received", "missing", "duplicates", "out_of_order", "resets", "last_seen")
+
+    def __init__(self, seq: int, ts: Optional[str] = None) -> None:
+        self.resets = 0
+        self.duplicates = 0
+        self.out_of_order = 0
+        self.restart(seq, ts)
+
+    def restart(self, seq: int, ts: Optional[str] = None) -> None:
+        self.base = seq
+        self.high = seq
+        self.high_ts = ts
+        # Bit i set means high - i has been seen.
+        self.bits = 1
+        self.received = 1
+        self.missing = 0
+        self.last_seen = time.time()
+
+    @property
+    def loss_rate(self) -> float:
+        expected = self.high - self.base + 1
+        return self.missing / expected if expected > 0 else 0.0
+
+
+class SequenceTracker:
+    def __init__(self, window: int = 1024, max_devices: int = 50000) -> None:
+        self.window = max(1, window)
+        self.max_devices = max(1, max_devices)
+        self._mask = (1 << self.window) - 1
+        self._devices: "OrderedDict[str, DeviceState]" = OrderedDict()
+        self.totals: Dict[str, int] = {
+            "duplicates": 0,
+            "missing": 0,
+            "out_of_order": 0,
+            "resets": 0,
+            "evicted": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def is_duplicate(self, device_id: str, seq: int, ts: Optional[str] = None) -> bool:
+        state = self._devices.get(device_id)
+        if state is None or seq > state.high or self._restarted(state, seq, ts):
+            return False
+        return bool(state.bits >> (state.high - seq) & 1)
+
+    def record_duplicate(self, device_id: str) -> None:
+        self.totals["duplicates"] += 1
+        state = self._devices.get(device_id)
+        if state is not None:
+            state.duplicates += 1
+
+    def observe(self, device_id: str, seq: int, ts: Optional[str] = None) -> str:
+        """Record an accepted (device_id, seq) and classify it; ts is the event's own timestamp."""
+        state = self._devices.get(device_id)
+        if state is None:
+            self._devices[device_id] = DeviceState(seq, ts)
+            if len(self._devices) > self.max_devices:
+                self._devices.popitem(last=False)
+                self.totals["evicted"] += 1
+            return NEW
+        self._devices.move_to_end(device_id)
+        state.last_seen = time.time()
+        if seq > state.high:
+            delta = seq - state.high
+            state.bits = ((state.bits << delta) | 1) & self._mask if delta < self.window else 1
+            state.high = seq
+            state.high_ts = ts
+            state.received += 1
+            if delta == 1:
+                return NEW
+            state.missing += delta - 1
+            self.totals["missing"] += delta - 1
+            return GAP
+        if self._restarted(state, seq, ts):
+            state.resets += 1
+            self.totals["resets"] += 1
+            state.restart(seq, ts)
+            return RESET
+        offset = state.high - seq
+        if state.bits >> offset & 1:
+            self.record_duplicate(device_id)
+            return DUPLICATE
+        state.bits |= 1 << offset
+        state.received += 1
+        state.out_of_order += 1
+        self.totals["out_of_order"] += 1
+        if seq >= state.base:
+            state.missing -= 1
+            self.totals["missing"] -= 1
+        else:
+            # Older than anything seen since the last restart: widen the range.
+            state.missing += state.base - seq - 1
+            self.totals["missing"] += state.base - seq - 1
+            state.base = seq
+        return OUT_OF_ORDER
+
+    def device(self, device_id: str) -> Optional[Dict[str, Any]]:
+        state = self._devices.get(device_id)
+        return None if state is None else self._describe(device_id, state)
+
+    def devices(self, limit: int = 100, min_loss: float = 0.0) -> List[Dict[str, Any]]:
+        """Devices ordered by loss rate, worst first."""
+        ranked: List[Tuple[float, str, DeviceState]] = [
+            (state.loss_rate, device_id, state)
+            for device_id, state in self._devices.items()
+            if state.loss_rate >= min_loss
+        ]
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [self._describe(device_id, state) for _, device_id, state in ranked[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"devices": len(self._devices), "window": self.window, "max_devices": self.max_devices, **self.totals}
+
+    def clear(self) -> None:
+        self._devices.clear()
+        for key in self.totals:
+            self.totals[key] = 0
+
+    def _restarted(self, state: DeviceState, seq: int, ts: Optional[str]) -> bool:
+        """True if a seq at or below state.high starts a new run of the device's counter."""
+        if state.high - seq > self.window // 2:
+            return True
+        if ts is None or state.high_ts is None or ts == state.high_ts:
+            return False
+        try:
+            return datetime.fromisoformat(ts) > datetime.fromisoformat(state.high_ts)
+        except (TypeError, ValueError):
+            # Unparseable or naive/aware mix: fall back to the seq window alone.
+            return False
+
+    @staticmethod
+    def _describe(device_id: str, state: DeviceState) -> Dict[str, Any]:
+        return {
+            "device_id": device_id,
+            "last_seq": state.high,
+            "received": state.received,
+            "missing": state.missing,
+            "duplicates": state.duplicates,
+            "out_of_order": state.out_of_order,
+            "resets": state.resets,
+            "loss_rate": round(state.loss_rate, 6),
+            "last_seen": state.last_seen,
+        }
@@ -0,0 +1,385 @@
+"""
+Segmented append-only spool for events that could not be forwarded.
+- Records are NDJSON lines appended to numbered segment files (seg-<n>.log)
+- A small cursor file persists the replay position (segment, byte offset)
+- fsync is batched: at most once per fsync_batch records or fsync_interval seconds
+- Segments behind the cursor are deleted once drained
+- Depth, pending bytes and oldest-record age are counters rebuilt once at startup;
+  reading them never touches the filesystem
+- A spool has one writer. With follow_writes=True an instance only replays: each read
+  first picks up records and segments appended by the writer (typically another process).
+  That writer is opened with write_only=True: it keeps no backlog counters or marks and
+  forgets segments behind the tail, since only the follower ever commits
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".log"
+CURSOR_FILE = "cursor.json"
+# Append-time marks are coalesced to one per this many seconds to bound memory.
+MARK_RESOLUTION_SECONDS = 1.0
+
+
+class SpoolPosition(NamedTuple):
+    segment: int
+    offset: int
+
+
+class SegmentedSpool:
+    """Write-ahead spool: append at the tail, replay sequentially from a persisted cursor."""
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = 4_000_000,
+        fsync_batch: int = 256,
+        fsync_interval: float = 1.0,
+        follow_writes: bool = False,
+        write_only: bool = False,
+    ) -> None:
+        if follow_writes and write_only:
+            raise ValueError("a spool cannot both follow writes and be write-only")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+        self.follow_writes = follow_writes
+        self.write_only = write_only
+        self._lock = threading.Lock()
+        self._writer: Optional[BinaryIO] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._segments: List[int] = self._list_segments()
+        if not self._segments:
+            self._segments = [1]
+            self._segment_path(1).touch()
+        if not follow_writes:
+            # A follower must not touch the writer's tail; torn lines are skipped on read instead.
+            self._repair_tail()
+        self._sizes: Dict[int, int] = {index: self._segment_path(index).stat().st_size for index in self._segments}
+        self._cursor = self._load_cursor()
+        # (position of first record appended, wall-clock time) for each append window.
+        self._marks: Deque[Tuple[SpoolPosition, float]] = deque()
+        self._depth = self._bytes = 0
+        if write_only:
+            # Nothing here ever commits; the follower counts the backlog instead.
+            self._forget_behind_tail()
+            return
+        self._depth = self._count_pending()
+        self._bytes = sum(self._sizes[index] for index in self._segments if index >= self._cursor.segment)
+        self._bytes -= self._cursor.offset
+        self._marks.extend(
+            (SpoolPosition(index, self._cursor.offset if index == self._cursor.segment else 0), mtime)
+            for index, mtime in self._segment_mtimes()
+        )
+
+    # -- public API ---------------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._bytes
+
+    def oldest_age(self) -> Optional[float]:
+        """Seconds since the oldest pending record was spooled, or None when empty."""
+        if not self._depth or not self._marks:
+            return None
+        return max(0.0, time.time() - self._marks[0][1])
+
+    def append(self, records: List[bytes]) -> List[SpoolPosition]:
+        """Append pre-encoded records (one JSON document each, no trailing newline).
+
+        Returns the position just after each record, as read_batch() would report it.
+        """
+        if not records:
+            return []
+        data = b"".join(record + b"\n" for record in records)
+        with self._lock:
+            writer = self._active_writer()
+            start = SpoolPosition(self._segments[-1], self._sizes[self._segments[-1]])
+            positions: List[SpoolPosition] = []
+            offset = start.offset
+            for record in records:
+                offset += len(record) + 1
+                positions.append(SpoolPosition(start.segment, offset))
+            now = time.time()
+            if not self.write_only and (not self._marks or now - self._marks[-1][1] >= MARK_RESOLUTION_SECONDS):
+                self._marks.append((start, now))
+            writer.write(data)
+            writer.flush()
+            self._sizes[start.segment] += len(data)
+            if not self.write_only:
+                self._bytes += len(data)
+                self._depth += len(records)
+            self._unsynced += len(records)
+            if self._unsynced >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+            if self._sizes[start.segment] >= self.segment_max_bytes:
+                self._roll_locked()
+        return positions
+
+    def read_batch(self, max_records: int) -> List[Tuple[bytes, SpoolPosition]]:
+        """Read up to max_records from the cursor without advancing it.
+
+        Each record is paired with the position just after it, which is what
+        commit() expects once that record has been delivered.
+        """
+        out: List[Tuple[bytes, SpoolPosition]] = []
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+            if self.follow_writes:
+                self._refresh_locked()
+            segment, offset = self._cursor
+            for index in [s for s in self._segments if s >= segment]:
+                if index != segment:
+                    offset = 0
+                with self._segment_path(index).open("rb") as fp:
+                    fp.seek(offset)
+                    while len(out) < max_records:
+                        line = fp.readline()
+                        if not line.endswith(b"\n"):
+                            break
+                        out.append((line[:-1], SpoolPosition(index, fp.tell())))
+                if len(out) >= max_records:
+                    break
+        return out
+
+    def commit(self, position: SpoolPosition, count: int) -> None:
+        """Advance the cursor past `count` delivered records ending at `position`."""
+        with self._lock:
+            if position <= self._cursor:
+                return
+            self._bytes = max(0, self._bytes - self._distance(self._cursor, position))
+            self._cursor = position
+            self._depth = max(0, self._depth - count)
+            while len(self._marks) > 1 and self._marks[1][0] <= position:
+                self._marks.popleft()
+            if not self._depth:
+                self._marks.clear()
+            self._collect_locked()
+            self._store_cursor()
+
+    def refresh(self) -> None:
+        """Pick up records appended by the writer since the last read (follow_writes only)."""
+        with self._lock:
+            self._refresh_locked()
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._sync_locked()
+                self._writer.close()
+                self._writer = None
+
+    # -- internals ----------------------------------------------------------
+
+    def _segment_path(self, index: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{index:012d}{SEGMENT_SUFFIX}"
+
+    def _list_segments(self) -> List[int]:
+        indexes = []
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                indexes.append(int(path.name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+        return sorted(indexes)
+
+    def _repair_tail(self) -> None:
+        # A crash mid-append can leave a torn last line; drop it so replay stays line-aligned.
+        path = self._segment_path(self._segments[-1])
+        data = path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with path.open("r+b") as fp:
+                fp.truncate(data.rfind(b"\n") + 1)
+
+    def _load_cursor(self) -> SpoolPosition:
+        try:
+            raw = json.loads((self.directory / CURSOR_FILE).read_text(encoding="utf-8"))
+            cursor = SpoolPosition(int(raw["segment"]), int(raw["offset"]))
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            cursor = SpoolPosition(self._segments[0], 0)
+        if cursor.segment not in self._segments:
+            # Segment vanished underneath us; replay from the next one we still have.
+            later = [s for s in self._segments if s > cursor.segment]
+            cursor = SpoolPosition(later[0] if later else self._segments[0], 0)
+        return cursor
+
+    def _store_cursor(self) -> None:
+        tmp = self.directory / (CURSOR_FILE + ".tmp")
+        tmp.write_text(
+            json.dumps({"segment": self._cursor.segment, "offset": self._cursor.offset}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.directory / CURSOR_FILE)
+
+    def _segment_mtimes(self) -> List[Tuple[int, float]]:
+        # Best effort after a restart: a segment's mtime stands in for its first append time.
+        return [
+            (index, self._segment_path(index).stat().st_mtime)
+            for index in self._segments
+            if index >= self._cursor.segment and self._sizes[index] > (
+                self._cursor.offset if index == self._cursor.segment else 0
+            )
+        ]
+
+    def _distance(self, start: SpoolPosition, end: SpoolPosition) -> int:
+        if start.segment == end.segment:
+            return end.offset - start.offset
+        between = sum(self._sizes.get(index, 0) for index in self._segments if start.segment < index < end.segment)
+        return self._sizes.get(start.segment, 0) - start.offset + between + end.offset
+
+    def _count_pending(self) -> int:
+        pending = 0
+        for index in self._segments:
+            if index < self._cursor.segment:
+                continue
+            with self._segment_path(index).open("rb") as fp:
+                if index == self._cursor.segment:
+                    fp.seek(self._cursor.offset)
+                for chunk in iter(lambda: fp.read(1 << 20), b""):
+                    pending += chunk.count(b"\n")
+        return pending
+
+    def _refresh_locked(self) -> None:
+        # Only the tail can grow and new segments only appear after it, so older sizes stay valid.
+        tail = self._segments[-1]
+        for index in [tail] + [s for s in self._list_segments() if s > tail]:
+            path = self._segment_path(index)
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                continue
+            if index not in self._sizes:
+                self._segments.append(index)
+                self._sizes[index] = 0
+            known = self._sizes[index]
+            if size <= known:
+                continue
+            with path.open("rb") as fp:
+                fp.seek(known)
+                added = fp.read(size - known).count(b"\n")
+            now = time.time()
+            if added and (not self._marks or now - self._marks[-1][1] >= MARK_RESOLUTION_SECONDS):
+                self._marks.append((SpoolPosition(index, known), now))
+            self._sizes[index] = size
+            self._bytes += size - known
+            self._depth += added
+
+    def _active_writer(self) -> BinaryIO:
+        if self._writer is None:
+            self._writer = self._segment_path(self._segments[-1]).open("ab")
+        return self._writer
+
+    def _sync_locked(self) -> None:
+        if self._writer is not None and self._unsynced:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _roll_locked(self) -> None:
+        self._sync_locked()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        next_index = self._segments[-1] + 1
+        self._segment_path(next_index).touch()
+        self._segments.append(next_index)
+        self._sizes[next_index] = 0
+        if self.write_only:
+            self._forget_behind_tail()
+
+    def _forget_behind_tail(self) -> None:
+        # The follower replays and deletes closed segments; the writer only needs the tail.
+        for index in self._segments[:-1]:
+            self._sizes.pop(index, None)
+        del self._segments[:-1]
+
+    def _collect_locked(self) -> None:
+        # Step the cursor over fully drained, closed segments, then delete everything behind it.
+        while self._cursor.segment != self._segments[-1]:
+            if self._cursor.offset < self._sizes[self._cursor.segment]:
+                break
+            following = [s for s in self._segments if s > self._cursor.segment]
+            self._cursor = SpoolPosition(following[0], 0)
+        while self._segments[0] < self._cursor.segment:
+            index = self._segments.pop(0)
+            self._sizes.pop(index, None)
+            self._segment_path(index).unlink(missing_ok=True)
+
+
+class SpoolGroup:
+    """Several spools replayed as one, for a drainer that owns every worker's spool.
+
+    read_batch() serves one member per call, round-robin, and tags each position with
+    the member's name so commit() reaches the right cursor.
+    """
+
+    def __init__(self) -> None:
+        self._members: Dict[str, SegmentedSpool] = {}
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def add(self, name: str, spool: SegmentedSpool) -> None:
+        with self._lock:
+            self._members[name] = spool
+
+    def members(self) -> List[Tuple[str, SegmentedSpool]]:
+        with self._lock:
+            return list(self._members.items())
+
+    @property
+    def depth(self) -> int:
+        return sum(spool.depth for _, spool in self.members())
+
+    @property
+    def pending_bytes(self) -> int:
+        return sum(spool.pending_bytes for _, spool in self.members())
+
+    def oldest_age(self) -> Optional[float]:
+        ages = [age for _, spool in self.members() if (age := spool.oldest_age()) is not None]
+        return max(ages) if ages else None
+
+    def read_batch(self, max_records: int) -> List[Tuple[bytes, Tuple[str, SpoolPosition]]]:
+        members = self.members()
+        for step in range(len(members)):
+            index = (self._next + step) % len(members)
+            name, spool = members[index]
+            records = spool.read_batch(max_records)
+            if records:
+                self._next = index + 1
+                return [(line, (name, position)) for line, position in records]
+        return []
+
+    def commit(self, position: Tuple[str, SpoolPosition], count: int) -> None:
+        name, member_position = position
+        self._members[name].commit(member_position, count)
+
+    def sync(self) -> None:
+        for _, spool in self.members():
+            spool.sync()
+
+    def close(self) -> None:
+        for _, spool in self.members():
+            spool.close()
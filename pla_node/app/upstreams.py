@@ -0,0 +1,238 @@
+"""
+Brain Receiver endpoint pool for PLA Node.
+- Several batch endpoints, chosen per batch by round_robin or least_outstanding
+- Circuit breaker per endpoint: `failure_threshold` consecutive failures open it for
+  `open_seconds`; then one trial batch (half-open) decides whether it closes again.
+  acquire() hands out a Lease that says whether the batch is that trial, so a late
+  answer to a batch sent before the breaker opened cannot stand in for it
+- Background health checks (GET <endpoint base>/health) eject endpoints that fail
+  `unhealthy_threshold` checks in a row and readmit them on the first passing check
+- acquire() is a pure in-memory decision, so with every endpoint down a batch goes
+  straight to the spool instead of waiting for a timeout
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+POLICIES = ("round_robin", "least_outstanding")
+
+
+def health_url(batch_url: str) -> str:
+    return batch_url.rsplit("/", 1)[0] + "/health"
+
+
+class Upstream:
+    __slots__ = (
+        "url",
+        "health_url",
+        "state",
+        "healthy",
+        "outstanding",
+        "consecutive_failures",
+        "failed_checks",
+        "opened_at",
+        "trial_in_flight",
+        "requests",
+        "failures",
+        "ejections",
+        "last_error",
+    )
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.health_url = health_url(url)
+        self.state = CLOSED
+        self.healthy = True
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.failed_checks = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.last_error: Optional[str] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "state": self.state,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections,
+            "last_error": self.last_error,
+        }
+
+
+class Lease(NamedTuple):
+    """One batch's hold on an endpoint, returned to UpstreamPool.release()."""
+
+    upstream: Upstream
+    trial: bool  # the single half-open trial batch
+
+    @property
+    def url(self) -> str:
+        return self.upstream.url
+
+
+class UpstreamPool:
+    def __init__(
+        self,
+        urls: Iterable[str],
+        policy: str = "round_robin",
+        failure_threshold: int = 3,
+        open_seconds: float = 10.0,
+        health_interval: float = 5.0,
+        health_timeout: float = 1.0,
+        unhealthy_threshold: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self.upstreams = [Upstream(url) for url in urls]
+        if not self.upstreams:
+            raise ValueError("at least one receiver URL is required")
+        self.policy = policy
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.unhealthy_threshold = max(1, unhealthy_threshold)
+        self.short_circuits = 0
+        self._clock = clock
+        self._next = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._checker: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.upstreams)
+
+    def acquire(self, exclude: Iterable[Upstream] = ()) -> Optional[Lease]:
+        """Pick an endpoint for one batch and count it as outstanding; None if all are down.
+
+        A retry passes the endpoints it already tried as `exclude`; running out of them is
+        not a short-circuit, since the batch did make a request.
+        """
+        skip = set(id(upstream) for upstream in exclude)
+        candidates: List[Upstream] = []
+        for step in range(len(self.upstreams)):
+            upstream = self.upstreams[(self._next + step) % len(self.upstreams)]
+            if id(upstream) not in skip and self._admits(upstream):
+                candidates.append(upstream)
+        if not candidates:
+            if not skip:
+                self.short_circuits += 1
+            return None
+        chosen = candidates[0]
+        if self.policy == "least_outstanding":
+            chosen = min(candidates, key=lambda upstream: upstream.outstanding)
+        self._next = (self.upstreams.index(chosen) + 1) % len(self.upstreams)
+        trial = chosen.state == HALF_OPEN
+        if trial:
+            chosen.trial_in_flight = True
+        chosen.outstanding += 1
+        chosen.requests += 1
+        return Lease(chosen, trial)
+
+    def release(self, lease: Lease, ok: Optional[bool], error: Optional[str] = None) -> None:
+        """Report a batch outcome; ok=None means it was abandoned (cancelled) without a verdict.
+
+        Only the trial batch moves a half-open or open breaker; other batches count
+        towards opening it while it is closed.
+        """
+        upstream = lease.upstream
+        upstream.outstanding -= 1
+        if lease.trial:
+            upstream.trial_in_flight = False
+        if ok is None:
+            return
+        if not ok:
+            upstream.failures += 1
+            upstream.last_error = error
+        if not lease.trial and upstream.state != CLOSED:
+            return
+        if ok:
+            upstream.consecutive_failures = 0
+            upstream.state = CLOSED
+            return
+        upstream.consecutive_failures += 1
+        if lease.trial or upstream.consecutive_failures >= self.failure_threshold:
+            self._open(upstream)
+
+    def available(self) -> int:
+        return sum(1 for upstream in self.upstreams if upstream.healthy and upstream.state != OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "available": self.available(),
+            "short_circuits": self.short_circuits,
+            "endpoints": [upstream.stats() for upstream in self.upstreams],
+        }
+
+    async def start(self) -> None:
+        if self.health_interval <= 0:
+            return
+        self._client = httpx.AsyncClient(timeout=self.health_timeout)
+        self._checker = asyncio.create_task(self._run_checks())
+
+    async def stop(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            await asyncio.gather(self._checker, return_exceptions=True)
+            self._checker = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def check(self) -> None:
+        """Run one health check round against every endpoint."""
+        await asyncio.gather(*(self._check(upstream) for upstream in self.upstreams))
+
+    def _admits(self, upstream: Upstream) -> bool:
+        if not upstream.healthy:
+            return False
+        if upstream.state == OPEN:
+            if self._clock() - upstream.opened_at < self.open_seconds:
+                return False
+            upstream.state = HALF_OPEN
+        if upstream.state == HALF_OPEN:
+            return not upstream.trial_in_flight
+        return True
+
+    def _open(self, upstream: Upstream) -> None:
+        upstream.state = OPEN
+        upstream.opened_at = self._clock()
+
+    async def _check(self, upstream: Upstream) -> None:
+        assert self._client is not None
+        try:
+            ok = (await self._client.get(upstream.health_url)).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            upstream.failed_checks = 0
+            upstream.healthy = True
+            if upstream.state == OPEN:
+                # The endpoint answers again; let the next batch try it instead of waiting out the timer.
+                upstream.state = HALF_OPEN
+            return
+        upstream.failed_checks += 1
+        if upstream.healthy and upstream.failed_checks >= self.unhealthy_threshold:
+            upstream.healthy = False
+            upstream.ejections += 1
+
+    async def _run_checks(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
@@ -0,0 +1,118 @@
+"""
+Coordination between uvicorn worker processes for PLA Node (PLA_WORKERS > 1).
+- Each worker claims a numbered slot (w0, w1, ...) with an flock; the slot names its
+  private spool and journal directories, so every spool has exactly one writer
+- Exactly one worker holds the drain lease (another flock) and replays every slot's spool;
+  the lease is released by the kernel when its holder exits, so a survivor takes over
+- Workers publish metric snapshots to small JSON files; any worker answering /metrics or
+  /status merges its own live values with its peers' latest snapshots
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SLOT_PREFIX = "w"
+SNAPSHOT_PREFIX = "metrics-"
+SNAPSHOT_SUFFIX = ".json"
+
+
+class FileLock:
+    """Non-blocking exclusive flock on a file; held until release() or process exit."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def slot_name(index: int) -> str:
+    return f"{SLOT_PREFIX}{index}"
+
+
+def slot_lock(state_dir: Path, index: int) -> FileLock:
+    return FileLock(Path(state_dir) / f"slot-{index}.lock")
+
+
+def claim_slot(state_dir: Path, max_slots: int) -> Tuple[int, FileLock]:
+    """Claim the lowest free slot; raises RuntimeError when all max_slots are taken."""
+    for index in range(max_slots):
+        lock = slot_lock(state_dir, index)
+        if lock.try_acquire():
+            return index, lock
+    raise RuntimeError(f"no free worker slot in {state_dir} (max {max_slots})")
+
+
+def slot_dirs(base: Path) -> List[Path]:
+    """Slot subdirectories (w0, w1, ...) under a spool or journal directory, in slot order."""
+    found = []
+    for path in Path(base).glob(f"{SLOT_PREFIX}*"):
+        suffix = path.name[len(SLOT_PREFIX) :]
+        if path.is_dir() and suffix.isdigit():
+            found.append((int(suffix), path))
+    return [path for _, path in sorted(found)]
+
+
+class SnapshotStore:
+    """One JSON snapshot file per worker in a shared directory."""
+
+    def __init__(self, directory: Path, worker: str, stale_after: float = 30.0) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.worker = worker
+        self.stale_after = stale_after
+
+    def _path(self, worker: str) -> Path:
+        return self.directory / f"{SNAPSHOT_PREFIX}{worker}{SNAPSHOT_SUFFIX}"
+
+    def publish(self, snapshot: Dict[str, Any]) -> None:
+        path = self._path(self.worker)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({**snapshot, "worker": self.worker, "published_at": time.time()}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def peers(self) -> List[Dict[str, Any]]:
+        """Fresh snapshots of the other workers; files older than stale_after belong to dead workers."""
+        now = time.time()
+        out = []
+        for path in sorted(self.directory.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}")):
+            if path == self._path(self.worker):
+                continue
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                continue
+            if now - float(snapshot.get("published_at", 0)) <= self.stale_after:
+                out.append(snapshot)
+        return out
+
+    def remove(self) -> None:
+        self._path(self.worker).unlink(missing_ok=True)
@@ -0,0 +1 @@
+"""Load generation and benchmarks for the PLA Node -> Brain Receiver pipeline."""
@@ -0,0 +1,349 @@
+"""
+End-to-end benchmark for the PLA Node -> Brain Receiver pipeline.
+
+Starts pla_node (uvicorn subprocess, isolated spool/journal/log dirs) and an in-process
+receiver stand-in, drives a synthetic device fleet at a fixed aggregate rate, and
+writes machine-readable JSON results: throughput, ingest and end-to-end latency
+percentiles, spool growth and drain time.
+
+    python -m pla_node.bench.pipeline --devices 200 --rate 1000 --duration 20 \\
+        --payload-bytes 256 --outage 5:10 --output bench.json
+
+Extra pla_node settings can be passed as --node-env NAME=VALUE (e.g. PLA_FORWARD_MODE=passthrough).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .receiver_stub import StubReceiver
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+RESULT_FORMAT = 1
+
+
+def percentiles(values: Sequence[float], points: Sequence[int] = (50, 95, 99)) -> Dict[str, Optional[float]]:
+    """Nearest-rank percentiles plus max, in milliseconds, from values in seconds."""
+    if not values:
+        return {**{f"p{point}": None for point in points}, "max": None}
+    ordered = sorted(values)
+    out: Dict[str, Optional[float]] = {}
+    for point in points:
+        rank = max(1, math.ceil(point / 100 * len(ordered)))
+        out[f"p{point}"] = round(ordered[rank - 1] * 1000, 3)
+    out["max"] = round(ordered[-1] * 1000, 3)
+    return out
+
+
+def parse_outage(text: str) -> Tuple[float, float]:
+    start, _, end = text.partition(":")
+    window = (float(start), float(end))
+    if window[1] <= window[0]:
+        raise argparse.ArgumentTypeError("outage must be START:END with END > START")
+    return window
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Fleet:
+    """Synthetic devices with their own monotonically increasing seq."""
+
+    def __init__(self, devices: int, payload_bytes: int, event_type: str = "bench_tick") -> None:
+        self.device_ids = [f"bench-{index:05d}" for index in range(devices)]
+        self.seqs = [0] * devices
+        self.pad = "x" * max(0, payload_bytes)
+        self.event_type = event_type
+        self._next = 0
+
+    def next_event(self) -> Dict[str, Any]:
+        index = self._next
+        self._next = (self._next + 1) % len(self.device_ids)
+        self.seqs[index] += 1
+        return {
+            "event_version": "1.0",
+            "device_id": self.device_ids[index],
+            "event_type": self.event_type,
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "seq": self.seqs[index],
+            "payload": {"bench_t": time.monotonic(), "pad": self.pad},
+        }
+
+
+class LoadGenerator:
+    def __init__(self, client: httpx.AsyncClient, fleet: Fleet, rate: float, batch: int, max_concurrency: int) -> None:
+        self.client = client
+        self.fleet = fleet
+        self.rate = rate
+        self.batch = batch
+        self.slots = asyncio.Semaphore(max(1, max_concurrency))
+        self.latencies: List[float] = []
+        self.statuses: Dict[str, int] = {}
+        self.sent = 0
+        self.accepted = 0
+        self.errors = 0
+        self.max_lag = 0.0
+
+    async def run(self, duration: float) -> None:
+        per_request = max(1, self.batch)
+        interval = per_request / self.rate
+        start = time.monotonic()
+        tasks = set()
+        index = 0
+        while True:
+            due = start + index * interval
+            if due - start >= duration:
+                break
+            now = time.monotonic()
+            if due > now:
+                await asyncio.sleep(due - now)
+            else:
+                self.max_lag = max(self.max_lag, now - due)
+            events = [self.fleet.next_event() for _ in range(per_request)]
+            await self.slots.acquire()
+            task = asyncio.create_task(self._send(events))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            index += 1
+        await asyncio.gather(*tasks)
+
+    async def _send(self, events: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            if self.batch:
+                resp = await self.client.post("/ingest/batch", json=events)
+            else:
+                resp = await self.client.post("/ingest", json=events[0])
+        except httpx.HTTPError:
+            self.errors += 1
+            return
+        finally:
+            self.slots.release()
+            self.sent += len(events)
+        self.latencies.append(time.perf_counter() - started)
+        status = str(resp.status_code)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if resp.status_code == 202:
+            self.accepted += resp.json().get("accepted", 1) if self.batch else 1
+
+
+class StatusSampler:
+    def __init__(self, client: httpx.AsyncClient, interval: float) -> None:
+        self.client = client
+        self.interval = interval
+        self.samples: List[Dict[str, Any]] = []
+        self.started = time.monotonic()
+
+    async def sample(self) -> Dict[str, Any]:
+        status = (await self.client.get("/status")).json()
+        sample = {
+            "t": round(time.monotonic() - self.started, 3),
+            "spool_depth": status["spool"]["depth"],
+            "spool_bytes": status["spool"]["bytes"],
+            "forward_queued": status["forwarder"]["queued"],
+            "forward_in_flight": status["forwarder"]["in_flight"],
+            "journal_unacked": (status.get("journal") or {}).get("unacked", 0),
+        }
+        self.samples.append(sample)
+        return sample
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(self.interval)
+
+
+async def _wait_healthy(url: str, timeout: float, process: Optional[subprocess.Popen] = None) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"pla_node exited with status {process.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not become healthy within {timeout}s")
+
+
+def _node_env(args: argparse.Namespace, workdir: Path, receiver_url: str) -> Dict[str, str]:
+    env = {key: value for key, value in os.environ.items() if not key.startswith("PLA_")}
+    env.update(
+        {
+            "BRAIN_RECEIVER_URL": f"{receiver_url}/event",
+            "BRAIN_RECEIVER_BATCH_URL": f"{receiver_url}/events",
+            "PLA_SPOOL_DIR": str(workdir / "spool"),
+            "PLA_JOURNAL_DIR": str(workdir / "journal"),
+            "PLA_LOG_PATH": str(workdir / "events.ndjson"),
+            "PLA_STATE_DIR": str(workdir / "state"),
+            "PLA_WORKERS": str(args.workers),
+            # Benchmarks measure the pipeline, not the per-device limiter.
+            "PLA_DEVICE_RATE": "0",
+            "PYTHONPATH": str(REPO_ROOT),
+        }
+    )
+    for item in args.node_env:
+        name, _, value = item.partition("=")
+        env[name] = value
+    return env
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    receiver = StubReceiver(fail_rate=args.fail_rate, outages=args.outage, seed=args.seed)
+    receiver_port, node_port = _free_port(), _free_port()
+    receiver_url = f"http://127.0.0.1:{receiver_port}"
+    node_url = f"http://127.0.0.1:{node_port}"
+
+    import uvicorn  # only needed to run the benchmark
+
+    server = uvicorn.Server(
+        uvicorn.Config(receiver, host="127.0.0.1", port=receiver_port, log_level="warning", lifespan="off")
+    )
+    server_task = asyncio.create_task(server.serve())
+    with tempfile.TemporaryDirectory(prefix="pla-bench-") as tmp:
+        workdir = Path(tmp)
+        cmd = [sys.executable, "-m", "uvicorn", "pla_node.app.fastapi_app:app",
+               "--host", "127.0.0.1", "--port", str(node_port), "--log-level", "warning",
+               "--workers", str(args.workers)]
+        process = subprocess.Popen(cmd, cwd=REPO_ROOT, env=_node_env(args, workdir, receiver_url))
+        try:
+            await _wait_healthy(receiver_url, 10)
+            await _wait_healthy(node_url, 30, process)
+            limits = httpx.Limits(max_connections=args.max_concurrency, max_keepalive_connections=args.max_concurrency)
+            async with httpx.AsyncClient(base_url=node_url, limits=limits, timeout=30) as client:
+                return await _drive(args, client, receiver)
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            server.should_exit = True
+            await server_task
+
+
+async def _drive(args: argparse.Namespace, client: httpx.AsyncClient, receiver: StubReceiver) -> Dict[str, Any]:
+    fleet = Fleet(args.devices, args.payload_bytes)
+    generator = LoadGenerator(client, fleet, args.rate, args.batch, args.max_concurrency)
+    sampler = StatusSampler(client, args.sample_interval)
+    started_at = datetime.now(timezone.utc).isoformat()
+    receiver.start()
+    sampler_task = asyncio.create_task(sampler.run())
+    load_started = time.monotonic()
+    await generator.run(args.duration)
+    load_seconds = time.monotonic() - load_started
+
+    # Drain: wait until everything accepted has reached the receiver and the spool is empty.
+    settle_started = time.monotonic()
+    drained = False
+    while time.monotonic() - settle_started < args.drain_timeout:
+        sample = await sampler.sample()
+        if sample["spool_depth"] == 0 and sample["forward_queued"] == 0 and sample["forward_in_flight"] == 0:
+            if len(receiver.keys) >= generator.accepted:
+                drained = True
+                break
+        await asyncio.sleep(args.sample_interval)
+    outage_end = max((end for _, end in args.outage), default=0.0)
+    drain_reference = max(load_started + load_seconds, receiver.started + outage_end)
+    drain_seconds = round(max(0.0, time.monotonic() - drain_reference), 3) if drained else None
+    sampler_task.cancel()
+    await asyncio.gather(sampler_task, return_exceptions=True)
+
+    return {
+        "format": RESULT_FORMAT,
+        "started_at": started_at,
+        "config": {
+            "devices": args.devices,
+            "rate_eps": args.rate,
+            "duration_s": args.duration,
+            "payload_bytes": args.payload_bytes,
+            "batch": args.batch,
+            "workers": args.workers,
+            "max_concurrency": args.max_concurrency,
+            "fail_rate": args.fail_rate,
+            "outages": [list(window) for window in args.outage],
+            "node_env": list(args.node_env),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": {
+            "sent": generator.sent,
+            "accepted": generator.accepted,
+            "http_status": generator.statuses,
+            "client_errors": generator.errors,
+            "generator_max_lag_ms": round(generator.max_lag * 1000, 3),
+            "ingest_throughput_eps": round(generator.accepted / load_seconds, 2) if load_seconds else 0.0,
+            "ingest_latency_ms": percentiles(generator.latencies),
+            "delivered": len(receiver.keys),
+            "delivered_duplicates": receiver.duplicates,
+            "receiver_batches": receiver.batches,
+            "receiver_failed_batches": receiver.failed_batches,
+            "e2e_latency_ms": percentiles(receiver.latencies),
+            "spool_max_depth": max((s["spool_depth"] for s in sampler.samples), default=0),
+            "spool_max_bytes": max((s["spool_bytes"] for s in sampler.samples), default=0),
+            "drained": drained,
+            "drain_seconds": drain_seconds,
+            "samples": sampler.samples,
+        },
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--devices", type=int, default=100, help="synthetic devices in the fleet")
+    parser.add_argument("--rate", type=float, default=500.0, help="aggregate events/second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--payload-bytes", type=int, default=128, help="padding added to each event payload")
+    parser.add_argument("--batch", type=int, default=0, help="events per /ingest/batch request (0 = /ingest)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for pla_node")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="requests in flight from the generator")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of receiver batches answered 503")
+    parser.add_argument("--outage", type=parse_outage, action="append", default=[],
+                        help="receiver outage window START:END in seconds from load start (repeatable)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="seconds to wait for the spool to empty")
+    parser.add_argument("--sample-interval", type=float, default=0.25, help="seconds between /status samples")
+    parser.add_argument("--node-env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra environment for pla_node (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write JSON results here instead of stdout")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run_benchmark(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0 if results["results"]["drained"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
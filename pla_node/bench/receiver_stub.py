@@ -0,0 +1,101 @@
+"""
+Brain Receiver stand-in for pipeline benchmarks.
+- ASGI app answering POST /events (JSON array or NDJSON) and POST /event like the real receiver,
+  echoing X-Request-ID so pla_node treats the batch as acknowledged
+- Records arrival time per event; events carry the generator's send time in
+  payload["bench_t"] (time.monotonic), so end-to-end latency needs no clock sync
+- Failure injection: a random failure rate and outage windows relative to start()
+"""
+from __future__ import annotations
+
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class StubReceiver:
+    def __init__(self, fail_rate: float = 0.0, outages: Sequence[Tuple[float, float]] = (), seed: int = 0) -> None:
+        self.fail_rate = fail_rate
+        self.outages = list(outages)
+        self.random = random.Random(seed)
+        self.started = time.monotonic()
+        self.latencies: List[float] = []
+        self.keys: Dict[Tuple[str, int], int] = {}
+        self.batches = 0
+        self.failed_batches = 0
+
+    def start(self) -> None:
+        self.started = time.monotonic()
+
+    @property
+    def received(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.keys.values())
+
+    def failing(self, now: Optional[float] = None) -> bool:
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+        if any(start <= elapsed < end for start, end in self.outages):
+            return True
+        return self.fail_rate > 0 and self.random.random() < self.fail_rate
+
+    def record(self, events: List[Any]) -> None:
+        now = time.monotonic()
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            sent = (event.get("payload") or {}).get("bench_t")
+            if isinstance(sent, (int, float)):
+                self.latencies.append(now - sent)
+            key = (str(event.get("device_id")), event.get("seq"))
+            self.keys[key] = self.keys.get(key, 0) + 1
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while (await receive())["type"] != "lifespan.shutdown":
+                await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {key.decode().lower(): value.decode() for key, value in scope["headers"]}
+        path = scope["path"]
+        if path == "/health":
+            await self._reply(send, 200, {"ok": True, "status": "ready"})
+            return
+        if scope["method"] != "POST" or path not in ("/event", "/events"):
+            await self._reply(send, 404, {"ok": False, "error": "not_found"})
+            return
+        self.batches += 1
+        if self.failing():
+            self.failed_batches += 1
+            await self._reply(send, 503, {"ok": False, "error": "injected_failure"})
+            return
+        if "ndjson" in headers.get("content-type", ""):
+            events = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            parsed = json.loads(body)
+            events = parsed if isinstance(parsed, list) else [parsed]
+        self.record(events)
+        request_id = headers.get("x-request-id", "")
+        results = [{"index": index, "ok": True} for index in range(len(events))]
+        await self._reply(send, 200, {"ok": True, "request_id": request_id, "accepted": len(events), "results": results})
+
+    @staticmethod
+    async def _reply(send, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(data)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": data})
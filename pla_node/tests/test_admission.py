@@ -0,0 +1,70 @@
+import pytest
+
+from pla_node.app.admission import AdmissionController, RateLimiter, retry_after_header
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2, burst=3, clock=clock)
+    assert [limiter.acquire("dev") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("dev") == pytest.approx(0.5)
+    clock.now = 0.5
+    assert limiter.acquire("dev") == 0
+    assert limiter.acquire("other") == 0
+
+
+def test_oversized_cost_goes_into_debt():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=10, burst=5, clock=clock)
+    assert limiter.acquire("key", cost=20) == 0
+    assert limiter.acquire("key") == pytest.approx(1.6)
+
+
+def test_disabled_limiter_admits_everything_and_tracks_nothing():
+    limiter = RateLimiter(rate=0, burst=0)
+    assert all(limiter.acquire("dev") == 0 for _ in range(1000))
+    assert len(limiter) == 0
+
+
+def test_bucket_table_is_bounded():
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+    assert len(limiter) == 2
+
+
+def test_in_flight_cap_and_rejection_counts():
+    admission = AdmissionController(max_in_flight=1)
+    assert admission.enter()
+    assert not admission.enter()
+    admission.leave()
+    assert admission.enter()
+    assert admission.rejected["in_flight"] == 1
+
+
+def test_configure_applies_to_existing_buckets():
+    clock = FakeClock()
+    admission = AdmissionController(device_rate=1, device_burst=1, clock=clock)
+    admission.check_device("dev")
+    assert admission.check_device("dev") > 0
+    admission.configure({"device_rate": 0})
+    assert admission.check_device("dev") == 0
+    assert admission.rejected["device_rate"] == 1
+
+    with pytest.raises(ValueError):
+        admission.configure({"device_rate": -1})
+    with pytest.raises(ValueError):
+        admission.configure({"bogus": 1})
+
+
+def test_retry_after_header_rounds_up():
+    assert retry_after_header(0.01) == "1"
+    assert retry_after_header(2.2) == "3"
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from pla_node.app.async_log import AsyncLogWriter
+
+
+def test_writer_drains_in_order_in_batches():
+    batches = []
+    writer = AsyncLogWriter(batches.append, capacity=100, batch_size=3)
+    for i in range(7):
+        writer.emit(f"line-{i}", "debug" if i % 2 else "info")
+    writer.start()
+    writer.stop()
+
+    assert [line for batch in batches for line in batch] == [f"line-{i}" for i in range(7)]
+    assert all(len(batch) <= 3 for batch in batches)
+    assert writer.written == 7
+
+
+def test_drop_debug_first_evicts_oldest_debug_line():
+    lines = []
+    writer = AsyncLogWriter(lines.extend, capacity=3, policy="drop_debug_first")
+    writer.emit("info-1")
+    writer.emit("debug-1", "debug")
+    writer.emit("debug-2", "debug")
+    assert writer.emit("info-2")
+    assert not writer.emit("debug-3", "debug")
+    writer.start()
+    writer.stop()
+
+    assert lines == ["info-1", "debug-2", "info-2"]
+    assert writer.dropped == {"debug": 2, "info": 0}
+
+
+def test_drop_new_counts_dropped_lines():
+    writer = AsyncLogWriter(lambda batch: None, capacity=1, policy="drop_new")
+    assert writer.emit("a")
+    assert not writer.emit("b")
+    assert writer.dropped["info"] == 1
+
+
+def test_block_policy_waits_for_writer():
+    release = threading.Event()
+    lines = []
+
+    def slow_sink(batch):
+        release.wait(5)
+        lines.extend(batch)
+
+    writer = AsyncLogWriter(slow_sink, capacity=1, policy="block", batch_size=1)
+    writer.start()
+    writer.emit("a")
+    done = threading.Event()
+
+    def emit_more():
+        writer.emit("b")
+        writer.emit("c")
+        done.set()
+
+    threading.Thread(target=emit_more, daemon=True).start()
+    assert not done.wait(0.2)
+    release.set()
+    assert done.wait(5)
+    writer.stop()
+    assert lines == ["a", "b", "c"]
+    assert writer.dropped == {"debug": 0, "info": 0}
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        AsyncLogWriter(lambda batch: None, policy="spill")
@@ -0,0 +1,68 @@
+import httpx
+import pytest
+
+from pla_node.bench.pipeline import Fleet, build_parser, percentiles
+from pla_node.bench.receiver_stub import StubReceiver
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+def test_percentiles_nearest_rank_in_ms():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentiles(values) == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+    assert percentiles([]) == {"p50": None, "p95": None, "p99": None, "max": None}
+
+
+def test_fleet_round_robins_devices_with_increasing_seq():
+    fleet = Fleet(devices=2, payload_bytes=8)
+    events = [fleet.next_event() for _ in range(4)]
+    assert [(e["device_id"], e["seq"]) for e in events] == [
+        ("bench-00000", 1),
+        ("bench-00001", 1),
+        ("bench-00000", 2),
+        ("bench-00001", 2),
+    ]
+    assert events[0]["payload"]["pad"] == "x" * 8
+    assert "bench_t" in events[0]["payload"]
+
+
+def test_parser_collects_outage_windows():
+    args = build_parser().parse_args(["--outage", "1:2", "--outage", "5:7.5"])
+    assert args.outage == [(1.0, 2.0), (5.0, 7.5)]
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--outage", "3:1"])
+
+
+@pytest.mark.anyio
+async def test_stub_receiver_echoes_request_id_and_records_events():
+    receiver = StubReceiver()
+    events = Fleet(devices=1, payload_bytes=0)
+    batch = [events.next_event(), events.next_event()]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=receiver), base_url="http://stub") as client:
+        resp = await client.post("/events", json=batch, headers={"X-Request-ID": "batch-1"})
+        ndjson = b"\n".join(httpx.Response(200, json=e).content for e in batch)
+        again = await client.post(
+            "/events", content=ndjson, headers={"X-Request-ID": "batch-2", "Content-Type": "application/x-ndjson"}
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["request_id"] == "batch-1"
+    assert again.json()["accepted"] == 2
+    assert receiver.received == 4
+    assert receiver.duplicates == 2
+    assert receiver.batches == 2
+
+
+@pytest.mark.anyio
+async def test_stub_receiver_fails_inside_outage_window():
+    receiver = StubReceiver(outages=[(0.0, 60.0)])
+    receiver.start()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=receiver), base_url="http://stub") as client:
+        resp = await client.post("/events", json=[Fleet(1, 0).next_event()], headers={"X-Request-ID": "b"})
+
+    assert resp.status_code == 503
+    assert receiver.failed_batches == 1
+    assert receiver.received == 0
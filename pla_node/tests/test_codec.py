@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pla_node.app import codec
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(params=["accelerated", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(codec, "orjson", None)
+    elif codec.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_round_trip_is_compact_utf8(backend):  # noqa: ARG001
+    event = {"device_id": "capteur-é", "seq": 3, "payload": {"ok": True, "v": [1, 2.5, None]}}
+    encoded = codec.dumps(event)
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded
+    assert "capteur-é".encode("utf-8") in encoded
+    assert codec.loads(encoded) == event
+    assert codec.loads(encoded.decode("utf-8")) == event
+
+
+def test_invalid_input_raises_json_decode_error(backend):  # noqa: ARG001
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b"{not-json")
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"a": "\xff"}')
+
+
+def test_integers_beyond_64_bits_stay_exact(backend):  # noqa: ARG001
+    for value in (123456789012345678901234567890, 2**64, -(2**63) - 1, 10**400):
+        raw = b'{"a":' + str(value).encode() + b"}"
+        assert codec.loads(raw) == {"a": value}
+        assert codec.loads(raw.decode()) == {"a": value}
+        assert codec.dumps({"a": value}) == raw
+    assert codec.loads(b'{"id":"1234567890123456789","v":1.5}') == {"id": "1234567890123456789", "v": 1.5}
+
+
+def test_join_array_reuses_encoded_documents(backend):  # noqa: ARG001
+    docs = [codec.dumps({"seq": 1}), codec.dumps({"seq": 2})]
+    assert codec.loads(codec.join_array(docs)) == [{"seq": 1}, {"seq": 2}]
+    assert codec.join_array([]) == b"[]"
+
+
+def test_brain_receiver_copy_is_in_sync():
+    receiver_copy = REPO_ROOT / "software" / "brain_receiver" / "codec.py"
+    assert receiver_copy.read_text(encoding="utf-8").replace(
+        "pla_node/app/codec.py", "software/brain_receiver/codec.py"
+    ) == (REPO_ROOT / "pla_node" / "app" / "codec.py").read_text(encoding="utf-8")
+
+
+def test_ndjson_framing_and_content_hash():
+    assert codec.join_lines([b'{"a":1}', b"[2]"]) == b'{"a":1}\n[2]\n'
+    assert codec.single_line(b' {"a": 1}\n') == b'{"a": 1}'
+    assert codec.single_line(b'{\n"a": 1}') is None
+    assert codec.content_hash(b"") == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
@@ -0,0 +1,76 @@
+import pytest
+
+from pla_node.app.drain import SpoolDrainer
+from pla_node.app.spool import SegmentedSpool
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+def _fill(spool, count):
+    spool.append([f'{{"seq":{seq}}}'.encode() for seq in range(count)])
+
+
+@pytest.mark.anyio
+async def test_drains_in_parallel_chunks(tmp_path):
+    spool = SegmentedSpool(tmp_path)
+    _fill(spool, 10)
+    chunks = []
+
+    async def deliver(lines):
+        chunks.append(len(lines))
+
+    drainer = SpoolDrainer(spool, deliver, batch_size=3, parallelism=4)
+    committed = await drainer.drain_once(spool.read_batch(12))
+
+    assert committed == 10
+    assert chunks == [3, 3, 3, 1]
+    assert spool.depth == 0
+    assert drainer.stats()["drained_total"] == 10
+
+
+@pytest.mark.anyio
+async def test_commits_only_the_delivered_prefix(tmp_path):
+    spool = SegmentedSpool(tmp_path)
+    _fill(spool, 6)
+    calls = []
+
+    async def deliver(lines):
+        calls.append(lines[0])
+        if lines[0] == b'{"seq":2}':
+            raise RuntimeError("receiver down")
+
+    drainer = SpoolDrainer(spool, deliver, batch_size=2, parallelism=3)
+    committed = await drainer.drain_once(spool.read_batch(6))
+
+    # Chunk [2, 3] failed, so [4, 5] stays spooled even though it was delivered.
+    assert committed == 2
+    assert spool.depth == 4
+    assert drainer.failures == 1
+    assert drainer.last_error == "receiver down"
+    assert [line for line, _ in spool.read_batch(1)] == [b'{"seq":2}']
+
+
+def test_backoff_grows_with_jitter_and_caps(tmp_path):
+    drainer = SpoolDrainer(SegmentedSpool(tmp_path), None, backoff_base=1.0, backoff_max=8.0)
+    for failures, cap in [(1, 1.0), (2, 2.0), (3, 4.0), (10, 8.0)]:
+        drainer.failures = failures
+        delay = drainer._backoff()
+        assert cap / 2 <= delay <= cap
+
+
+@pytest.mark.anyio
+async def test_rate_cap_spaces_out_sends(tmp_path, monkeypatch):
+    drainer = SpoolDrainer(SegmentedSpool(tmp_path), None, max_rate=100)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("pla_node.app.drain.asyncio.sleep", fake_sleep)
+    await drainer._throttle(50)
+    await drainer._throttle(50)
+    assert len(sleeps) == 1
+    assert 0.4 < sleeps[0] <= 0.5
@@ -0,0 +1,100 @@
+import json
+import random
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft202012Validator, FormatChecker, ValidationError
+
+from pla_node.app.event_validator import EnvelopeValidator, UnsupportedSchema, build_validator
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SCHEMA = json.loads((REPO_ROOT / "contracts" / "event.schema.json").read_text(encoding="utf-8"))
+
+VALID = {
+    "event_version": "1.0",
+    "device_id": "dev-1",
+    "event_type": "button_press",
+    "ts": "2024-05-01T12:00:00+00:00",
+    "seq": 1,
+    "payload": {"pressed": True},
+}
+ODD_VALUES = [
+    None, True, False, 0, -1, 1, 2.5, -1.0, 3.0, float("inf"), float("nan"), "", "x", "not-a-date",
+    "2024-05-01T12:00:00Z", [], [1], {}, {"a": 1},
+]
+
+
+def _strict_format_checker():
+    checker = FormatChecker()
+
+    @checker.checks("date-time", raises=ValueError)
+    def is_datetime(instance):
+        if not isinstance(instance, str):
+            return True
+        datetime.fromisoformat(instance.replace("Z", "+00:00"))
+        return True
+
+    return checker
+
+
+def _fuzz_corpus(seed=1234, size=3000):
+    rng = random.Random(seed)
+    keys = list(VALID)
+    corpus = [dict(VALID), [], "event", 7, None]
+    for _ in range(size):
+        event = dict(VALID)
+        for _ in range(rng.randint(1, 3)):
+            op = rng.random()
+            if op < 0.3:
+                event.pop(rng.choice(keys), None)
+            elif op < 0.5:
+                event[rng.choice(["extra", "zzz", "1", "Request_id"])] = rng.choice(ODD_VALUES)
+            else:
+                event[rng.choice(keys)] = rng.choice(ODD_VALUES)
+        corpus.append(event)
+    return corpus
+
+
+def _first_error(validator, instance):
+    try:
+        validator.validate(instance)
+    except ValidationError as err:
+        return err.message, list(err.path), err.validator, list(err.schema_path)
+    return None
+
+
+@pytest.mark.parametrize("format_checker", [FormatChecker(), _strict_format_checker()], ids=["default", "date-time"])
+def test_matches_jsonschema_on_fuzz_corpus(format_checker):
+    reference = Draft202012Validator(SCHEMA, format_checker=format_checker)
+    fast = EnvelopeValidator(SCHEMA, format_checker=format_checker)
+    mismatches = []
+    for instance in _fuzz_corpus():
+        expected = _first_error(reference, instance)
+        actual = _first_error(fast, instance)
+        if expected != actual:
+            mismatches.append((instance, expected, actual))
+    assert not mismatches, mismatches[:5]
+
+
+def test_reports_multiple_additional_properties_like_jsonschema():
+    event = dict(VALID, b=1, a=2)
+    expected = _first_error(Draft202012Validator(SCHEMA), event)
+    assert _first_error(EnvelopeValidator(SCHEMA), event) == expected
+    assert expected[0] == "Additional properties are not allowed ('a', 'b' were unexpected)"
+
+
+def test_falls_back_to_jsonschema_for_unsupported_keywords():
+    schema = dict(SCHEMA, properties=dict(SCHEMA["properties"], seq={"type": "integer", "maximum": 5}))
+    with pytest.raises(UnsupportedSchema):
+        EnvelopeValidator(schema)
+    assert isinstance(build_validator(schema), Draft202012Validator)
+    assert isinstance(build_validator(SCHEMA), EnvelopeValidator)
+
+
+def test_brain_receiver_copy_is_in_sync():
+    pla_copy = REPO_ROOT / "pla_node" / "app" / "event_validator.py"
+    receiver_copy = REPO_ROOT / "software" / "brain_receiver" / "event_validator.py"
+    assert receiver_copy.read_text(encoding="utf-8").replace(
+        "pla_node/app/event_validator.py", "software/brain_receiver/event_validator.py"
+    ) == pla_copy.read_text(encoding="utf-8")
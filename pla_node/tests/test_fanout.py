@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from pla_node.app.fanout import EventHub
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_publish_filters_per_subscriber():
+    hub = EventHub()
+    everything = hub.subscribe()
+    only_dev2 = hub.subscribe(device_ids=["dev-2"])
+    only_alarms = hub.subscribe(event_types=["alarm"])
+
+    hub.publish({"device_id": "dev-1", "event_type": "alarm"}, b"1")
+    hub.publish({"device_id": "dev-2", "event_type": "button_press"}, b"2")
+
+    assert list(everything.queue) == [b"1", b"2"]
+    assert list(only_dev2.queue) == [b"2"]
+    assert await only_alarms.next() == b"1"
+    assert await only_alarms.next(timeout=0.01) is None
+
+
+@pytest.mark.anyio
+async def test_slow_consumer_drops_oldest():
+    hub = EventHub(queue_size=2)
+    subscriber = hub.subscribe()
+    for index in range(5):
+        hub.publish({}, str(index).encode())
+    assert list(subscriber.queue) == [b"3", b"4"]
+    assert subscriber.dropped == 3
+    assert hub.stats()["dropped"] == 3
+
+
+@pytest.mark.anyio
+async def test_slow_consumer_disconnect_policy():
+    hub = EventHub(queue_size=1, policy="disconnect")
+    subscriber = hub.subscribe()
+    hub.publish({}, b"1")
+    hub.publish({}, b"2")
+    assert subscriber.closed
+    assert await subscriber.next() == b"1"
+    with pytest.raises(EOFError):
+        await subscriber.next()
+    assert hub.disconnected == 1
+
+
+@pytest.mark.anyio
+async def test_waiting_subscriber_wakes_on_publish():
+    hub = EventHub()
+    subscriber = hub.subscribe()
+    waiter = asyncio.create_task(subscriber.next(timeout=1))
+    await asyncio.sleep(0)
+    hub.publish({}, b"x")
+    assert await waiter == b"x"
+
+
+def test_subscriber_cap():
+    hub = EventHub(max_subscribers=1)
+    first = hub.subscribe()
+    assert hub.subscribe() is None
+    hub.unsubscribe(first)
+    assert hub.subscribe() is not None
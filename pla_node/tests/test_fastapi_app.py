@@ -1,17 +1,39 @@
-import time
+import asyncio
+import functools
+import json
+import logging
 from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
 
 import httpx
 import pytest
 
-from pla_node.app import fastapi_app
+from pla_node.app import codec, fastapi_app, host_info
+from pla_node.app.admission import AdmissionController
+from pla_node.app.fanout import EventHub
+from pla_node.app.forwarder import Forwarder
+from pla_node.app.journal import IngestJournal
+from pla_node.app.seq_tracker import SequenceTracker
+from pla_node.app.spool import SegmentedSpool
+from pla_node.app.upstreams import UpstreamPool
 
 
 @pytest.fixture(autouse=True)
-def reset_state(tmp_path):
-    # Clear spool directory and reset metrics for isolation across tests.
-    for path in fastapi_app.SPOOL_DIR.glob("*.ndjson"):
-        path.unlink(missing_ok=True)
+def reset_state(tmp_path, monkeypatch):
+    # Fresh spool, log file and metrics for isolation across tests.
+    log_handler = RotatingFileHandler(tmp_path / "pla_node.ndjson", delay=True)
+    log_handler.setFormatter(logging.Formatter("%(message)s"))
+    monkeypatch.setattr(fastapi_app, "LOG_PATH", tmp_path / "pla_node.ndjson")
+    monkeypatch.setattr(fastapi_app.logger, "handlers", [log_handler])
+    spool = SegmentedSpool(tmp_path / "spool")
+    monkeypatch.setattr(fastapi_app, "SPOOL_DIR", spool.directory)
+    monkeypatch.setattr(fastapi_app, "spool", spool)
+    monkeypatch.setattr(fastapi_app, "SPOOL_IDLE_SECONDS", 0.05)
+    monkeypatch.setattr(fastapi_app, "journal", IngestJournal(SegmentedSpool(tmp_path / "journal")))
+    monkeypatch.setattr(fastapi_app, "admission", AdmissionController(device_rate=0, device_burst=100, max_in_flight=256))
+    monkeypatch.setattr(fastapi_app, "event_hub", EventHub())
+    monkeypatch.setattr(fastapi_app, "seq_tracker", SequenceTracker(window=64, max_devices=100))
+    monkeypatch.setattr(fastapi_app, "upstreams", UpstreamPool(["http://receiver/events"], health_interval=0))
     fastapi_app.metrics.update(
         {
             "last_ingest_ts": None,
@@ -21,13 +43,22 @@ def reset_state(tmp_path):
             "forward_failure_count": 0,
         }
     )
+    yield
+    log_handler.close()
+
+
+@pytest.fixture()
+def anyio_backend():
+    # The forwarder is built on asyncio primitives.
+    return "asyncio"
 
 
 @pytest.fixture()
 async def client():
     transport = httpx.ASGITransport(app=fastapi_app.app)
-    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
-        yield client
+    async with fastapi_app.lifespan(fastapi_app.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            yield client
 
 
 @pytest.fixture()
@@ -53,46 +84,72 @@ async def test_ingest_rejects_invalid_json(client):
 async def test_ingest_accepts_and_forwards(client, valid_payload, monkeypatch):
     forwards = []
 
-    def fake_forward_event(payload, request_id, timeout=3.0):  # noqa: ARG001
-        forwards.append(payload["seq"])
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        forwards.extend(json.loads(line)["seq"] for line in encoded)
+        return {"ok": True, "results": [{"index": i, "ok": True} for i in range(len(encoded))]}
 
-    monkeypatch.setattr(fastapi_app, "_forward_event", fake_forward_event)
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
 
     resp = await client.post("/ingest", json=valid_payload)
     assert resp.status_code == 202
     assert resp.json()["ok"] is True
 
-    # Background task should forward once.
+    # Forwarder should flush the event once.
     for _ in range(10):
         if forwards:
             break
-        time.sleep(0.05)
+        await asyncio.sleep(0.05)
     assert forwards == [1]
 
 
 @pytest.mark.anyio
 async def test_ingest_spools_on_forward_failure(client, valid_payload, monkeypatch):
-    spooled = []
-
-    def fake_forward_event(payload, request_id, timeout=3.0):  # noqa: ARG001
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
         raise RuntimeError("fail")
 
-    def fake_write_spool(payload):
-        spooled.append(payload)
-
-    monkeypatch.setattr(fastapi_app, "_forward_event", fake_forward_event)
-    monkeypatch.setattr(fastapi_app, "_write_spool", fake_write_spool)
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
 
     resp = await client.post("/ingest", json=valid_payload)
     assert resp.status_code == 202
 
     for _ in range(10):
-        if spooled:
+        if fastapi_app.spool.depth:
             break
-        time.sleep(0.05)
+        await asyncio.sleep(0.05)
 
-    assert len(spooled) == 1
-    assert spooled[0]["seq"] == valid_payload["seq"]
+    assert fastapi_app.spool.depth == 1
+    [(line, _)] = fastapi_app.spool.read_batch(10)
+    assert json.loads(line)["seq"] == valid_payload["seq"]
+    status = (await client.get("/status")).json()
+    assert status["spool_queue_depth"] == 1
+    assert status["spool"]["bytes"] == len(line) + 1
+    assert status["spool"]["oldest_age_seconds"] is not None
+    metrics_text = (await client.get("/metrics")).text
+    assert "pla_node_spool_queue_depth 1" in metrics_text
+    assert f"pla_node_spool_bytes {len(line) + 1}" in metrics_text
+
+
+@pytest.mark.anyio
+async def test_spool_replays_and_drains(client, valid_payload, monkeypatch):
+    replayed = []
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        replayed.extend(json.loads(line)["seq"] for line in encoded)
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    fastapi_app.spool.append([json.dumps(dict(valid_payload, seq=seq)).encode() for seq in (5, 6)])
+
+    for _ in range(20):
+        if not fastapi_app.spool.depth:
+            break
+        await asyncio.sleep(0.05)
+
+    assert replayed == [5, 6]
+    assert fastapi_app.spool.depth == 0
+    drain = (await client.get("/status")).json()["drain"]
+    assert drain["drained_total"] == 2
+    assert drain["eta_seconds"] == 0
 
 
 @pytest.mark.anyio
@@ -105,3 +162,482 @@ async def test_ingest_schema_validation_failure(client, valid_payload):
     body = resp.json()
     assert body["error"] == "schema_validation_failed"
     assert "event_type" in body["details"]
+
+
+@pytest.mark.anyio
+async def test_ingest_batch_returns_per_item_results(client, valid_payload, monkeypatch):
+    forwarded = []
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        forwarded.extend(json.loads(line)["seq"] for line in encoded)
+        return {"ok": True, "results": [{"index": i, "ok": True} for i in range(len(encoded))]}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+
+    bad_payload = dict(valid_payload)
+    bad_payload.pop("device_id")
+    second = dict(valid_payload, seq=2)
+
+    resp = await client.post("/ingest/batch", json=[valid_payload, bad_payload, second])
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body["accepted"] == 2
+    assert body["rejected"] == 1
+    assert [r["ok"] for r in body["results"]] == [True, False, True]
+    assert body["results"][1]["error"] == "schema_validation_failed"
+    assert "device_id" in body["results"][1]["details"]
+
+    for _ in range(10):
+        if len(forwarded) == 2:
+            break
+        await asyncio.sleep(0.05)
+    assert forwarded == [1, 2]
+
+
+@pytest.mark.anyio
+async def test_ingest_batch_accepts_ndjson(client, valid_payload, monkeypatch):
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+
+    lines = [json.dumps(valid_payload), "{not-json", json.dumps(dict(valid_payload, seq=2))]
+    resp = await client.post(
+        "/ingest/batch",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson", "X-Request-ID": "batch-1"},
+    )
+    assert resp.status_code == 202
+    body = resp.json()
+    assert body["request_id"] == "batch-1"
+    assert body["results"][0] == {"index": 0, "ok": True, "request_id": "batch-1-0"}
+    assert body["results"][1] == {"index": 1, "ok": False, "error": "invalid_json"}
+    assert body["accepted"] == 2
+
+
+@pytest.mark.anyio
+async def test_ingest_batch_rejects_non_array(client, valid_payload):
+    resp = await client.post("/ingest/batch", json=valid_payload)
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "invalid_json"
+
+
+@pytest.mark.anyio
+async def test_ingest_signals_backpressure_when_forward_queue_full(client, valid_payload, monkeypatch):
+    monkeypatch.setattr(fastapi_app.forwarder, "try_submit", lambda items: False)
+
+    resp = await client.post("/ingest", json=valid_payload)
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert resp.json()["error"] == "forwarder_saturated"
+
+    resp = await client.post("/ingest/batch", json=[valid_payload])
+    assert resp.status_code == 503
+
+
+@pytest.mark.anyio
+async def test_status_reports_batching_config(client):
+    resp = await client.get("/status")
+    forwarder = resp.json()["forwarder"]
+    assert forwarder["batch_size"] == fastapi_app.FORWARD_BATCH_SIZE
+    assert forwarder["flush_interval_ms"] == fastapi_app.FORWARD_FLUSH_MS
+
+
+@pytest.mark.anyio
+async def test_metrics_expose_latency_and_outcome_series(client, valid_payload, monkeypatch):
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    accepted_before = fastapi_app.EVENTS_TOTAL.value(event_type="button_press", device_class="dev", outcome="accepted")
+    required_before = fastapi_app.VALIDATION_FAILURES.value(validator="required")
+
+    await client.post("/ingest", json=valid_payload)
+    bad_payload = dict(valid_payload)
+    bad_payload.pop("seq")
+    await client.post("/ingest", json=bad_payload)
+
+    assert (
+        fastapi_app.EVENTS_TOTAL.value(event_type="button_press", device_class="dev", outcome="accepted")
+        == accepted_before + 1
+    )
+    assert fastapi_app.VALIDATION_FAILURES.value(validator="required") == required_before + 1
+
+    text = (await client.get("/metrics")).text
+    assert 'pla_node_ingest_duration_seconds_count{endpoint="/ingest",status="202"}' in text
+    assert "pla_node_validation_duration_seconds_bucket" in text
+    assert "pla_node_forward_queue_capacity" in text
+    assert "pla_node_forward_success_total" in text
+
+
+@pytest.mark.anyio
+async def test_ingest_drops_duplicate_sequence_numbers(client, valid_payload, monkeypatch):
+    forwarded = []
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        forwarded.extend(json.loads(line)["seq"] for line in encoded)
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+
+    assert (await client.post("/ingest", json=valid_payload)).status_code == 202
+    resp = await client.post("/ingest", json=valid_payload)
+    assert resp.status_code == 200
+    assert resp.json()["duplicate"] is True
+
+    batch = [dict(valid_payload, seq=1), dict(valid_payload, seq=4), dict(valid_payload, seq=4)]
+    body = (await client.post("/ingest/batch", json=batch)).json()
+    assert body["accepted"] == 1
+    assert body["duplicates"] == 2
+    assert [r.get("duplicate", False) for r in body["results"]] == [True, False, True]
+
+    for _ in range(10):
+        if len(forwarded) == 2:
+            break
+        await asyncio.sleep(0.05)
+    assert forwarded == [1, 4]
+
+    device = (await client.get("/devices/dev-1")).json()
+    assert device["missing"] == 2
+    assert device["duplicates"] == 3
+    assert device["loss_rate"] == 0.5
+    assert (await client.get("/devices")).json()["items"][0]["device_id"] == "dev-1"
+    assert (await client.get("/devices/nope")).status_code == 404
+    assert 'pla_node_seq_anomalies_total{kind="duplicates"} 3' in (await client.get("/metrics")).text
+
+
+@pytest.mark.anyio
+async def test_shutdown_spools_events_still_queued_without_journal(valid_payload, monkeypatch, tmp_path):
+    async def receiver_down(encoded, request_id):  # noqa: ARG001
+        raise httpx.ConnectError("receiver down")
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", receiver_down)
+    monkeypatch.setattr(fastapi_app, "JOURNAL_ENABLED", False)
+    # Nothing is flushed before shutdown: the whole batch is still queued when it starts.
+    monkeypatch.setattr(fastapi_app, "forwarder", Forwarder("http://receiver/events", flush_interval=10.0))
+    transport = httpx.ASGITransport(app=fastapi_app.app)
+    async with fastapi_app.lifespan(fastapi_app.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            batch = [dict(valid_payload, seq=seq) for seq in range(1, 6)]
+            assert (await client.post("/ingest/batch", json=batch)).json()["accepted"] == 5
+            assert fastapi_app.forwarder.queued + len(fastapi_app.forwarder._held) == 5
+    spooled = SegmentedSpool(tmp_path / "spool").read_batch(10)
+    assert [json.loads(line)["seq"] for line, _ in spooled] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.anyio
+async def test_rebooted_device_is_not_dropped_as_duplicate(client, valid_payload, monkeypatch):
+    forwarded = []
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        forwarded.extend(json.loads(line)["seq"] for line in encoded)
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    before = [dict(valid_payload, seq=seq, ts=f"2026-01-01T00:00:{seq:02d}Z") for seq in range(1, 11)]
+    after = [dict(valid_payload, seq=seq, ts=f"2026-01-01T00:05:{seq:02d}Z") for seq in range(1, 11)]
+    assert (await client.post("/ingest/batch", json=before)).json()["accepted"] == 10
+    body = (await client.post("/ingest/batch", json=after)).json()
+    assert (body["accepted"], body["duplicates"]) == (10, 0)
+    for _ in range(10):
+        if len(forwarded) == 20:
+            break
+        await asyncio.sleep(0.05)
+    assert forwarded == list(range(1, 11)) * 2
+    assert (await client.get("/devices/dev-1")).json()["resets"] == 1
+
+
+@pytest.mark.anyio
+async def test_backpressure_does_not_mark_sequence_seen(client, valid_payload, monkeypatch):
+    monkeypatch.setattr(fastapi_app.forwarder, "try_submit", lambda items: False)
+    assert (await client.post("/ingest", json=valid_payload)).status_code == 503
+    assert fastapi_app.seq_tracker.device("dev-1") is None
+
+
+@pytest.mark.anyio
+async def test_ingest_rate_limits_noisy_device(client, valid_payload, monkeypatch):
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    resp = await client.put("/limits", json={"device_rate": 0.5, "device_burst": 2})
+    assert resp.json()["device_burst"] == 2
+
+    statuses = [(await client.post("/ingest", json=dict(valid_payload, seq=seq))).status_code for seq in range(3)]
+    assert statuses == [202, 202, 429]
+    resp = await client.post("/ingest", json=dict(valid_payload, seq=9))
+    assert resp.json()["scope"] == "device"
+    assert resp.headers["Retry-After"] == "2"
+    assert (await client.post("/ingest", json=dict(valid_payload, device_id="dev-2"))).status_code == 202
+
+    body = (await client.post("/ingest/batch", json=[dict(valid_payload, seq=10)])).json()
+    assert body["results"][0]["error"] == "rate_limited"
+
+    text = (await client.get("/metrics")).text
+    assert 'pla_node_admission_rejected_total{reason="device_rate"} 3' in text
+    assert (await client.get("/limits")).json()["rejected"]["device_rate"] == 3
+
+
+@pytest.mark.anyio
+async def test_large_single_device_batch_is_not_rate_limited_by_default(client, valid_payload, monkeypatch):
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    defaults = AdmissionController(device_rate=fastapi_app.DEVICE_RATE, device_burst=fastapi_app.DEVICE_BURST)
+    monkeypatch.setattr(fastapi_app, "admission", defaults)
+    body = (await client.post("/ingest/batch", json=[dict(valid_payload, seq=seq) for seq in range(1, 501)])).json()
+    assert (body["accepted"], body["rejected"]) == (500, 0)
+
+
+@pytest.mark.anyio
+async def test_ingest_rate_limits_per_api_key_and_caps_in_flight(client, valid_payload):
+    await client.put("/limits", json={"key_rate": 1, "key_burst": 1, "device_rate": 0})
+    assert (await client.post("/ingest/batch", json=[valid_payload, valid_payload])).status_code == 202
+    resp = await client.post("/ingest", json=valid_payload)
+    assert resp.status_code == 429
+    assert resp.json()["scope"] == "api_key"
+
+    await client.put("/limits", json={"key_rate": 0, "max_in_flight": 1})
+    fastapi_app.admission.in_flight = 1
+    resp = await client.post("/ingest", json=valid_payload)
+    fastapi_app.admission.in_flight = 0
+    assert resp.status_code == 503
+    assert resp.json()["error"] == "overloaded"
+
+
+@pytest.mark.anyio
+async def test_put_limits_rejects_bad_values(client):
+    resp = await client.put("/limits", json={"device_rate": -1})
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "invalid_limits"
+
+
+@pytest.mark.anyio
+async def test_introspection_served_from_cache(client, monkeypatch):
+    # Without sysfs (non-Linux hosts) the endpoint falls back to the cached lsusb probe.
+    monkeypatch.setattr(fastapi_app.host_info, "usb_devices", lambda: {"ok": False, "error": "usb_sysfs_unavailable"})
+    first = (await client.get("/usb-list")).json()
+    second = (await client.get("/usb-list")).json()
+    assert "age_seconds" in first
+    assert second["age_seconds"] >= first["age_seconds"]
+    assert (await client.get("/status")).json()["probes"]["usb"]["refreshes"] >= 1
+
+
+@pytest.mark.anyio
+async def test_introspection_read_from_sysfs_when_available(client, tmp_path, monkeypatch):
+    device = tmp_path / "sys" / "bus" / "usb" / "devices" / "1-1"
+    device.mkdir(parents=True)
+    for name, value in (("busnum", "1"), ("devnum", "3"), ("idVendor", "10c4"), ("idProduct", "ea60")):
+        (device / name).write_text(f"{value}\n")
+    monkeypatch.setattr(fastapi_app.host_info, "usb_devices", functools.partial(host_info.usb_devices, tmp_path))
+    body = (await client.get("/usb-list")).json()
+    assert body["devices"] == ["Bus 001 Device 003: ID 10c4:ea60"]
+    assert body["details"][0]["vendor_id"] == "10c4"
+    assert "age_seconds" not in body
+
+
+@pytest.mark.anyio
+async def test_events_stream_delivers_filtered_events(client, valid_payload, monkeypatch):
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+
+    async def publish():
+        while not len(fastapi_app.event_hub):
+            await asyncio.sleep(0.01)
+        await client.post("/ingest", json=dict(valid_payload, device_id="dev-9"))
+        await client.post("/ingest/batch", json=[valid_payload, dict(valid_payload, seq=2)])
+
+    resp, _ = await asyncio.gather(client.get("/events/stream?device_id=dev-1&limit=2"), publish())
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert [(event["device_id"], event["seq"]) for event in events] == [("dev-1", 1), ("dev-1", 2)]
+    assert len(fastapi_app.event_hub) == 0
+
+
+@pytest.mark.anyio
+async def test_passthrough_mode_forwards_original_bytes(client, valid_payload, monkeypatch):
+    sent = []
+
+    async def fake_post_batch(body, request_id, headers=None, url=None):  # noqa: ARG001
+        sent.append((body, headers))
+        return httpx.Response(200, json={"ok": True, "request_id": request_id, "results": []})
+
+    monkeypatch.setattr(fastapi_app, "FORWARD_MODE", "passthrough")
+    monkeypatch.setattr(fastapi_app.forwarder, "post_batch", fake_post_batch)
+
+    raw = json.dumps(valid_payload, separators=(", ", ": ")).encode()
+    assert (await client.post("/ingest", content=raw, headers={"Content-Type": "application/json"})).status_code == 202
+    pretty = json.dumps(dict(valid_payload, seq=2), indent=2).encode()
+    assert (await client.post("/ingest", content=pretty, headers={"Content-Type": "application/json"})).status_code == 202
+
+    for _ in range(20):
+        if sum(body.count(b"\n") for body, _ in sent) == 2:
+            break
+        await asyncio.sleep(0.05)
+    body = b"".join(body for body, _ in sent)
+    assert body.splitlines() == [raw, codec.dumps(dict(valid_payload, seq=2))]
+    for chunk, headers in sent:
+        assert headers["Content-Type"] == "application/x-ndjson"
+        assert headers[codec.CONTENT_HASH_HEADER] == codec.content_hash(chunk)
+
+
+@pytest.mark.anyio
+async def test_journal_released_after_ack_or_spool(client, valid_payload, monkeypatch):
+    outcomes = ["ack", "fail"]
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        if outcomes.pop(0) == "fail":
+            raise RuntimeError("receiver down")
+        return {"ok": True, "results": []}
+
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+
+    assert (await client.post("/ingest", json=valid_payload)).status_code == 202
+    assert fastapi_app.journal.spool.depth == 1
+    for _ in range(20):
+        if not fastapi_app.journal.spool.depth:
+            break
+        await asyncio.sleep(0.02)
+    assert fastapi_app.journal.spool.depth == 0
+
+    monkeypatch.setattr(fastapi_app, "SPOOL_IDLE_SECONDS", 60)
+    assert (await client.post("/ingest", json=dict(valid_payload, seq=2))).status_code == 202
+    for _ in range(20):
+        if fastapi_app.spool.depth:
+            break
+        await asyncio.sleep(0.02)
+    assert fastapi_app.spool.depth == 1
+    assert fastapi_app.journal.spool.depth == 0
+    journal = (await client.get("/status")).json()["journal"]
+    assert journal["enabled"] is True
+    assert journal["commits"] == 2
+
+
+@pytest.mark.anyio
+async def test_forward_requires_receiver_ack(monkeypatch):
+    class FakeForwarder:
+        async def post_batch(self, body, request_id, headers=None, url=None):  # noqa: ARG002
+            return httpx.Response(200, json={"ok": True, "request_id": "someone-else"})
+
+    monkeypatch.setattr(fastapi_app, "forwarder", FakeForwarder())
+    with pytest.raises(RuntimeError, match="not acknowledged"):
+        await fastapi_app._forward_batch([b"{}"], "batch-1")
+
+
+@pytest.mark.anyio
+async def test_unacknowledged_journal_records_recovered_on_start(valid_payload):
+    fastapi_app.journal.spool.append([json.dumps(valid_payload).encode()])
+    async with fastapi_app.lifespan(fastapi_app.app):
+        assert fastapi_app.journal.spool.depth == 0
+        [(line, _)] = fastapi_app.spool.read_batch(10)
+        assert json.loads(line) == valid_payload
+
+
+def test_worker_status_merges_counters_and_takes_backlog_from_drain_owner():
+    status = {
+        "forward_success_count": 3,
+        "forward_failure_count": 1,
+        "last_ingest_ts": "2026-01-01T00:00:01+00:00",
+        "last_forward_success_ts": None,
+        "last_forward_failure_ts": None,
+        "spool": {"depth": 0},
+        "spool_queue_depth": 0,
+        "drain": None,
+        "retry_active": False,
+    }
+    owner_spool = {"depth": 7, "bytes": 700, "oldest_age_seconds": 2.0, "drain_rate_eps": 0.0}
+    peers = [
+        {
+            "worker": "w1",
+            "drain_owner": True,
+            "status": {
+                "forward_success_count": 4,
+                "forward_failure_count": 2,
+                "last_ingest_ts": "2026-01-01T00:00:05+00:00",
+                "last_forward_success_ts": "2026-01-01T00:00:04+00:00",
+                "spool": owner_spool,
+                "drain": {"drained_total": 9},
+            },
+        }
+    ]
+    fastapi_app._merge_worker_status(status, peers)
+
+    assert status["forward_success_count"] == 7
+    assert status["forward_failure_count"] == 3
+    assert status["last_ingest_ts"] == "2026-01-01T00:00:05+00:00"
+    assert status["last_forward_success_ts"] == "2026-01-01T00:00:04+00:00"
+    assert status["spool"] == owner_spool
+    assert status["spool_queue_depth"] == 7
+    assert status["drain"] == {"drained_total": 9}
+    assert status["workers"]["count"] == 2
+    assert status["workers"]["drain_owner"] == "w1"
+
+
+@pytest.mark.anyio
+async def test_rejections_with_a_bad_index_are_logged_without_an_event_id(client, valid_payload, monkeypatch):
+    results = [
+        {"index": 1, "ok": False, "details": "in range"},
+        {"index": 7, "ok": False, "details": "out of range"},
+        {"index": "0", "ok": False, "details": "not an int"},
+        {"ok": False, "details": "missing"},
+    ]
+
+    async def fake_forward_batch(encoded, request_id):  # noqa: ARG001
+        return {"ok": True, "request_id": request_id, "results": results}
+
+    logged = []
+    monkeypatch.setattr(fastapi_app, "_forward_batch", fake_forward_batch)
+    monkeypatch.setattr(fastapi_app, "log_json", lambda msg, **fields: logged.append((msg, fields)))
+    batch = [
+        fastapi_app.QueuedEvent(dict(valid_payload, seq=seq), f"r-{seq}", codec.dumps(dict(valid_payload, seq=seq)))
+        for seq in (1, 2)
+    ]
+    await fastapi_app._forward_batch_or_spool(batch)
+    rejected = [(fields["event_id"], fields["details"]) for msg, fields in logged if msg == "forward_rejected"]
+    assert rejected == [("dev-1:2", "in range"), (None, "out of range"), (None, "not an int"), (None, "missing")]
+
+
+@pytest.mark.anyio
+async def test_retry_without_another_receiver_is_not_a_short_circuit(monkeypatch):
+    pool = UpstreamPool(["http://a/events"], failure_threshold=5, health_interval=0)
+    monkeypatch.setattr(fastapi_app, "upstreams", pool)
+    monkeypatch.setattr(fastapi_app, "RECEIVER_ATTEMPTS", 2)
+
+    class FakeForwarder:
+        async def post_batch(self, body, request_id, headers=None, url=None):  # noqa: ARG002
+            raise httpx.ConnectError("refused")
+
+    monkeypatch.setattr(fastapi_app, "forwarder", FakeForwarder())
+    with pytest.raises(httpx.ConnectError):
+        await fastapi_app._forward_batch([b"{}"], "batch-1")
+    assert pool.short_circuits == 0
+
+
+@pytest.mark.anyio
+async def test_forward_fails_over_and_short_circuits_when_all_receivers_are_down(monkeypatch):
+    pool = UpstreamPool(["http://a/events", "http://b/events"], failure_threshold=1, health_interval=0)
+    monkeypatch.setattr(fastapi_app, "upstreams", pool)
+    calls = []
+
+    class FakeForwarder:
+        async def post_batch(self, body, request_id, headers=None, url=None):  # noqa: ARG002
+            calls.append(url)
+            if url == "http://a/events":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={"ok": True, "request_id": request_id, "results": []})
+
+    monkeypatch.setattr(fastapi_app, "forwarder", FakeForwarder())
+    assert (await fastapi_app._forward_batch([b"{}"], "batch-1"))["request_id"] == "batch-1"
+    assert calls == ["http://a/events", "http://b/events"]
+
+    # a's breaker is open, so b takes the next batch directly.
+    await fastapi_app._forward_batch([b"{}"], "batch-2")
+    assert calls[2:] == ["http://b/events"]
+
+    pool.upstreams[1].healthy = False
+    with pytest.raises(RuntimeError, match="no Brain Receiver available"):
+        await fastapi_app._forward_batch([b"{}"], "batch-3")
+    assert len(calls) == 3
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from pla_node.app.forwarder import Forwarder
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+def _items(count):
+    return [({"seq": seq}, f"rid-{seq}") for seq in range(count)]
+
+
+async def _run(forwarder, items, wait=0.1):
+    batches = []
+
+    async def handler(batch):
+        batches.append([payload["seq"] for payload, _ in batch])
+
+    await forwarder.start(handler)
+    try:
+        assert forwarder.try_submit(items)
+        await asyncio.sleep(wait)
+    finally:
+        await forwarder.stop()
+    return batches
+
+
+@pytest.mark.anyio
+async def test_flushes_when_batch_size_reached():
+    forwarder = Forwarder("http://x/events", batch_size=3, flush_interval=10.0)
+    batches = await _run(forwarder, _items(7))
+    # The last, partial batch is flushed by stop().
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+@pytest.mark.anyio
+async def test_flushes_partial_batch_after_interval():
+    forwarder = Forwarder("http://x/events", batch_size=100, flush_interval=0.01)
+    batches = await _run(forwarder, _items(2))
+    assert batches == [[0, 1]]
+
+
+@pytest.mark.anyio
+async def test_try_submit_is_all_or_nothing():
+    forwarder = Forwarder("http://x/events", queue_size=2, batch_size=100, flush_interval=10.0, drain_timeout=0.01)
+
+    async def handler(batch):  # noqa: ARG001
+        await asyncio.sleep(10)
+
+    await forwarder.start(handler)
+    try:
+        assert not forwarder.try_submit(_items(3))
+        assert forwarder.queued == 0
+        assert forwarder.try_submit(_items(2))
+        assert forwarder.saturated
+    finally:
+        await forwarder.stop()
+
+
+@pytest.mark.anyio
+async def test_stop_flushes_queued_events_through_the_handler():
+    forwarder = Forwarder("http://x/events", concurrency=1, batch_size=3, flush_interval=10.0)
+    handled = []
+
+    async def handler(batch):
+        await asyncio.sleep(0.01)
+        handled.extend(payload["seq"] for payload, _ in batch)
+
+    await forwarder.start(handler)
+    assert forwarder.try_submit(_items(10))
+    await asyncio.sleep(0)  # the batcher holds a partial batch when stop() comes
+    await forwarder.stop()
+    assert sorted(handled) == list(range(10))
+    assert not forwarder.try_submit(_items(1))
+
+
+@pytest.mark.anyio
+async def test_stop_cancels_batches_still_running_after_the_deadline():
+    forwarder = Forwarder("http://x/events", batch_size=2, flush_interval=0.0, drain_timeout=0.05)
+
+    async def handler(batch):  # noqa: ARG001
+        await asyncio.sleep(10)
+
+    await forwarder.start(handler)
+    assert forwarder.try_submit(_items(4))
+    await asyncio.sleep(0.01)
+    await asyncio.wait_for(forwarder.stop(), 1.0)
+    assert forwarder.abandoned == 4
+    assert forwarder.in_flight == 0
@@ -0,0 +1,116 @@
+import socket
+import struct
+
+from pla_node.app import host_info
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_usb_devices_from_sysfs(tmp_path):
+    base = tmp_path / "sys" / "bus" / "usb" / "devices"
+    for name, bus, dev, vid, pid, product in (
+        ("usb1", "1", "1", "1d6b", "0002", "xHCI Host Controller"),
+        ("1-1", "1", "3", "10c4", "ea60", None),
+    ):
+        _write(base / name / "busnum", f"{bus}\n")
+        _write(base / name / "devnum", f"{dev}\n")
+        _write(base / name / "idVendor", f"{vid}\n")
+        _write(base / name / "idProduct", f"{pid}\n")
+        if product:
+            _write(base / name / "manufacturer", "Linux 6.1 xhci-hcd\n")
+            _write(base / name / "product", f"{product}\n")
+    _write(base / "1-1:1.0" / "bInterfaceClass", "ff\n")
+
+    result = host_info.usb_devices(tmp_path)
+    assert result["ok"] is True
+    assert result["devices"] == [
+        "Bus 001 Device 001: ID 1d6b:0002 Linux 6.1 xhci-hcd xHCI Host Controller",
+        "Bus 001 Device 003: ID 10c4:ea60",
+    ]
+    assert host_info.usb_devices(tmp_path / "missing")["ok"] is False
+
+
+def test_ip_addresses_with_counters(tmp_path, monkeypatch):
+    monkeypatch.setattr(host_info, "_ipv4_addresses", dict)
+    net = tmp_path / "sys" / "class" / "net"
+    for index, (name, state) in enumerate((("lo", "unknown"), ("pla-test0", "up")), start=1):
+        _write(net / name / "ifindex", f"{index}\n")
+        _write(net / name / "operstate", f"{state}\n")
+        _write(net / name / "address", "aa:bb:cc:dd:ee:ff\n")
+        _write(net / name / "mtu", "1500\n")
+    _write(
+        tmp_path / "proc" / "net" / "dev",
+        "Inter-|   Receive\n face |bytes\n"
+        "pla-test0: 1000 10 1 2 0 0 0 0 2000 20 3 4 0 0 0 0\n",
+    )
+    _write(
+        tmp_path / "proc" / "net" / "if_inet6",
+        "fe800000000000000000000000000001 02 40 20 80 pla-test0\n",
+    )
+
+    result = host_info.ip_addresses(tmp_path)
+    assert [iface["interface"] for iface in result["interfaces"]] == ["lo", "pla-test0"]
+    iface = result["interfaces"][1]
+    assert iface["state"] == "UP"
+    assert iface["addresses"] == ["fe80::1/64"]
+    assert iface["rx_bytes"] == 1000
+    assert iface["tx_bytes"] == 2000
+    assert iface["mtu"] == 1500
+
+
+def test_ip_addresses_lists_every_ipv4_address(tmp_path, monkeypatch):
+    net = tmp_path / "sys" / "class" / "net" / "pla-test0"
+    _write(net / "ifindex", "2\n")
+    _write(net / "operstate", "up\n")
+    _write(tmp_path / "proc" / "net" / "if_inet6", "fe800000000000000000000000000001 02 40 20 80 pla-test0\n")
+    monkeypatch.setattr(host_info, "_ipv4_addresses", lambda: {"pla-test0": ["10.0.0.2/24", "10.0.0.3/24"]})
+    [iface] = host_info.ip_addresses(tmp_path)["interfaces"]
+    assert iface["addresses"] == ["10.0.0.2/24", "10.0.0.3/24", "fe80::1/64"]
+
+    monkeypatch.setattr(host_info, "_ipv4_addresses", lambda: None)
+    assert host_info.ip_addresses(tmp_path) == {"ok": False, "error": "netlink_unavailable"}
+
+
+def test_netlink_address_messages_keep_secondary_addresses():
+    index = socket.if_nametoindex("lo")
+
+    def message(address, label):
+        attrs = b""
+        for kind, value in ((2, socket.inet_aton(address)), (3, label + b"\0")):
+            attrs += struct.pack("=HH", 4 + len(value), kind) + value + b"\0" * (-len(value) % 4)
+        return struct.pack("=BBBBL", socket.AF_INET, 8, 0, 0, index) + attrs
+
+    addresses = {}
+    host_info._add_ipv4(addresses, message("127.0.0.1", b"lo"))
+    host_info._add_ipv4(addresses, message("127.0.0.2", b"lo:alias"))
+    assert addresses == {"lo": ["127.0.0.1/8", "127.0.0.2/8"]}
+
+
+def test_cpu_usage_between_samples(tmp_path):
+    stat = tmp_path / "proc" / "stat"
+    _write(stat, "cpu  100 0 100 800 0 0 0 0 0 0\n")
+    _write(tmp_path / "proc" / "loadavg", "0.50 0.25 0.10 1/100 4242\n")
+    sampler = host_info.CpuSampler(tmp_path)
+
+    assert host_info.cpu_info(sampler, tmp_path)["usage_percent"] is None
+    _write(stat, "cpu  150 0 150 900 0 0 0 0 0 0\n")
+    info = host_info.cpu_info(sampler, tmp_path)
+    assert info["usage_percent"] == 50.0
+    assert info["load_average"] == [0.5, 0.25, 0.1]
+
+
+def test_memory_and_uptime(tmp_path):
+    _write(
+        tmp_path / "proc" / "meminfo",
+        "MemTotal:        1000 kB\nMemFree:          200 kB\nMemAvailable:     600 kB\n",
+    )
+    _write(tmp_path / "proc" / "uptime", "1234.56 999.00\n")
+
+    memory = host_info.memory_info(tmp_path)
+    assert memory["total_bytes"] == 1024000
+    assert memory["used_bytes"] == 400 * 1024
+    assert host_info.uptime_seconds(tmp_path) == 1234
+    assert host_info.memory_info(tmp_path / "missing")["ok"] is False
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from pla_node.app.journal import IngestJournal
+from pla_node.app.spool import SegmentedSpool
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    return IngestJournal(SegmentedSpool(tmp_path / "journal"))
+
+
+@pytest.mark.anyio
+async def test_concurrent_appends_share_group_commits(journal):
+    journal.start()
+    try:
+        results = await asyncio.gather(*(journal.append([f"{i}".encode()]) for i in range(50)))
+    finally:
+        await journal.stop()
+    assert len({position for [position] in results}) == 50
+    assert journal.commits < 50
+    assert journal.committed_records == 50
+    assert journal.spool.depth == 50
+
+
+@pytest.mark.anyio
+async def test_cursor_advances_over_acked_prefix_only(journal):
+    journal.start()
+    try:
+        positions = await journal.append([b"1", b"2", b"3"])
+        await journal.ack([positions[1]])
+        assert journal.spool.depth == 3
+        await journal.ack([positions[0]])
+        assert journal.spool.depth == 1
+        assert journal.unacked == 1
+        assert [line for line, _ in journal.spool.read_batch(10)] == [b"3"]
+    finally:
+        await journal.stop()
+
+
+@pytest.mark.anyio
+async def test_abandoned_append_is_released(journal):
+    journal.start()
+    try:
+        task = asyncio.create_task(journal.append([b"gone"]))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await journal.append([b"kept"])
+        assert [line for line, _ in journal.spool.read_batch(10)] == [b"kept"]
+    finally:
+        await journal.stop()
+
+
+def test_recover_moves_records_into_retry_spool(journal, tmp_path):
+    journal.spool.append([b"a", b"b"])
+    retry = SegmentedSpool(tmp_path / "spool")
+    assert journal.recover(retry, batch=1) == 2
+    assert journal.spool.depth == 0
+    assert [line for line, _ in retry.read_batch(10)] == [b"a", b"b"]
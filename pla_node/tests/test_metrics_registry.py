@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from pla_node.app.metrics_registry import OVERFLOW_LABEL, Registry, merge_collections, render_collection
+
+
+def test_counter_and_gauge_render_with_labels():
+    registry = Registry()
+    counter = registry.counter("demo_total", "Demo counter.", ["kind"])
+    gauge = registry.gauge("demo_depth", "Demo gauge.")
+    counter.inc(kind="a")
+    counter.inc(2, kind='b"q')
+    gauge.set(7)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{kind="a"} 1' in text
+    assert 'demo_total{kind="b\\"q"} 2' in text
+    assert "demo_depth 7" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        hist.observe(value)
+
+    lines = registry.render().splitlines()
+    assert 'demo_seconds_bucket{le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{le="1"} 2' in lines
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in lines
+    assert "demo_seconds_count 3" in lines
+    assert "demo_seconds_sum 5.55" in lines
+
+
+def test_series_cap_collapses_into_overflow():
+    registry = Registry()
+    counter = registry.counter("demo_total", "Demo counter.", ["device"])
+    counter.max_series = 2
+    for device in ("a", "b", "c", "d"):
+        counter.inc(device=device)
+    assert counter.value(device=OVERFLOW_LABEL) == 2
+
+
+def test_rejects_wrong_labels_and_duplicates():
+    registry = Registry()
+    counter = registry.counter("demo_total", "Demo counter.", ["kind"])
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+    with pytest.raises(ValueError):
+        registry.gauge("demo_total", "Again.")
+
+
+def test_callback_series_skip_none():
+    registry = Registry()
+    registry.callback("demo_value", "Demo callback.", lambda: None)
+    registry.callback("demo_ready", "Demo callback.", lambda: 1)
+    lines = registry.render().splitlines()
+    assert not [line for line in lines if line.startswith("demo_value ")]
+    assert "demo_ready 1" in lines
+
+
+def test_labelled_callback_series():
+    registry = Registry()
+    registry.callback("demo_dropped_total", "Demo.", lambda: {("debug",): 3, ("info",): 0},
+                      kind="counter", labelnames=["level"])
+    lines = registry.render().splitlines()
+    assert 'demo_dropped_total{level="debug"} 3' in lines
+    assert 'demo_dropped_total{level="info"} 0' in lines
+
+
+def _demo_registry(requests, latency, uptime):
+    registry = Registry()
+    counter = registry.counter("demo_requests_total", "Requests.", ["route"])
+    counter.inc(requests, route="/a")
+    histogram = registry.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(latency)
+    registry.callback("demo_uptime_seconds", "Uptime.", lambda: uptime, merge="max")
+    return registry
+
+
+def test_collection_renders_like_the_registry():
+    registry = _demo_registry(2, 0.05, 10)
+    assert render_collection(json.loads(json.dumps(registry.collect()))) == registry.render()
+
+
+def test_merge_sums_counters_and_histograms_and_maxes_marked_series():
+    merged = merge_collections([_demo_registry(2, 0.05, 10).collect(), _demo_registry(3, 0.5, 4).collect()])
+    lines = render_collection(merged).splitlines()
+    assert 'demo_requests_total{route="/a"} 5' in lines
+    assert 'demo_seconds_bucket{le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{le="1"} 2' in lines
+    assert "demo_seconds_count 2" in lines
+    assert "demo_uptime_seconds 10" in lines
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pla_node.app.probe_cache import ProbeCache
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+class SlowProbe:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return {"ok": True, "calls": calls}
+
+
+@pytest.mark.anyio
+async def test_concurrent_readers_share_one_refresh():
+    probe = SlowProbe()
+    cache = ProbeCache()
+    cache.register("usb", probe, ttl=60)
+
+    results = await asyncio.gather(*(cache.get("usb") for _ in range(10)))
+    assert probe.calls == 1
+    assert all(result["calls"] == 1 for result in results)
+    assert results[0]["age_seconds"] < 1
+
+
+@pytest.mark.anyio
+async def test_expired_snapshot_is_served_while_refreshing():
+    probe = SlowProbe(delay=0)
+    cache = ProbeCache()
+    cache.register("ip", probe, ttl=0.01)
+
+    assert (await cache.get("ip"))["calls"] == 1
+    await asyncio.sleep(0.02)
+    stale = await cache.get("ip")
+    assert stale["calls"] == 1
+    assert stale["age_seconds"] >= 0.01
+    await asyncio.sleep(0.02)
+    assert probe.calls == 2
+
+
+@pytest.mark.anyio
+async def test_collector_refreshes_only_recently_read_probes():
+    read, unread = SlowProbe(delay=0), SlowProbe(delay=0)
+    cache = ProbeCache(tick=0.01)
+    cache.register("read", read, ttl=0.02)
+    cache.register("unread", unread, ttl=0.02)
+    await cache.get("read")
+    cache.start()
+    await asyncio.sleep(0.15)
+    await cache.stop()
+
+    assert read.calls >= 3
+    assert unread.calls == 0
+    assert cache.stats()["read"]["active"] is True
+
+
+@pytest.mark.anyio
+async def test_probe_exception_becomes_error_snapshot():
+    def broken():
+        raise OSError("boom")
+
+    cache = ProbeCache()
+    cache.register("docker", broken, ttl=60)
+    result = await cache.get("docker")
+    assert result["ok"] is False
+    assert result["error"] == "probe_failed"
@@ -0,0 +1,93 @@
+from pla_node.app.seq_tracker import DUPLICATE, GAP, NEW, OUT_OF_ORDER, RESET, SequenceTracker
+
+
+def test_in_order_sequence_has_no_loss():
+    tracker = SequenceTracker(window=16)
+    assert [tracker.observe("dev", seq) for seq in range(5)] == [NEW] * 5
+    state = tracker.device("dev")
+    assert state["received"] == 5
+    assert state["missing"] == 0
+    assert state["loss_rate"] == 0.0
+
+
+def test_gap_then_late_arrival_fills_it():
+    tracker = SequenceTracker(window=16)
+    tracker.observe("dev", 1)
+    assert tracker.observe("dev", 4) == GAP
+    assert tracker.device("dev")["missing"] == 2
+    assert tracker.observe("dev", 2) == OUT_OF_ORDER
+    assert tracker.is_duplicate("dev", 2)
+    assert not tracker.is_duplicate("dev", 3)
+    assert tracker.observe("dev", 2) == DUPLICATE
+    state = tracker.device("dev")
+    assert state["missing"] == 1
+    assert state["duplicates"] == 1
+    assert state["loss_rate"] == 0.25
+
+
+def test_arrival_before_first_seen_extends_range():
+    tracker = SequenceTracker(window=16)
+    tracker.observe("dev", 5)
+    assert tracker.observe("dev", 3) == OUT_OF_ORDER
+    assert tracker.device("dev")["missing"] == 1
+
+
+def test_seq_far_behind_window_is_a_restart():
+    tracker = SequenceTracker(window=8)
+    tracker.observe("dev", 100)
+    assert tracker.observe("dev", 0) == RESET
+    state = tracker.device("dev")
+    assert state["last_seq"] == 0
+    assert state["resets"] == 1
+    assert tracker.observe("dev", 1) == NEW
+
+
+def test_large_jump_clears_window():
+    tracker = SequenceTracker(window=8)
+    tracker.observe("dev", 1)
+    assert tracker.observe("dev", 50) == GAP
+    assert not tracker.is_duplicate("dev", 1)
+    assert tracker.totals["missing"] == 48
+
+
+def test_table_is_bounded_lru():
+    tracker = SequenceTracker(window=8, max_devices=2)
+    tracker.observe("a", 1)
+    tracker.observe("b", 1)
+    tracker.observe("a", 2)
+    tracker.observe("c", 1)
+    assert len(tracker) == 2
+    assert tracker.device("b") is None
+    assert tracker.totals["evicted"] == 1
+
+
+def test_devices_ranked_by_loss():
+    tracker = SequenceTracker(window=16)
+    tracker.observe("good", 1)
+    tracker.observe("good", 2)
+    tracker.observe("bad", 1)
+    tracker.observe("bad", 5)
+    assert [d["device_id"] for d in tracker.devices()] == ["bad", "good"]
+    assert [d["device_id"] for d in tracker.devices(min_loss=0.1)] == ["bad"]
+
+
+def test_reboot_counting_from_one_again_is_a_restart():
+    tracker = SequenceTracker(window=1024)
+    for seq in range(1, 301):
+        tracker.observe("dev", seq, f"2026-01-01T00:00:{seq % 60:02d}Z")
+    # A retry of an old event keeps its original ts and is still a duplicate.
+    assert tracker.is_duplicate("dev", 120, "2026-01-01T00:00:00Z")
+    rebooted = [f"2026-01-01T00:10:{seq % 60:02d}Z" for seq in range(1, 301)]
+    assert not tracker.is_duplicate("dev", 1, rebooted[0])
+    assert tracker.observe("dev", 1, rebooted[0]) == RESET
+    assert all(not tracker.is_duplicate("dev", seq, rebooted[seq - 1]) for seq in range(2, 301))
+    assert [tracker.observe("dev", seq, rebooted[seq - 1]) for seq in range(2, 301)] == [NEW] * 299
+    assert tracker.device("dev")["resets"] == 1
+
+
+def test_backward_jump_over_half_the_window_is_a_restart():
+    tracker = SequenceTracker(window=16)
+    tracker.observe("dev", 20)
+    assert tracker.is_duplicate("dev", 20)
+    assert tracker.observe("dev", 11) == RESET
+    assert tracker.observe("dev", 12) == NEW
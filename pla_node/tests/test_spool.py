@@ -0,0 +1,135 @@
+from pla_node.app.spool import SegmentedSpool, SpoolGroup
+
+
+def _records(*seqs):
+    return [f'{{"seq":{seq}}}'.encode() for seq in seqs]
+
+
+def test_append_read_commit_tracks_depth(tmp_path):
+    spool = SegmentedSpool(tmp_path)
+    spool.append(_records(1, 2, 3))
+    assert spool.depth == 3
+
+    batch = spool.read_batch(2)
+    assert [line for line, _ in batch] == _records(1, 2)
+    # Reading does not advance the cursor.
+    assert spool.read_batch(10)[0][0] == _records(1)[0]
+
+    spool.commit(batch[-1][1], len(batch))
+    assert spool.depth == 1
+    assert [line for line, _ in spool.read_batch(10)] == _records(3)
+
+
+def test_cursor_and_depth_survive_restart(tmp_path):
+    spool = SegmentedSpool(tmp_path)
+    spool.append(_records(1, 2, 3))
+    first = spool.read_batch(1)
+    spool.commit(first[-1][1], 1)
+    spool.close()
+
+    reopened = SegmentedSpool(tmp_path)
+    assert reopened.depth == 2
+    assert [line for line, _ in reopened.read_batch(10)] == _records(2, 3)
+
+
+def test_rolls_segments_and_deletes_drained_ones(tmp_path):
+    spool = SegmentedSpool(tmp_path, segment_max_bytes=20)
+    for seq in range(6):
+        spool.append(_records(seq))
+    assert len(list(tmp_path.glob("seg-*.log"))) > 2
+
+    batch = spool.read_batch(100)
+    assert [line for line, _ in batch] == _records(*range(6))
+    spool.commit(batch[-1][1], len(batch))
+    assert spool.depth == 0
+    # Only the active (empty) segment remains.
+    assert len(list(tmp_path.glob("seg-*.log"))) == 1
+
+
+def test_torn_tail_is_dropped_on_open(tmp_path):
+    spool = SegmentedSpool(tmp_path)
+    spool.append(_records(1))
+    spool.close()
+    [segment] = tmp_path.glob("seg-*.log")
+    with segment.open("ab") as fp:
+        fp.write(b'{"seq":2')
+
+    reopened = SegmentedSpool(tmp_path)
+    assert reopened.depth == 1
+    reopened.append(_records(3))
+    assert [line for line, _ in reopened.read_batch(10)] == _records(1, 3)
+
+
+def test_backlog_gauges_track_appends_and_commits(tmp_path):
+    spool = SegmentedSpool(tmp_path, segment_max_bytes=20)
+    assert spool.pending_bytes == 0
+    assert spool.oldest_age() is None
+
+    spool.append(_records(1, 2))
+    spool.append(_records(3))
+    assert spool.pending_bytes == 3 * len(b'{"seq":1}\n')
+    assert spool.oldest_age() >= 0
+
+    batch = spool.read_batch(2)
+    spool.commit(batch[-1][1], 2)
+    assert spool.pending_bytes == len(b'{"seq":3}\n')
+
+    spool.close()
+    reopened = SegmentedSpool(tmp_path, segment_max_bytes=20)
+    assert reopened.depth == 1
+    assert reopened.pending_bytes == len(b'{"seq":3}\n')
+    assert reopened.oldest_age() is not None
+
+    batch = reopened.read_batch(10)
+    reopened.commit(batch[-1][1], 1)
+    assert reopened.pending_bytes == 0
+    assert reopened.oldest_age() is None
+
+
+def test_follower_replays_records_from_a_separate_writer(tmp_path):
+    writer = SegmentedSpool(tmp_path, segment_max_bytes=40, write_only=True)
+    follower = SegmentedSpool(tmp_path, follow_writes=True)
+    assert follower.read_batch(10) == []
+
+    writer.append(_records(1, 2, 3, 4))  # rolls past the first segment
+    writer.append(_records(5))
+    batch = follower.read_batch(10)
+    assert [line for line, _ in batch] == _records(1, 2, 3, 4, 5)
+    assert follower.depth == 5
+
+    follower.commit(batch[-1][1], len(batch))
+    assert follower.depth == 0
+    writer.append(_records(6))
+    assert [line for line, _ in follower.read_batch(10)] == _records(6)
+    assert follower.depth == 1
+    # Drained segments are gone; the writer's tail is kept.
+    assert len(list(tmp_path.glob("seg-*.log"))) == 1
+
+
+def test_write_only_spool_keeps_no_backlog_state(tmp_path):
+    writer = SegmentedSpool(tmp_path, segment_max_bytes=40, write_only=True)
+    for seq in range(50):
+        writer.append(_records(seq))  # rolls every couple of records
+    assert (writer.depth, writer.pending_bytes, writer.oldest_age()) == (0, 0, None)
+    assert len(writer._marks) == 0
+    assert len(writer._segments) == len(writer._sizes) == 1
+    follower = SegmentedSpool(tmp_path, follow_writes=True)
+    assert [line for line, _ in follower.read_batch(100)] == _records(*range(50))
+
+
+def test_group_replays_members_round_robin(tmp_path):
+    first, second = SegmentedSpool(tmp_path / "w0"), SegmentedSpool(tmp_path / "w1")
+    group = SpoolGroup()
+    group.add("w0", SegmentedSpool(tmp_path / "w0", follow_writes=True))
+    group.add("w1", SegmentedSpool(tmp_path / "w1", follow_writes=True))
+    first.append(_records(1, 2))
+    second.append(_records(3))
+
+    batch = group.read_batch(10)
+    assert [line for line, _ in batch] == _records(1, 2)
+    group.commit(batch[-1][1], len(batch))
+    batch = group.read_batch(10)
+    assert [line for line, _ in batch] == _records(3)
+    group.commit(batch[-1][1], len(batch))
+    assert group.read_batch(10) == []
+    assert group.depth == 0
@@ -0,0 +1,130 @@
+import httpx
+import pytest
+
+from pla_node.app.upstreams import CLOSED, HALF_OPEN, OPEN, UpstreamPool, health_url
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _urls(count):
+    return [f"http://r{index}/events" for index in range(count)]
+
+
+def test_round_robin_rotates_and_skips_excluded():
+    pool = UpstreamPool(_urls(3), health_interval=0)
+    picks = []
+    for _ in range(4):
+        upstream = pool.acquire()
+        picks.append(upstream.url)
+        pool.release(upstream, ok=True)
+    assert picks == ["http://r0/events", "http://r1/events", "http://r2/events", "http://r0/events"]
+
+    first = pool.acquire()
+    assert pool.acquire(exclude=[first.upstream]).url != first.url
+
+
+def test_least_outstanding_prefers_idle_endpoint():
+    pool = UpstreamPool(_urls(2), policy="least_outstanding", health_interval=0)
+    busy = pool.acquire()
+    other = pool.acquire()
+    assert other.upstream is not busy.upstream
+    pool.release(other, ok=True)
+    assert pool.acquire().upstream is other.upstream
+
+
+def test_breaker_opens_short_circuits_then_half_opens():
+    clock = FakeClock()
+    pool = UpstreamPool(_urls(1), failure_threshold=2, open_seconds=10, health_interval=0, clock=clock)
+    for _ in range(2):
+        pool.release(pool.acquire(), ok=False, error="boom")
+    [upstream] = pool.upstreams
+    assert upstream.state == OPEN
+    assert pool.acquire() is None
+    assert pool.short_circuits == 1
+
+    clock.now = 10.0
+    trial = pool.acquire()
+    assert trial.upstream is upstream and trial.trial and upstream.state == HALF_OPEN
+    assert pool.acquire() is None  # one trial at a time
+    pool.release(trial, ok=False)
+    assert upstream.state == OPEN
+
+    clock.now = 20.0
+    pool.release(pool.acquire(), ok=True)
+    assert upstream.state == CLOSED
+    assert upstream.consecutive_failures == 0
+
+
+def test_late_answers_to_earlier_batches_do_not_decide_the_trial():
+    clock = FakeClock()
+    pool = UpstreamPool(_urls(1), failure_threshold=2, open_seconds=10, health_interval=0, clock=clock)
+    early = [pool.acquire() for _ in range(4)]  # sent while the breaker was closed
+    for lease in early[:2]:
+        pool.release(lease, ok=False)
+    [upstream] = pool.upstreams
+    assert upstream.state == OPEN
+    pool.release(early[2], ok=True)  # a stale success does not close it
+    assert upstream.state == OPEN
+
+    clock.now = 10.0
+    trial = pool.acquire()
+    pool.release(early[3], ok=False)  # a stale failure neither reopens it nor frees the trial slot
+    assert upstream.state == HALF_OPEN and upstream.trial_in_flight
+    assert pool.acquire() is None
+    pool.release(trial, ok=True)
+    assert upstream.state == CLOSED
+    assert upstream.outstanding == 0
+
+
+def test_abandoned_batch_gives_no_verdict():
+    pool = UpstreamPool(_urls(1), failure_threshold=1, health_interval=0)
+    lease = pool.acquire()
+    pool.release(lease, ok=None)
+    assert lease.upstream.outstanding == 0
+    assert lease.upstream.state == CLOSED
+
+
+def test_rejects_unknown_policy_and_empty_list():
+    with pytest.raises(ValueError):
+        UpstreamPool(_urls(1), policy="random")
+    with pytest.raises(ValueError):
+        UpstreamPool([])
+
+
+@pytest.mark.anyio
+async def test_health_checks_eject_and_readmit():
+    status = {"http://r0/health": 503}
+
+    def handler(request):
+        return httpx.Response(status[str(request.url)])
+
+    pool = UpstreamPool(_urls(1), unhealthy_threshold=2, health_interval=0)
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        await pool.check()
+        assert pool.available() == 1
+        await pool.check()
+        assert pool.available() == 0
+        assert pool.acquire() is None
+
+        status["http://r0/health"] = 200
+        await pool.check()
+        assert pool.available() == 1
+        assert pool.upstreams[0].ejections == 1
+    finally:
+        await pool._client.aclose()
+
+
+def test_health_url_replaces_last_path_segment():
+    assert health_url("http://10.0.0.5:8788/events") == "http://10.0.0.5:8788/health"
@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from pla_node.app import workers
+
+
+def test_file_lock_is_exclusive_until_released(tmp_path):
+    first = workers.FileLock(tmp_path / "drain.lock")
+    second = workers.FileLock(tmp_path / "drain.lock")
+    assert first.try_acquire()
+    assert first.try_acquire()  # already held
+    assert not second.try_acquire()
+    assert (tmp_path / "drain.lock").read_text() == str(os.getpid())
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_claim_slot_takes_lowest_free_index(tmp_path):
+    index0, lock0 = workers.claim_slot(tmp_path, 3)
+    index1, lock1 = workers.claim_slot(tmp_path, 3)
+    assert (index0, index1) == (0, 1)
+
+    lock0.release()
+    index, lock = workers.claim_slot(tmp_path, 3)
+    assert index == 0
+    workers.claim_slot(tmp_path, 3)
+    with pytest.raises(RuntimeError, match="no free worker slot"):
+        workers.claim_slot(tmp_path, 3)
+
+
+def test_slot_dirs_lists_only_slot_directories_in_order(tmp_path):
+    for name in ("w10", "w2", "wx", "seg-1"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "w3").write_text("not a dir")
+    assert [path.name for path in workers.slot_dirs(tmp_path)] == ["w2", "w10"]
+
+
+def test_snapshot_store_returns_fresh_peer_snapshots(tmp_path):
+    mine = workers.SnapshotStore(tmp_path, "w0")
+    peer = workers.SnapshotStore(tmp_path, "w1")
+    mine.publish({"status": {"n": 1}})
+    peer.publish({"status": {"n": 2}})
+
+    peers = mine.peers()
+    assert [(s["worker"], s["status"]) for s in peers] == [("w1", {"n": 2})]
+
+    stale = json.loads((tmp_path / "metrics-w1.json").read_text())
+    stale["published_at"] -= 60
+    (tmp_path / "metrics-w1.json").write_text(json.dumps(stale))
+    assert mine.peers() == []
+
+    mine.remove()
+    assert not (tmp_path / "metrics-w0.json").exists()
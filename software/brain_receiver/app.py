@@ -3,43 +3,51 @@
 Minimal Brain Receiver service for HexForge PLA Option A MVP.
 - Listens on HTTP port 8788 by default (overridable via env BRAIN_RECEIVER_PORT).
 - Validates incoming events against the shared contract in contracts/event.schema.json.
-- Appends validated events to logs/events.ndjson with a UTC timestamp.
+- Appends validated events to the event store in logs/events/ with a UTC timestamp; each
+  worker process writes its own segment (see event_store.py).
+- Accepts batches of events (JSON array or NDJSON) at POST /events with per-item results.
+  A batch is validated first and then appended with one write; the response's request_id
+  (the caller's X-Request-ID) acknowledges the whole batch.
+- BRAIN_RECEIVER_FSYNC=1 fsyncs before answering; concurrent requests share one fsync.
+- Segments roll at BRAIN_RECEIVER_SEGMENT_BYTES or BRAIN_RECEIVER_SEGMENT_SECONDS;
+  BRAIN_RECEIVER_EVENTS_DIR moves the store.
+- GET /events?device_id=&event_type=&since=&until=&limit=&cursor= pages through stored
+  events oldest first using the store's index (see event_index.py).
+- Sealed segments are compacted every BRAIN_RECEIVER_COMPACT_SECONDS into a compressed
+  columnar archive split by BRAIN_RECEIVER_ARCHIVE_PERIOD (hour or day); queries read it
+  transparently (see event_archive.py). The compactor starts, and segments left by dead
+  workers are sealed, on the first request rather than at import.
+- Single-line event JSON from the client is spliced into the log line as-is instead of
+  being re-encoded; NDJSON batches may carry an X-Content-SHA256 body hash.
+- Validation, storage and queries live in receiver_core.py, shared with the ASGI
+  variant in asgi_app.py.
+- Safe under the threaded development server (app.run) and threaded gunicorn workers:
+  the store and the index lock their shared state.
 """
 from __future__ import annotations
 
 import json
-import logging
 import os
+import sys
 import uuid
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from flask import Flask, jsonify, request
-from jsonschema import Draft202012Validator, ValidationError, FormatChecker
-from logging.handlers import RotatingFileHandler
+from flask import Flask, Response, jsonify, request
+from jsonschema import ValidationError
 
-app = Flask(__name__)
-
-_SCHEMA_PATH = Path(__file__).resolve().parents[2] / "contracts" / "event.schema.json"
-if not _SCHEMA_PATH.exists():
-    raise RuntimeError(f"Event schema not found at {_SCHEMA_PATH}")
+import codec
+import receiver_core as core
 
-with _SCHEMA_PATH.open("r", encoding="utf-8") as schema_file:
-    _EVENT_SCHEMA: Dict[str, Any] = json.load(schema_file)
+app = Flask(__name__)
 
-_VALIDATOR = Draft202012Validator(_EVENT_SCHEMA, format_checker=FormatChecker())
+_VALIDATOR = core.VALIDATOR
+_index = core.index
 
-# Log file lives at repo_root/logs/events.ndjson regardless of where the service runs from.
-_LOG_PATH = Path(__file__).resolve().parents[2] / "logs" / "events.ndjson"
-_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-_logger = app.logger
-_logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
-_handler = RotatingFileHandler(_LOG_PATH, maxBytes=5_000_000, backupCount=5)
-_handler.setFormatter(logging.Formatter("%(message)s"))
-_logger.handlers = [_handler]
-_logger.propagate = False
+@app.before_request
+def _start_background() -> None:
+    # On the first request rather than at import: gunicorn imports the app before forking.
+    core.start_background()
 
 
 def _get_request_id() -> str:
@@ -47,22 +55,27 @@ def _get_request_id() -> str:
     return incoming if incoming else uuid.uuid4().hex
 
 
-def _build_log_entry(payload: Dict[str, Any], request_id: str) -> Dict[str, Any]:
-    """Wrap payload with server-side timestamp and request correlation."""
-    return {
-        "received_at": datetime.now(timezone.utc).isoformat(),
-        "request_id": request_id,
-        "event": payload,
-    }
+def _read_json() -> Any:
+    """Decode the request body with the shared codec; None when it is not valid JSON."""
+    try:
+        return codec.loads(request.get_data())
+    except json.JSONDecodeError:
+        return None
+
+
+def _write_events(lines: List[str]) -> None:
+    core.write_events(lines)
 
 
-def _write_event(entry: Dict[str, Any]) -> None:
-    _logger.info(json.dumps(entry, separators=(",", ":")))
+def _write_failed_response(request_id: str, exc: OSError):
+    # Not logged to the event log: that is the file that just failed.
+    print(f"[brain_receiver] event log write failed request_id={request_id}: {exc}", file=sys.stderr, flush=True)
+    return jsonify({"ok": False, "error": "write_failed", "request_id": request_id}), 503
 
 
 @app.route("/event", methods=["POST"])
 def handle_event():
-    payload = request.get_json(silent=True)
+    payload = _read_json()
     if payload is None:
         return jsonify({"ok": False, "error": "invalid_json"}), 400
 
@@ -71,8 +84,7 @@ def handle_event():
     try:
         _VALIDATOR.validate(payload)
     except ValidationError as err:
-        path = "/".join([str(p) for p in err.path])
-        detail = err.message if not path else f"{err.message} at {path}"
+        detail = core.validation_detail(err)
         return (
             jsonify(
                 {
@@ -85,10 +97,55 @@ def handle_event():
             400,
         )
 
-    _write_event(_build_log_entry(payload, request_id))
+    try:
+        _write_events([core.format_log_line(payload, request_id, request.get_data())])
+    except OSError as exc:
+        return _write_failed_response(request_id, exc)
     return jsonify({"ok": True, "request_id": request_id})
 
 
+@app.route("/events", methods=["POST"])
+def handle_events():
+    """Batch variant of /event: body is a JSON array of events, or NDJSON (one event per line)."""
+    if "ndjson" in (request.content_type or ""):
+        body = request.get_data()
+        expected = request.headers.get(codec.CONTENT_HASH_HEADER)
+        if expected and expected.lower() != codec.content_hash(body):
+            return jsonify({"ok": False, "error": "content_hash_mismatch"}), 400
+        items = core.read_ndjson(body)
+    else:
+        payload = _read_json()
+        if not isinstance(payload, list):
+            return jsonify({"ok": False, "error": "invalid_json"}), 400
+        items = [(event, None) for event in payload]
+
+    request_id = _get_request_id()
+    results: List[Dict[str, Any]] = []
+    lines: List[str] = []
+    for position, item in enumerate(items):
+        result, line = core.check_item(position, item, request_id)
+        results.append(result)
+        if line is not None:
+            lines.append(line)
+
+    try:
+        _write_events(lines)
+    except OSError as exc:
+        # Nothing is acknowledged, so the sender keeps the batch and retries it.
+        return _write_failed_response(request_id, exc)
+    return jsonify(core.batch_response(request_id, results, len(lines)))
+
+
+@app.route("/events", methods=["GET"])
+def query_events():
+    """Stored events matching the filters, oldest first, streamed one page at a time."""
+    try:
+        filters, limit = core.parse_query(request.args)
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": "invalid_query", "details": str(exc)}), 400
+    return Response(core.render_page(_index.query(**filters), limit), mimetype="application/json")
+
+
 @app.route("/health", methods=["GET"])
 def health_check():
     return jsonify({"ok": True, "status": "ready"})
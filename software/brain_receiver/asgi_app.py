@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+ASGI variant of Brain Receiver (same endpoints and responses as app.py).
+- Shares validation, the event store, the index and the archive with the Flask app
+  through receiver_core.py
+- NDJSON batches are parsed and validated line by line while the body streams in;
+  the X-Content-SHA256 hash is computed on the way and checked at the end
+- Nothing is written before the whole batch has arrived and been validated; the single
+  append (and its group-committed fsync) runs in a worker thread, so a slow disk never
+  stalls the event loop
+- One event loop per worker holds thousands of idle keep-alive connections from
+  PLA Node gateways; BRAIN_RECEIVER_KEEPALIVE_SECONDS sets how long they stay open
+- Bodies over BRAIN_RECEIVER_MAX_BODY_BYTES are refused with 413
+
+Run with `python asgi_app.py` or `uvicorn asgi_app:app --workers N` from this directory.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from jsonschema import ValidationError
+
+import codec
+import receiver_core as core
+
+MAX_BODY_BYTES = int(os.environ.get("BRAIN_RECEIVER_MAX_BODY_BYTES", "16000000"))
+KEEPALIVE_SECONDS = int(os.environ.get("BRAIN_RECEIVER_KEEPALIVE_SECONDS", "75"))
+WORKERS = int(os.environ.get("BRAIN_RECEIVER_WORKERS", "1"))
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    core.start_background()
+    try:
+        yield
+    finally:
+        core.stop_background()
+
+
+app = FastAPI(title="Brain Receiver", docs_url=None, redoc_url=None, lifespan=lifespan)
+_index = core.index
+
+
+def _request_id(request: Request) -> str:
+    incoming = request.headers.get("X-Request-ID")
+    return incoming if incoming else uuid.uuid4().hex
+
+
+def _write_events(lines: List[str]) -> None:
+    core.write_events(lines)
+
+
+def _write_failed_response(request_id: str, exc: OSError) -> JSONResponse:
+    # Not logged to the event log: that is the file that just failed.
+    print(f"[brain_receiver] event log write failed request_id={request_id}: {exc}", file=sys.stderr, flush=True)
+    return JSONResponse({"ok": False, "error": "write_failed", "request_id": request_id}, status_code=503)
+
+
+def _too_large_response() -> JSONResponse:
+    return JSONResponse({"ok": False, "error": "body_too_large"}, status_code=413)
+
+
+async def _read_body(request: Request) -> bytes:
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise BodyTooLarge()
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@app.post("/event")
+async def handle_event(request: Request):
+    try:
+        body = await _read_body(request)
+    except BodyTooLarge:
+        return _too_large_response()
+    try:
+        payload = codec.loads(body)
+    except json.JSONDecodeError:
+        return JSONResponse({"ok": False, "error": "invalid_json"}, status_code=400)
+
+    request_id = _request_id(request)
+    try:
+        core.VALIDATOR.validate(payload)
+    except ValidationError as err:
+        return JSONResponse(
+            {
+                "ok": False,
+                "error": "schema_validation_failed",
+                "details": core.validation_detail(err),
+                "request_id": request_id,
+            },
+            status_code=400,
+        )
+
+    try:
+        await asyncio.to_thread(_write_events, [core.format_log_line(payload, request_id, body)])
+    except OSError as exc:
+        return _write_failed_response(request_id, exc)
+    return JSONResponse({"ok": True, "request_id": request_id})
+
+
+@app.post("/events")
+async def handle_events(request: Request):
+    """Batch variant of /event: body is a JSON array of events, or NDJSON (one event per line)."""
+    request_id = _request_id(request)
+    results: List[Dict[str, Any]] = []
+    lines: List[str] = []
+
+    def check(item: core.Item) -> None:
+        result, line = core.check_item(len(results), item, request_id)
+        results.append(result)
+        if line is not None:
+            lines.append(line)
+
+    if "ndjson" in request.headers.get("content-type", ""):
+        reader = core.NdjsonReader()
+        async for chunk in request.stream():
+            if reader.size + len(chunk) > MAX_BODY_BYTES:
+                return _too_large_response()
+            for item in reader.feed(chunk):
+                check(item)
+        for item in reader.finish():
+            check(item)
+        expected = request.headers.get(codec.CONTENT_HASH_HEADER)
+        if expected and expected.lower() != reader.hexdigest():
+            return JSONResponse({"ok": False, "error": "content_hash_mismatch"}, status_code=400)
+    else:
+        try:
+            payload = codec.loads(await _read_body(request))
+        except BodyTooLarge:
+            return _too_large_response()
+        except json.JSONDecodeError:
+            payload = None
+        if not isinstance(payload, list):
+            return JSONResponse({"ok": False, "error": "invalid_json"}, status_code=400)
+        for event in payload:
+            check((event, None))
+
+    try:
+        await asyncio.to_thread(_write_events, lines)
+    except OSError as exc:
+        # Nothing is acknowledged, so the sender keeps the batch and retries it.
+        return _write_failed_response(request_id, exc)
+    return JSONResponse(core.batch_response(request_id, results, len(lines)))
+
+
+@app.get("/events")
+async def query_events(request: Request):
+    """Stored events matching the filters, oldest first, streamed one page at a time."""
+    try:
+        filters, limit = core.parse_query(request.query_params)
+    except ValueError as exc:
+        return JSONResponse({"ok": False, "error": "invalid_query", "details": str(exc)}, status_code=400)
+    # A plain iterator: Starlette reads it in a worker thread, off the event loop.
+    return StreamingResponse(core.render_page(_index.query(**filters), limit), media_type="application/json")
+
+
+@app.get("/health")
+async def health_check():
+    return {"ok": True, "status": "ready"}
+
+
+def main() -> None:
+    port = int(
+        os.environ.get(
+            "BRAIN_RECEIVER_PORT",
+            os.environ.get("PORT", "8788"),
+        )
+    )
+    print(f"[brain_receiver] binding 0.0.0.0:{port} (asgi, workers={WORKERS})", flush=True)
+    uvicorn.run(
+        "asgi_app:app",
+        host="0.0.0.0",
+        port=port,
+        workers=WORKERS,
+        timeout_keep_alive=KEEPALIVE_SECONDS,
+        backlog=4096,
+    )
+
+
+if __name__ == "__main__":
+    main()
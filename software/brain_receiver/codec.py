@@ -0,0 +1,78 @@
+"""
+JSON codec for the event path.
+- Uses orjson when it is installed, the stdlib json module otherwise
+- dumps() always returns compact UTF-8 bytes so one encoding can be reused for
+  logging, spooling and forwarding
+- loads() accepts bytes or str and raises json.JSONDecodeError for any bad input
+- Integers outside 64 bits stay exact with either backend: orjson would turn them into
+  floats, so documents holding a long digit run are decoded (and such integers
+  encoded) by the stdlib json module
+- Raw passthrough helpers: NDJSON framing of already-encoded documents and the
+  X-Content-SHA256 body hash shared by PLA Node and Brain Receiver
+
+Kept in sync with pla_node/app/codec.py;
+the test suites of both services fail if the two copies differ.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from json import JSONDecodeError
+from typing import Any, Iterable, Optional, Union
+
+try:  # optional accelerated backend
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+CONTENT_HASH_HEADER = "X-Content-SHA256"
+# Every integer orjson cannot hold exactly (below -2**63 or above 2**64 - 1) has 19+ digits.
+_LONG_DIGITS = re.compile(rb"[0-9]{19}")
+_LONG_DIGITS_TEXT = re.compile(r"[0-9]{19}")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            pass  # e.g. an integer beyond 64 bits; the stdlib encodes it or raises TypeError
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps_text(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    if orjson is not None:
+        long_digits = _LONG_DIGITS_TEXT if isinstance(data, str) else _LONG_DIGITS
+        if long_digits.search(data) is None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+            return orjson.loads(data)
+    try:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+    except UnicodeDecodeError as exc:
+        raise JSONDecodeError(f"invalid UTF-8: {exc.reason}", "", exc.start) from None
+
+
+def join_array(encoded: Iterable[bytes]) -> bytes:
+    """Build a JSON array body from already-encoded documents without re-encoding them."""
+    return b"[" + b",".join(encoded) + b"]"
+
+
+def join_lines(encoded: Iterable[bytes]) -> bytes:
+    """Build an NDJSON body from single-line encoded documents."""
+    return b"".join(doc + b"\n" for doc in encoded)
+
+
+def single_line(raw: bytes) -> Optional[bytes]:
+    """raw without surrounding whitespace if it fits on one NDJSON line, else None."""
+    raw = raw.strip()
+    return None if b"\n" in raw or b"\r" in raw else raw
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
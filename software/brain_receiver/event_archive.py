@@ -0,0 +1,339 @@
+"""
+Compressed columnar archive for sealed event store segments.
+- One file per sealed segment and hour (or day) of received_at,
+  <period>.<segment>.colz in the archive directory; a file is written once and never
+  rewritten, and queries merge the files of a period as they read them
+- Rows are sorted by (received_at, source segment, offset) and split into row groups;
+  every column of a row group is a separate zlib chunk
+- The header keeps per-column min/max for the file and for each row group, so scans
+  skip files and row groups by time, device_id, event_type, ts or seq, and only
+  decode the columns a filter needs
+- Rows keep their source segment and byte offset, so query cursors stay valid when
+  a segment moves into the archive
+- The Compactor converts sealed segments in the background and deletes a segment
+  one run after it is fully archived; until then queries read it from the archive
+"""
+from __future__ import annotations
+
+import fcntl
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import codec
+from event_store import SEALED_SUFFIX, EventStore
+
+MAGIC = b"HFCOL1\n"
+ARCHIVE_SUFFIX = ".colz"
+PERIODS = {"hour": 13, "day": 10}  # length of the received_at prefix naming a period
+COLUMNS = ("received_at", "request_id", "device_id", "event_type", "ts", "seq", "source", "offset", "event")
+STAT_COLUMNS = ("received_at", "device_id", "event_type", "ts", "seq")
+_SOURCE = COLUMNS.index("source")
+_OFFSET = COLUMNS.index("offset")
+
+Key = Tuple[str, str, int]
+
+
+def split_line(line: bytes, source: int, offset: int) -> Optional[Tuple[Any, ...]]:
+    """Row for a stored line, in COLUMNS order; None if the line is not a stored event."""
+    try:
+        entry = codec.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get("received_at"), str):
+        return None
+    event = entry.get("event")
+    head = codec.dumps({"received_at": entry["received_at"], "request_id": entry.get("request_id")})
+    prefix = head[:-1] + b',"event":'
+    # Keep the event bytes exactly as stored (they may be the client's own encoding).
+    raw = line[len(prefix) : -1] if line.startswith(prefix) and line.endswith(b"}") else codec.dumps(event)
+    fields = event if isinstance(event, dict) else {}
+    return (
+        entry["received_at"],
+        entry.get("request_id"),
+        fields.get("device_id"),
+        fields.get("event_type"),
+        fields.get("ts"),
+        fields.get("seq"),
+        source,
+        offset,
+        raw,
+    )
+
+
+def join_row(row: Tuple[Any, ...]) -> bytes:
+    """The stored line a row was made from."""
+    head = codec.dumps({"received_at": row[0], "request_id": row[1]})
+    return head[:-1] + b',"event":' + row[-1] + b"}"
+
+
+def _stats(values: Iterable[Any]) -> Optional[List[Any]]:
+    present = [value for value in values if isinstance(value, (str, int, float)) and not isinstance(value, bool)]
+    kinds = set(type(value) is str for value in present)
+    if not present or len(kinds) > 1:  # nothing to compare, or mixed strings and numbers
+        return None
+    return [min(present), max(present)]
+
+
+def _in_range(stats: Optional[List[Any]], value: Any) -> bool:
+    if stats is None:
+        return True
+    try:
+        return stats[0] <= value <= stats[1]
+    except TypeError:
+        return True
+
+
+class ArchiveFile:
+    """One open archive file; reads column chunks on demand from the same descriptor."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fp = path.open("rb")
+        try:
+            if self.fp.readline() != MAGIC:
+                raise ValueError(f"{path} is not an event archive")
+            self.header: Dict[str, Any] = codec.loads(self.fp.readline())
+        except Exception:
+            self.fp.close()
+            raise
+        self.data_start = self.fp.tell()
+        self.sources: List[List[Any]] = self.header["sources"]  # [stem, rows here, rows in segment]
+
+    def close(self) -> None:
+        self.fp.close()
+
+    def column(self, group: Dict[str, Any], name: str) -> List[Any]:
+        offset, length = group["chunks"][name]
+        self.fp.seek(self.data_start + offset)
+        data = zlib.decompress(self.fp.read(length))
+        if name == "event":
+            return data.split(b"\n") if data else []
+        return codec.loads(data)
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        for group in self.header["groups"]:
+            columns = [self.column(group, name) for name in COLUMNS]
+            yield from zip(*columns)
+
+    def might_match(
+        self, stats: Dict[str, Any], device_id: Optional[str], event_type: Optional[str], lower: str, until: Optional[str]
+    ) -> bool:
+        span = stats.get("received_at")
+        if span is None or span[1] < lower or (until is not None and span[0] > until):
+            return False
+        if device_id is not None and not _in_range(stats.get("device_id"), device_id):
+            return False
+        return event_type is None or _in_range(stats.get("event_type"), event_type)
+
+    def scan(
+        self,
+        device_id: Optional[str],
+        event_type: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        after: Optional[Key],
+        skip_sources: Set[str],
+    ) -> Iterator[Tuple[Key, bytes]]:
+        """Matching stored lines in key order, leaving out rows of the given source segments."""
+        lower = max(since or "", after[0] if after is not None else "")
+        stems = [source[0] for source in self.sources]
+        try:
+            for group in self.header["groups"]:
+                if not self.might_match(group["stats"], device_id, event_type, lower, until):
+                    continue
+                stamps = self.column(group, "received_at")
+                wanted = [
+                    i for i, stamp in enumerate(stamps) if stamp >= lower and (until is None or stamp <= until)
+                ]
+                for name, value in (("device_id", device_id), ("event_type", event_type)):
+                    if value is not None and wanted:
+                        values = self.column(group, name)
+                        wanted = [i for i in wanted if values[i] == value]
+                if not wanted:
+                    continue
+                sources = self.column(group, "source")
+                offsets = self.column(group, "offset")
+                request_ids = self.column(group, "request_id")
+                events = self.column(group, "event")
+                for i in wanted:
+                    stem = stems[sources[i]]
+                    key = (stamps[i], stem, offsets[i])
+                    if stem in skip_sources or (after is not None and key <= after):
+                        continue
+                    yield key, join_row((stamps[i], request_ids[i], events[i]))
+        finally:
+            self.close()
+
+
+def write_archive(path: Path, rows: List[Tuple[Any, ...]], sources: List[List[Any]], group_rows: int, level: int) -> None:
+    """Write rows (sorted here) and their source table to path atomically."""
+    rows.sort(key=lambda row: (row[0], sources[row[_SOURCE]][0], row[_OFFSET]))
+    chunks: List[bytes] = []
+    groups: List[Dict[str, Any]] = []
+    position = 0
+    for start in range(0, len(rows), group_rows):
+        chunk = rows[start : start + group_rows]
+        columns = list(zip(*chunk))
+        entry: Dict[str, Any] = {"rows": len(chunk), "chunks": {}, "stats": {}}
+        for index, name in enumerate(COLUMNS):
+            values = columns[index]
+            raw = b"\n".join(values) if name == "event" else codec.dumps(list(values))
+            data = zlib.compress(raw, level)
+            entry["chunks"][name] = [position, len(data)]
+            chunks.append(data)
+            position += len(data)
+            if name in STAT_COLUMNS:
+                entry["stats"][name] = _stats(values)
+        groups.append(entry)
+    stats: Dict[str, Any] = {}
+    for name in STAT_COLUMNS:
+        spans = [group["stats"][name] for group in groups]
+        known = [span for span in spans if span is not None]
+        stats[name] = _stats([bound for span in known for bound in span]) if len(known) == len(spans) else None
+    header = {"version": 1, "rows": len(rows), "columns": list(COLUMNS), "sources": sources, "stats": stats, "groups": groups}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as fp:
+        fp.write(MAGIC)
+        fp.write(codec.dumps(header) + b"\n")
+        for data in chunks:
+            fp.write(data)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp, path)
+
+
+class Archive:
+    def __init__(self, directory: Path, period: str = "hour", group_rows: int = 4096, level: int = 9) -> None:
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {tuple(PERIODS)}, got {period!r}")
+        self.directory = Path(directory)
+        self.period = period
+        self.group_rows = max(1, group_rows)
+        self.level = level
+
+    def period_of(self, stamp: str) -> str:
+        return stamp[: PERIODS[self.period]]
+
+    def files(self) -> List[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob(f"*{ARCHIVE_SUFFIX}"))
+
+    def snapshot(self) -> List[ArchiveFile]:
+        """Open every archive file; the caller closes them (ArchiveFile.scan does when done)."""
+        opened = []
+        for path in self.files():
+            try:
+                opened.append(ArchiveFile(path))
+            except FileNotFoundError:  # replaced between listing and opening
+                continue
+        return opened
+
+    @staticmethod
+    def complete_sources(files: List[ArchiveFile]) -> Tuple[Set[str], Set[str]]:
+        """(segments fully archived, segments only partly archived) across the given files."""
+        archived: Dict[str, int] = {}
+        totals: Dict[str, int] = {}
+        for archive_file in files:
+            for stem, rows, total in archive_file.sources:
+                archived[stem] = archived.get(stem, 0) + rows
+                totals[stem] = total
+        complete = {stem for stem, rows in archived.items() if rows >= totals[stem]}
+        return complete, set(archived) - complete
+
+    def add_segment(self, stem: str, lines: Iterable[Tuple[int, bytes]]) -> int:
+        """Archive one segment's (offset, line) pairs into a new file per period; returns rows added."""
+        by_period: Dict[str, List[Tuple[Any, ...]]] = {}
+        for offset, line in lines:
+            row = split_line(line, 0, offset)
+            if row is not None:
+                by_period.setdefault(self.period_of(row[0]), []).append(row)
+        total = sum(len(rows) for rows in by_period.values())
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for period, rows in sorted(by_period.items()):
+            path = self.directory / f"{period}.{stem}{ARCHIVE_SUFFIX}"
+            if path.exists():
+                continue  # written by an earlier, interrupted run
+            write_archive(path, rows, [[stem, len(rows), total]], self.group_rows, self.level)
+        return total
+
+
+def segment_lines(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """(offset, line) for every complete line of a segment."""
+    offset = 0
+    with path.open("rb") as fp:
+        for line in fp:
+            if line.endswith(b"\n"):
+                yield offset, line[:-1]
+            offset += len(line)
+
+
+class Compactor:
+    """Moves sealed segments into the archive every `interval` seconds (one process at a time)."""
+
+    def __init__(self, store: EventStore, archive: Archive, interval: float = 300.0) -> None:
+        self.store = store
+        self.archive = archive
+        self.interval = interval
+        self.runs = 0
+        self.archived_segments = 0
+        self.archived_rows = 0
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Dict[str, int]:
+        """Delete segments archived by an earlier run, then archive the other sealed segments."""
+        self.archive.directory.mkdir(parents=True, exist_ok=True)
+        with (self.archive.directory / ".compact.lock").open("a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:  # another worker is compacting
+                return {"retired": 0, "segments": 0, "rows": 0}
+            files = self.archive.snapshot()
+            for archive_file in files:
+                archive_file.close()
+            complete, _ = Archive.complete_sources(files)
+            retired = segments = rows = 0
+            for path in self.store.sealed_segments():
+                stem = path.name[: -len(SEALED_SUFFIX)]
+                if stem in complete:
+                    # Archived at least one run ago, so queries already read it from the archive.
+                    path.unlink(missing_ok=True)
+                    path.with_name(stem + ".idx").unlink(missing_ok=True)
+                    retired += 1
+                    continue
+                added = self.archive.add_segment(stem, segment_lines(path))
+                if not added:  # no events in it: nothing to keep
+                    path.unlink(missing_ok=True)
+                    path.with_name(stem + ".idx").unlink(missing_ok=True)
+                rows += added
+                segments += 1
+        self.runs += 1
+        self.archived_segments += segments
+        self.archived_rows += rows
+        return {"retired": retired, "segments": segments, "rows": rows}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="event-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+                self.last_error = None
+            except (OSError, ValueError) as exc:
+                self.last_error = str(exc)
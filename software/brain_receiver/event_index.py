@@ -0,0 +1,333 @@
+"""
+Query index over the Brain Receiver event store.
+- Every segment is split into blocks of `block_lines` lines; a block records its
+  received_at range and byte span (sparse time index)
+- Postings per segment map device_id and event_type to the byte offsets of their lines
+- Active segments are indexed incrementally: each query only reads bytes appended
+  since the last one. Sealed segments get a sidecar <segment>.idx written once, whose
+  first line holds the segment's received_at range so pruning never loads the rest
+- query() yields matches in (received_at, segment, offset) order, reading only the
+  blocks and lines that can match; the last key of a page is the cursor for the next
+- Safe to share between threads: index caches are only touched under one lock, and
+  scans work on copies of a segment's blocks and postings
+- With an Archive attached, archived segments are read from the archive instead
+  (same keys, so cursors survive compaction)
+"""
+from __future__ import annotations
+
+import base64
+import bisect
+import heapq
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import codec
+from event_archive import Archive
+from event_store import ACTIVE_SUFFIX, SEALED_SUFFIX, EventStore, received_at
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+# (received_at, segment stem, byte offset of the line)
+Key = Tuple[str, str, int]
+
+
+def encode_cursor(key: Key) -> str:
+    return base64.urlsafe_b64encode(codec.dumps(list(key))).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Key:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        stamp, stem, offset = codec.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:  # bad base64, bad JSON or wrong shape
+        raise ValueError(f"invalid cursor: {cursor!r}") from exc
+    if not (isinstance(stamp, str) and isinstance(stem, str) and isinstance(offset, int)):
+        raise ValueError(f"invalid cursor: {cursor!r}")
+    return stamp, stem, offset
+
+
+def segment_stem(path: Path) -> str:
+    name = path.name
+    for suffix in (ACTIVE_SUFFIX, SEALED_SUFFIX):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+class SegmentIndex:
+    """Blocks and postings of one segment, extendable as the segment grows."""
+
+    def __init__(self, stem: str, block_lines: int) -> None:
+        self.stem = stem
+        self.block_lines = block_lines
+        self.size = 0  # bytes indexed (always a line boundary)
+        self.lines = 0
+        self.min: Optional[str] = None
+        self.max: Optional[str] = None
+        # [min received_at, max received_at, start offset, end offset, lines]
+        self.blocks: List[List[Any]] = []
+        self.postings: Dict[str, Dict[str, List[int]]] = {"device_id": {}, "event_type": {}}
+
+    def extend(self, path: Path) -> None:
+        """Index complete lines appended to path since the last call."""
+        with path.open("rb") as fp:
+            fp.seek(self.size)
+            data = fp.read()
+        offset = self.size
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # torn or still being written; picked up next time
+            self._add(line[:-1], offset)
+            offset += len(line)
+        self.size = offset
+
+    def _add(self, line: bytes, offset: int) -> None:
+        stamp = received_at(line).decode("utf-8")
+        block = self.blocks[-1] if self.blocks and self.blocks[-1][4] < self.block_lines else None
+        if block is None:
+            block = [stamp, stamp, offset, offset, 0]
+            self.blocks.append(block)
+        block[0] = min(block[0], stamp)
+        block[1] = max(block[1], stamp)
+        block[3] = offset + len(line) + 1
+        block[4] += 1
+        self.min = stamp if self.min is None else min(self.min, stamp)
+        self.max = stamp if self.max is None else max(self.max, stamp)
+        self.lines += 1
+        try:
+            event = codec.loads(line).get("event") or {}
+        except (json.JSONDecodeError, AttributeError):
+            return
+        for field, postings in self.postings.items():
+            value = event.get(field) if isinstance(event, dict) else None
+            if isinstance(value, str):
+                postings.setdefault(value, []).append(offset)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "min": self.min, "max": self.max, "lines": self.lines, "size": self.size}
+
+    def dump(self, path: Path) -> None:
+        """Write the sidecar atomically: summary line, then blocks and postings."""
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        body = codec.dumps({"blocks": self.blocks, "postings": self.postings})
+        tmp.write_bytes(codec.dumps(self.summary()) + b"\n" + body + b"\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, stem: str, path: Path, block_lines: int) -> "SegmentIndex":
+        with path.open("rb") as fp:
+            summary = codec.loads(fp.readline())
+            body = codec.loads(fp.readline())
+        index = cls(stem, block_lines)
+        index.size, index.lines = summary["size"], summary["lines"]
+        index.min, index.max = summary["min"], summary["max"]
+        index.blocks, index.postings = body["blocks"], body["postings"]
+        return index
+
+
+def read_summary(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with path.open("rb") as fp:
+            summary = codec.loads(fp.readline())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return summary if isinstance(summary, dict) and summary.get("version") == INDEX_VERSION else None
+
+
+class EventIndex:
+    def __init__(
+        self, store: EventStore, block_lines: int = 128, max_cached: int = 64, archive: Optional[Archive] = None
+    ) -> None:
+        self.store = store
+        self.archive = archive
+        self.block_lines = max(1, block_lines)
+        self.max_cached = max_cached
+        self._active: Dict[str, SegmentIndex] = {}
+        self._sealed: "OrderedDict[str, SegmentIndex]" = OrderedDict()  # LRU of loaded sidecars
+        self._ranges: Dict[str, Tuple[Optional[str], Optional[str]]] = {}  # sealed stem -> (min, max)
+        self._lock = threading.RLock()
+
+    def query(
+        self,
+        device_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        after: Optional[Key] = None,
+    ) -> Iterator[Tuple[Key, bytes]]:
+        """Stored lines matching every given filter, oldest first, strictly after the cursor key."""
+        lower = since or ""
+        if after is not None and after[0] > lower:
+            lower = after[0]
+        streams = []
+        paths = self.store.segments()
+        # Opened after listing segments: a segment archived in between is read from the archive.
+        archived = self.archive.snapshot() if self.archive is not None else []
+        complete, partial = Archive.complete_sources(archived)
+        for archive_file in archived:
+            if archive_file.might_match(archive_file.header["stats"], device_id, event_type, lower, until):
+                streams.append(archive_file.scan(device_id, event_type, since, until, after, partial))
+            else:
+                archive_file.close()
+        for path in paths:
+            stem = segment_stem(path)
+            if stem in complete:
+                continue
+            lo, hi = self._range(stem, path)
+            if lo is None or hi < lower or (until is not None and lo > until):
+                continue
+            streams.append(self._scan(path, stem, device_id, event_type, since, until, after, lower))
+        for key, line in heapq.merge(*streams):
+            yield key, line
+
+    def segment(self, path: Path) -> Optional[SegmentIndex]:
+        """Up-to-date index of one segment; None if the segment is gone."""
+        return self._locate(path)[0]
+
+    def _locate(self, path: Path) -> Tuple[Optional[SegmentIndex], Path]:
+        """Index and current path of a segment, following an active segment sealed since it was listed."""
+        stem = segment_stem(path)
+        with self._lock:
+            if path.name.endswith(ACTIVE_SUFFIX):
+                try:
+                    index = self._active.setdefault(stem, SegmentIndex(stem, self.block_lines))
+                    index.extend(path)
+                    return index, path
+                except FileNotFoundError:
+                    path = path.with_name(stem + SEALED_SUFFIX)
+            try:
+                return self._sealed_index(stem, path), path
+            except FileNotFoundError:  # compacted or removed since it was listed
+                self._active.pop(stem, None)
+                self._sealed.pop(stem, None)
+                self._ranges.pop(stem, None)
+                return None, path
+
+    def _range(self, stem: str, path: Path) -> Tuple[Optional[str], Optional[str]]:
+        with self._lock:
+            if stem in self._ranges:
+                return self._ranges[stem]
+            if path.name.endswith(SEALED_SUFFIX):
+                summary = read_summary(path.with_name(stem + INDEX_SUFFIX))
+                if summary is not None:
+                    self._ranges[stem] = (summary["min"], summary["max"])
+                    return self._ranges[stem]
+            index = self.segment(path)
+            if index is None:
+                return None, None
+            return index.min, index.max
+
+    def _sealed_index(self, stem: str, path: Path) -> SegmentIndex:
+        # Caller holds self._lock.
+        index = self._sealed.get(stem)
+        if index is not None:
+            self._sealed.move_to_end(stem)
+            return index
+        sidecar = path.with_name(stem + INDEX_SUFFIX)
+        if read_summary(sidecar) is not None:
+            index = SegmentIndex.load(stem, sidecar, self.block_lines)
+        else:
+            # Sealed since we last looked (or never indexed): finish the tail, then persist.
+            index = self._active.pop(stem, None) or SegmentIndex(stem, self.block_lines)
+            index.extend(path)
+            index.dump(sidecar)
+        self._ranges[stem] = (index.min, index.max)
+        self._sealed[stem] = index
+        while len(self._sealed) > self.max_cached:
+            self._sealed.popitem(last=False)
+        return index
+
+    def _scan(
+        self,
+        path: Path,
+        stem: str,
+        device_id: Optional[str],
+        event_type: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        after: Optional[Key],
+        lower: str,
+    ) -> Iterator[Tuple[Key, bytes]]:
+        index, path = self._locate(path)
+        if index is None:
+            return
+        postings: Optional[List[int]] = None
+        with self._lock:  # another query may be extending this index
+            blocks = [list(b) for b in index.blocks if b[1] >= lower and (until is None or b[0] <= until)]
+            for field, value in (("device_id", device_id), ("event_type", event_type)):
+                if value is None:
+                    continue
+                found = index.postings[field].get(value, [])
+                if postings is None or len(found) < len(postings):
+                    postings = list(found)
+        if not blocks or postings == []:
+            return
+        # Lines are only roughly time-ordered, so hold matches in a heap and release one
+        # once no remaining block can start earlier than it.
+        floor = [""] * len(blocks)
+        running = None
+        for i in range(len(blocks) - 1, -1, -1):
+            running = blocks[i][0] if running is None else min(running, blocks[i][0])
+            floor[i] = running
+        pending: List[Tuple[Key, bytes]] = []
+        try:
+            fp = path.open("rb")
+        except FileNotFoundError:
+            try:  # sealed after _locate(); offsets are unchanged by the rename
+                fp = path.with_name(stem + SEALED_SUFFIX).open("rb")
+            except FileNotFoundError:
+                return
+        with fp:
+            i = 0
+            while i < len(blocks) or pending:
+                while i < len(blocks) and (not pending or floor[i] <= pending[0][0][0]):
+                    for offset, line in self._block_lines(fp, blocks[i], postings):
+                        key = (received_at(line).decode("utf-8"), stem, offset)
+                        if self._matches(key, line, device_id, event_type, since, until, after):
+                            heapq.heappush(pending, (key, line))
+                    i += 1
+                if pending:
+                    yield heapq.heappop(pending)
+
+    @staticmethod
+    def _block_lines(fp, block: List[Any], postings: Optional[List[int]]) -> Iterator[Tuple[int, bytes]]:
+        start, end = block[2], block[3]
+        if postings is None:
+            fp.seek(start)
+            offset = start
+            for line in fp.read(end - start).splitlines(keepends=True):
+                yield offset, line.rstrip(b"\n")
+                offset += len(line)
+            return
+        for n in range(bisect.bisect_left(postings, start), bisect.bisect_left(postings, end)):
+            fp.seek(postings[n])
+            yield postings[n], fp.readline().rstrip(b"\n")
+
+    @staticmethod
+    def _matches(
+        key: Key,
+        line: bytes,
+        device_id: Optional[str],
+        event_type: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        after: Optional[Key],
+    ) -> bool:
+        if (since is not None and key[0] < since) or (until is not None and key[0] > until):
+            return False
+        if after is not None and key <= after:
+            return False
+        if device_id is None and event_type is None:
+            return True
+        try:
+            event = codec.loads(line).get("event") or {}
+        except (json.JSONDecodeError, AttributeError):
+            return False
+        if device_id is not None and event.get("device_id") != device_id:
+            return False
+        return event_type is None or event.get("event_type") == event_type
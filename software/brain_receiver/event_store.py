@@ -0,0 +1,259 @@
+"""
+Append-only event store for Brain Receiver, safe with several worker processes.
+- Every process appends to its own active segment (events-<opened>-<pid>.ndjson.active),
+  so lines written by different gunicorn workers never interleave
+- A batch is one os.write() on an O_APPEND descriptor; with fsync enabled, concurrent
+  batches in one process share a single fsync (group commit)
+- Segments roll at segment_max_bytes or after segment_max_seconds; a rolled segment is
+  renamed to .ndjson and never written again
+- seal_orphans() seals active segments left by processes that are gone, dropping a
+  torn last line
+- iter_lines() reads all segments merged by received_at
+
+Run `python event_store.py cat [--dir DIR]` to print the merged event log.
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+SEGMENT_PREFIX = "events-"
+SEALED_SUFFIX = ".ndjson"
+ACTIVE_SUFFIX = ".ndjson.active"
+_RECEIVED_AT = b'{"received_at":"'
+
+
+def received_at(line: bytes) -> bytes:
+    """Sort key of a stored line: its received_at value (ISO-8601 UTC sorts as text)."""
+    if line.startswith(_RECEIVED_AT):
+        end = line.find(b'"', len(_RECEIVED_AT))
+        if end > 0:
+            return line[len(_RECEIVED_AT) : end]
+    return b""
+
+
+def _writer_pid(path: Path) -> Optional[int]:
+    stem = path.name[: -len(ACTIVE_SUFFIX)]
+    try:
+        return int(stem.rsplit("-", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _sealed_path(path: Path) -> Path:
+    return path.with_name(path.name[: -len(ACTIVE_SUFFIX)] + SEALED_SUFFIX)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class EventStore:
+    def __init__(
+        self,
+        directory: Path,
+        segment_max_bytes: int = 16_000_000,
+        segment_max_seconds: float = 3600.0,
+        fsync: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_seconds = segment_max_seconds
+        self.fsync = fsync
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._path: Optional[Path] = None
+        self._pid = 0
+        self._size = 0
+        self._opened_at = 0.0
+        self._writes = 0  # batches written so far
+        self._synced = 0  # batches covered by the last fsync
+
+    # -- writing --------------------------------------------------------------
+
+    def append(self, lines: List[str]) -> None:
+        """Append log lines (no trailing newlines) with a single write; raises OSError on failure."""
+        if not lines:
+            return
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        with self._lock:
+            fd = self._writable(len(data))
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            self._size += len(data)
+            self._writes += 1
+            ticket = self._writes
+        if self.fsync:
+            self._sync(ticket)
+
+    def seal(self) -> None:
+        """Close the active segment so it becomes immutable; the next append opens a new one."""
+        with self._lock:
+            self._seal_locked()
+
+    close = seal
+
+    # -- reading --------------------------------------------------------------
+
+    def segments(self) -> List[Path]:
+        """All segments, sealed and active, oldest first."""
+        paths = [
+            path
+            for path in self.directory.glob(f"{SEGMENT_PREFIX}*")
+            if path.name.endswith(SEALED_SUFFIX) or path.name.endswith(ACTIVE_SUFFIX)
+        ]
+        return sorted(paths, key=lambda path: path.name)
+
+    def sealed_segments(self) -> List[Path]:
+        return [path for path in self.segments() if path.name.endswith(SEALED_SUFFIX)]
+
+    def iter_lines(self, paths: Optional[List[Path]] = None) -> Iterator[bytes]:
+        """Complete lines from the given segments (default: all), merged by received_at."""
+        streams = [self._read_lines(path) for path in (paths if paths is not None else self.segments())]
+        for _, line in heapq.merge(*streams, key=lambda item: item[0]):
+            yield line
+
+    def seal_orphans(self) -> int:
+        """Seal active segments whose writer process no longer exists; run once at startup."""
+        sealed = 0
+        for path in self.directory.glob(f"{SEGMENT_PREFIX}*{ACTIVE_SUFFIX}"):
+            pid = _writer_pid(path)
+            if path == self._path or (pid is not None and pid != os.getpid() and _pid_alive(pid)):
+                continue
+            try:
+                self._repair_tail(path)
+                os.replace(path, _sealed_path(path))
+            except FileNotFoundError:  # another worker sealed it first
+                continue
+            sealed += 1
+        return sealed
+
+    # -- internals ------------------------------------------------------------
+
+    def _writable(self, incoming: int) -> int:
+        if self._fd is not None and self._pid != os.getpid():
+            # Forked after the parent opened a segment: never share its descriptor.
+            self._fd = None
+            self._path = None
+        if self._fd is not None:
+            too_big = self._size and self._size + incoming > self.segment_max_bytes
+            too_old = self._clock() - self._opened_at >= self.segment_max_seconds
+            if too_big or too_old:
+                self._seal_locked()
+        if self._fd is None:
+            self._open_locked()
+        assert self._fd is not None
+        return self._fd
+
+    def _open_locked(self) -> None:
+        now = self._clock()
+        stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        self._pid = os.getpid()
+        attempt = 0
+        while True:
+            name = f"{SEGMENT_PREFIX}{stamp}{f'_{attempt}' if attempt else ''}-{self._pid}"
+            path = self.directory / (name + ACTIVE_SUFFIX)
+            if not _sealed_path(path).exists():
+                try:
+                    self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o644)
+                    break
+                except FileExistsError:
+                    pass
+            attempt += 1
+        self._path = path
+        self._size = 0
+        self._opened_at = now
+
+    def _seal_locked(self) -> None:
+        if self._fd is None or self._path is None:
+            return
+        if self._pid == os.getpid():
+            os.fsync(self._fd)
+            os.close(self._fd)
+            os.replace(self._path, _sealed_path(self._path))
+        self._fd = None
+        self._path = None
+
+    def _sync(self, ticket: int) -> None:
+        with self._sync_lock:
+            if self._synced >= ticket:
+                return
+            with self._lock:
+                covered = self._writes
+                # fsync a duplicate: a roll may close self._fd (and its number be reused)
+                # while we sync outside the lock. A segment rolled since our write was
+                # already fsynced on close.
+                fd = os.dup(self._fd) if self._fd is not None else None
+            if fd is not None:
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self._synced = covered
+
+    @staticmethod
+    def _repair_tail(path: Path) -> None:
+        with path.open("r+b") as fp:
+            size = fp.seek(0, os.SEEK_END)
+            if not size:
+                return
+            end = size
+            while end > 0:
+                # Walk back in chunks to the last newline, however long the torn line is.
+                start = max(0, end - 65536)
+                fp.seek(start)
+                chunk = fp.read(end - start)
+                if end == size and chunk.endswith(b"\n"):
+                    return
+                cut = chunk.rfind(b"\n")
+                if cut >= 0:
+                    fp.truncate(start + cut + 1)
+                    return
+                end = start
+            fp.truncate(0)
+
+    @staticmethod
+    def _read_lines(path: Path) -> Iterator[Tuple[bytes, bytes]]:
+        try:
+            fp = path.open("rb")
+        except FileNotFoundError:  # sealed or compacted since it was listed
+            return
+        with fp:
+            for line in fp:
+                if line.endswith(b"\n"):
+                    yield received_at(line), line[:-1]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    default_dir = Path(__file__).resolve().parents[2] / "logs" / "events"
+    parser = argparse.ArgumentParser(description="Inspect the Brain Receiver event store.")
+    parser.add_argument("command", choices=["cat"])
+    parser.add_argument("--dir", type=Path, default=Path(os.environ.get("BRAIN_RECEIVER_EVENTS_DIR", default_dir)))
+    args = parser.parse_args(argv)
+    out = sys.stdout.buffer
+    for line in EventStore(args.dir).iter_lines():
+        out.write(line + b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
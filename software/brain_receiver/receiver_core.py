@@ -0,0 +1,231 @@
+"""
+Brain Receiver core shared by the Flask app (app.py) and the ASGI app (asgi_app.py).
+- Event schema validator, event store, index, archive and compactor configured from env;
+  importing touches no segment and starts no thread, start_background() does both
+- Log line formatting and per-item batch validation
+- Query parameter parsing and the streamed JSON page of GET /events
+- NdjsonReader: incremental NDJSON parsing with a running body hash, so a batch can be
+  validated while its body is still arriving
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from jsonschema import FormatChecker, ValidationError
+
+import codec
+from event_archive import Archive, Compactor
+from event_index import EventIndex, Key, decode_cursor, encode_cursor
+from event_store import EventStore
+from event_validator import build_validator
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "contracts" / "event.schema.json"
+if not SCHEMA_PATH.exists():
+    raise RuntimeError(f"Event schema not found at {SCHEMA_PATH}")
+
+with SCHEMA_PATH.open("r", encoding="utf-8") as schema_file:
+    EVENT_SCHEMA: Dict[str, Any] = json.load(schema_file)
+
+VALIDATOR = build_validator(EVENT_SCHEMA, format_checker=FormatChecker())
+
+# The store lives at repo_root/logs/events/ regardless of where the service runs from.
+EVENTS_DIR = Path(
+    os.environ.get("BRAIN_RECEIVER_EVENTS_DIR", str(Path(__file__).resolve().parents[2] / "logs" / "events"))
+)
+store = EventStore(
+    EVENTS_DIR,
+    segment_max_bytes=int(os.environ.get("BRAIN_RECEIVER_SEGMENT_BYTES", "16000000")),
+    segment_max_seconds=float(os.environ.get("BRAIN_RECEIVER_SEGMENT_SECONDS", "3600")),
+    fsync=os.environ.get("BRAIN_RECEIVER_FSYNC", "0") == "1",
+)
+archive = Archive(EVENTS_DIR / "archive", period=os.environ.get("BRAIN_RECEIVER_ARCHIVE_PERIOD", "hour"))
+index = EventIndex(store, archive=archive)
+
+# Every worker runs a compactor; a lock file lets one of them work at a time.
+compactor = Compactor(store, archive, interval=float(os.environ.get("BRAIN_RECEIVER_COMPACT_SECONDS", "300")))
+_started = False
+_start_lock = threading.Lock()
+
+QUERY_DEFAULT_LIMIT = 100
+QUERY_MAX_LIMIT = 1000
+
+Item = Tuple[Any, Optional[bytes]]  # (event or JSONDecodeError, raw line or None)
+
+
+def start_background() -> None:
+    """Seal segments left by dead workers and start the compactor; once per process."""
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        store.seal_orphans()
+        if compactor.interval > 0:
+            compactor.start()
+        _started = True
+
+
+def stop_background() -> None:
+    global _started
+    with _start_lock:
+        compactor.stop()
+        _started = False
+
+
+def build_log_entry(payload: Dict[str, Any], request_id: str) -> Dict[str, Any]:
+    """Wrap payload with server-side timestamp and request correlation."""
+    return {
+        "received_at": datetime.now(timezone.utc).isoformat(),
+        "request_id": request_id,
+        "event": payload,
+    }
+
+
+def format_log_line(payload: Dict[str, Any], request_id: str, raw: Optional[bytes] = None) -> str:
+    """One NDJSON line for the event log, matching build_log_entry.
+
+    When the client's bytes fit on one line they become the "event" value verbatim,
+    so the event is never re-encoded.
+    """
+    line = codec.single_line(raw) if raw is not None else None
+    if line is None:
+        return codec.dumps_text(build_log_entry(payload, request_id))
+    head = codec.dumps_text({"received_at": datetime.now(timezone.utc).isoformat(), "request_id": request_id})
+    return f'{head[:-1]},"event":{line.decode("utf-8")}}}'
+
+
+def write_events(lines: List[str]) -> None:
+    """Append log lines to this worker's segment with one write (fsynced if BRAIN_RECEIVER_FSYNC=1)."""
+    store.append(lines)
+
+
+def validation_detail(err: ValidationError) -> str:
+    path = "/".join([str(p) for p in err.path])
+    return err.message if not path else f"{err.message} at {path}"
+
+
+def check_item(position: int, item: Item, request_id: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Per-item result of a batch and, if the event is valid, its log line."""
+    event, raw = item
+    if isinstance(event, json.JSONDecodeError):
+        return {"index": position, "ok": False, "error": "invalid_json"}, None
+    try:
+        VALIDATOR.validate(event)
+    except ValidationError as err:
+        result = {
+            "index": position,
+            "ok": False,
+            "error": "schema_validation_failed",
+            "details": validation_detail(err),
+        }
+        return result, None
+    item_request_id = f"{request_id}-{position}"
+    return {"index": position, "ok": True, "request_id": item_request_id}, format_log_line(event, item_request_id, raw)
+
+
+def batch_response(request_id: str, results: List[Dict[str, Any]], accepted: int) -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "request_id": request_id,
+        "accepted": accepted,
+        "rejected": len(results) - accepted,
+        "results": results,
+    }
+
+
+def read_ndjson(body: bytes) -> List[Item]:
+    """(event, raw line) pairs; a line that is not valid JSON yields (JSONDecodeError, None)."""
+    reader = NdjsonReader()
+    return reader.feed(body) + reader.finish()
+
+
+class NdjsonReader:
+    """Splits an NDJSON body into items as chunks arrive, hashing the bytes on the way."""
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self._tail = b""
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> List[Item]:
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        data = self._tail + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._tail = data
+            return []
+        self._tail = data[end + 1 :]
+        return [item for item in map(self._parse, data[:end].split(b"\n")) if item is not None]
+
+    def finish(self) -> List[Item]:
+        """Items from a last line without a trailing newline."""
+        tail, self._tail = self._tail, b""
+        item = self._parse(tail)
+        return [] if item is None else [item]
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[Item]:
+        line = line.rstrip(b"\r")
+        if not line.strip():
+            return None
+        try:
+            return codec.loads(line), line
+        except json.JSONDecodeError as exc:
+            return exc, None
+
+
+def parse_time(name: str, value: Optional[str]) -> Optional[str]:
+    """ISO-8601 query parameter normalised to the received_at format (UTC isoformat)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO-8601 timestamp") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def parse_query(args: Mapping[str, str]) -> Tuple[Dict[str, Any], int]:
+    """EventIndex.query() arguments and the page size from GET /events parameters; raises ValueError."""
+    limit = int(args.get("limit", QUERY_DEFAULT_LIMIT))
+    if not 1 <= limit <= QUERY_MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {QUERY_MAX_LIMIT}")
+    cursor = args.get("cursor")
+    filters = {
+        "device_id": args.get("device_id") or None,
+        "event_type": args.get("event_type") or None,
+        "since": parse_time("since", args.get("since")),
+        "until": parse_time("until", args.get("until")),
+        "after": decode_cursor(cursor) if cursor else None,
+    }
+    return filters, limit
+
+
+def render_page(matches: Iterator[Tuple[Key, bytes]], limit: int) -> Iterator[bytes]:
+    """JSON page of stored lines, spliced in as-is; the cursor is only known once the page is full."""
+    yield b'{"ok":true,"events":['
+    count = 0
+    last = None
+    more = False
+    for key, line in matches:
+        if count == limit:
+            more = True
+            break
+        yield line if count == 0 else b"," + line
+        count += 1
+        last = key
+    next_cursor = encode_cursor(last) if more and last is not None else None
+    yield b'],"count":' + codec.dumps(count) + b',"next_cursor":' + codec.dumps(next_cursor) + b"}"
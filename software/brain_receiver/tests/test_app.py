@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test Brain Receiver endpoints with the Flask test client.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+# Brain Receiver runs as top-level modules from its own directory.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# Keep the store out of the working tree and the compactor out of the test process.
+os.environ.setdefault("BRAIN_RECEIVER_EVENTS_DIR", tempfile.mkdtemp(prefix="brain-receiver-tests-"))
+os.environ.setdefault("BRAIN_RECEIVER_COMPACT_SECONDS", "0")
+
+import app as receiver  # noqa: E402
+import codec  # noqa: E402
+import receiver_core  # noqa: E402
+from event_index import EventIndex  # noqa: E402
+from event_store import EventStore  # noqa: E402
+
+
+@pytest.fixture()
+def written(monkeypatch):
+    lines = []
+    monkeypatch.setattr(receiver, "_write_events", lines.extend)
+    return lines
+
+
+@pytest.fixture()
+def client():
+    return receiver.app.test_client()
+
+
+def make_event(seq=1, **overrides):
+    event = {
+        "event_version": "1.0",
+        "device_id": "dev-1",
+        "event_type": "button_press",
+        "ts": "2026-01-01T00:00:00Z",
+        "seq": seq,
+        "payload": {"pressed": True},
+    }
+    event.update(overrides)
+    return event
+
+
+def test_single_event_is_spliced_verbatim(client, written):
+    raw = b'{"event_version":"1.0","device_id":"dev-1","event_type":"x","ts":"2026-01-01T00:00:00Z","seq":1,"payload":{"b":1,  "a":2}}'
+    resp = client.post("/event", data=raw, headers={"Content-Type": "application/json", "X-Request-ID": "r1"})
+    assert resp.status_code == 200
+    [line] = written
+    assert line.endswith(',"event":' + raw.decode() + "}")
+    entry = json.loads(line)
+    assert entry["request_id"] == "r1"
+    assert list(entry) == ["received_at", "request_id", "event"]
+
+
+def test_multiline_body_is_re_encoded(client, written):
+    resp = client.post("/event", data=json.dumps(make_event(), indent=2), content_type="application/json")
+    assert resp.status_code == 200
+    assert json.loads(written[0])["event"] == make_event()
+
+
+def test_batch_json_array(client, written):
+    resp = client.post("/events", json=[make_event(1), make_event(2, device_id="")], headers={"X-Request-ID": "b"})
+    body = resp.get_json()
+    assert body["accepted"] == 1
+    assert body["results"][1]["error"] == "schema_validation_failed"
+    assert json.loads(written[0])["request_id"] == "b-0"
+
+
+def test_batch_ndjson_with_content_hash(client, written):
+    lines = [codec.dumps(make_event(1)), b"{broken", codec.dumps(make_event(2))]
+    body = codec.join_lines(lines)
+    headers = {"Content-Type": "application/x-ndjson", codec.CONTENT_HASH_HEADER: codec.content_hash(body)}
+    resp = client.post("/events", data=body, headers=headers)
+    result = resp.get_json()
+    assert result["accepted"] == 2
+    assert result["results"][1] == {"index": 1, "ok": False, "error": "invalid_json"}
+    assert written[0].endswith(',"event":' + lines[0].decode() + "}")
+    assert written[1].endswith(',"event":' + lines[2].decode() + "}")
+
+    headers[codec.CONTENT_HASH_HEADER] = "0" * 64
+    resp = client.post("/events", data=body, headers=headers)
+    assert resp.status_code == 400
+    assert resp.get_json()["error"] == "content_hash_mismatch"
+
+
+def test_batch_is_written_once_after_validation(client, monkeypatch):
+    writes = []
+    monkeypatch.setattr(receiver, "_write_events", lambda lines: writes.append(list(lines)))
+    resp = client.post("/events", json=[make_event(1), make_event(2, device_id=""), make_event(3)])
+    assert resp.get_json()["accepted"] == 2
+    assert len(writes) == 1
+    assert [json.loads(line)["event"]["seq"] for line in writes[0]] == [1, 3]
+
+
+def test_failed_write_is_not_acknowledged(client, monkeypatch):
+    def fail(lines):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(receiver, "_write_events", fail)
+    resp = client.post("/events", json=[make_event(1)], headers={"X-Request-ID": "b"})
+    assert resp.status_code == 503
+    assert resp.get_json()["error"] == "write_failed"
+
+
+@pytest.fixture()
+def stored(tmp_path, monkeypatch):
+    store = EventStore(tmp_path)
+    monkeypatch.setattr(receiver, "_write_events", store.append)
+    monkeypatch.setattr(receiver, "_index", EventIndex(store))
+    yield store
+    store.close()
+
+
+def test_query_pages_through_stored_events(client, stored):
+    events = [make_event(n, device_id=f"dev-{n % 2}") for n in range(1, 8)]
+    assert client.post("/events", json=events).get_json()["accepted"] == 7
+    first = client.get("/events?device_id=dev-1&limit=2").get_json()
+    assert [item["event"]["seq"] for item in first["events"]] == [1, 3]
+    assert first["count"] == 2 and first["next_cursor"]
+    rest = client.get(f"/events?device_id=dev-1&limit=2&cursor={first['next_cursor']}").get_json()
+    assert [item["event"]["seq"] for item in rest["events"]] == [5, 7]
+    assert rest["next_cursor"] is None
+
+
+def test_query_time_range_and_bad_parameters(client, stored):
+    client.post("/events", json=[make_event(1)])
+    assert client.get("/events?since=2000-01-01T00:00:00Z").get_json()["count"] == 1
+    assert client.get("/events?until=2000-01-01T00:00:00").get_json()["count"] == 0
+    for query in ("since=yesterday", "limit=0", "cursor=abc"):
+        resp = client.get(f"/events?{query}")
+        assert resp.status_code == 400
+        assert resp.get_json()["error"] == "invalid_query"
+
+
+def core_line(seq):
+    return receiver_core.format_log_line(make_event(seq), f"r-{seq}")
+
+
+def test_threaded_queries_see_every_event(stored):
+    # app.run() serves requests on several threads; they share one index.
+    stored.append([core_line(n) for n in range(1, 2001)])
+    counts = []
+
+    def run():
+        counts.append(receiver.app.test_client().get("/events?limit=1000&device_id=dev-1").get_json()["count"])
+
+    threads = [threading.Thread(target=run) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert counts == [1000] * 6
+
+
+def test_orphans_are_sealed_on_the_first_request_not_at_import(client, monkeypatch):
+    directory = receiver_core.store.directory
+    orphan = directory / "events-20260101T000000.000000Z-999999999.ndjson.active"
+    orphan.write_bytes(b"complete\n")
+    monkeypatch.setattr(receiver_core, "_started", False)
+    assert orphan.exists()
+    client.get("/health")
+    assert not orphan.exists()
+    assert (directory / "events-20260101T000000.000000Z-999999999.ndjson").read_bytes() == b"complete\n"
+    (directory / "events-20260101T000000.000000Z-999999999.ndjson").unlink()
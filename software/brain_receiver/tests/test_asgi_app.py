@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the ASGI Brain Receiver with httpx against the app in-process.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Brain Receiver runs as top-level modules from its own directory.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# Keep the store out of the working tree and the compactor out of the test process.
+os.environ.setdefault("BRAIN_RECEIVER_EVENTS_DIR", tempfile.mkdtemp(prefix="brain-receiver-tests-"))
+os.environ.setdefault("BRAIN_RECEIVER_COMPACT_SECONDS", "0")
+
+import asgi_app  # noqa: E402
+import codec  # noqa: E402
+import receiver_core  # noqa: E402
+from event_index import EventIndex  # noqa: E402
+from event_store import EventStore  # noqa: E402
+
+
+@pytest.fixture()
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture()
+def written(monkeypatch):
+    lines = []
+    monkeypatch.setattr(asgi_app, "_write_events", lines.extend)
+    return lines
+
+
+@pytest.fixture()
+async def client():
+    transport = httpx.ASGITransport(app=asgi_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://receiver") as client:
+        yield client
+
+
+def make_event(seq=1, **overrides):
+    event = {
+        "event_version": "1.0",
+        "device_id": "dev-1",
+        "event_type": "button_press",
+        "ts": "2026-01-01T00:00:00Z",
+        "seq": seq,
+        "payload": {"pressed": True},
+    }
+    event.update(overrides)
+    return event
+
+
+def test_ndjson_reader_handles_lines_split_across_chunks():
+    reader = receiver_core.NdjsonReader()
+    assert reader.feed(b'{"a":1}\n{"b"') == [({"a": 1}, b'{"a":1}')]
+    items = reader.feed(b':2}\r\n\nnot json\n{"c":3}')
+    assert items[0] == ({"b": 2}, b'{"b":2}')
+    assert isinstance(items[1][0], json.JSONDecodeError) and len(items) == 2
+    assert reader.finish() == [({"c": 3}, b'{"c":3}')]
+    assert reader.hexdigest() == codec.content_hash(b'{"a":1}\n{"b":2}\r\n\nnot json\n{"c":3}')
+
+
+@pytest.mark.anyio
+async def test_single_event_and_health(client, written):
+    assert (await client.get("/health")).json() == {"ok": True, "status": "ready"}
+    resp = await client.post("/event", content=json.dumps(make_event()), headers={"X-Request-ID": "one"})
+    assert resp.json() == {"ok": True, "request_id": "one"}
+    assert json.loads(written[0])["event"]["seq"] == 1
+    resp = await client.post("/event", json=make_event(device_id=""))
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "schema_validation_failed"
+
+
+@pytest.mark.anyio
+async def test_streamed_ndjson_is_validated_before_the_body_ends(client, written, monkeypatch):
+    order = []
+    check_item = receiver_core.check_item
+
+    def tracking(position, item, request_id):
+        order.append(f"check {position}")
+        return check_item(position, item, request_id)
+
+    monkeypatch.setattr(receiver_core, "check_item", tracking)
+    lines = [codec.dumps(make_event(n)) for n in range(1, 4)] + [b"{broken"]
+    body = b"\n".join(lines) + b"\n"
+
+    async def stream():
+        for start in range(0, len(body), 37):  # chunk edges fall inside lines
+            order.append("chunk")
+            yield body[start : start + 37]
+
+    headers = {"Content-Type": "application/x-ndjson", codec.CONTENT_HASH_HEADER: codec.content_hash(body)}
+    resp = await client.post("/events", content=stream(), headers={**headers, "X-Request-ID": "b"})
+    data = resp.json()
+    assert (data["accepted"], data["rejected"]) == (3, 1)
+    assert data["results"][3] == {"index": 3, "ok": False, "error": "invalid_json"}
+    last_chunk = max(i for i, step in enumerate(order) if step == "chunk")
+    assert order.index("check 0") < last_chunk
+    assert [json.loads(line)["request_id"] for line in written] == ["b-0", "b-1", "b-2"]
+
+
+@pytest.mark.anyio
+async def test_hash_mismatch_writes_nothing(client, written):
+    body = codec.dumps(make_event()) + b"\n"
+    headers = {"Content-Type": "application/x-ndjson", codec.CONTENT_HASH_HEADER: "0" * 64}
+    resp = await client.post("/events", content=body, headers=headers)
+    assert resp.status_code == 400
+    assert resp.json()["error"] == "content_hash_mismatch"
+    assert written == []
+
+
+@pytest.mark.anyio
+async def test_json_array_batch_and_oversized_body(client, written, monkeypatch):
+    resp = await client.post("/events", json=[make_event(1), make_event("x")])
+    assert (resp.json()["accepted"], resp.json()["rejected"]) == (1, 1)
+    monkeypatch.setattr(asgi_app, "MAX_BODY_BYTES", 10)
+    body = b"\n".join([codec.dumps(make_event())] * 2)
+    resp = await client.post("/events", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 413
+    assert len(written) == 1
+
+
+@pytest.mark.anyio
+async def test_failed_write_is_not_acknowledged(client, monkeypatch):
+    def fail(lines):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(asgi_app, "_write_events", fail)
+    resp = await client.post("/events", json=[make_event(1)], headers={"X-Request-ID": "b"})
+    assert resp.status_code == 503
+    assert resp.json() == {"ok": False, "error": "write_failed", "request_id": "b"}
+
+
+@pytest.mark.anyio
+async def test_query_shares_the_store(client, tmp_path, monkeypatch):
+    store = EventStore(tmp_path)
+    monkeypatch.setattr(asgi_app, "_write_events", store.append)
+    monkeypatch.setattr(asgi_app, "_index", EventIndex(store))
+    await client.post("/events", json=[make_event(n, device_id=f"dev-{n % 2}") for n in range(1, 6)])
+    page = (await client.get("/events", params={"device_id": "dev-1", "limit": 2})).json()
+    assert [item["event"]["seq"] for item in page["events"]] == [1, 3]
+    rest = (await client.get("/events", params={"device_id": "dev-1", "cursor": page["next_cursor"]})).json()
+    assert [item["event"]["seq"] for item in rest["events"]] == [5]
+    assert (await client.get("/events", params={"limit": "0"})).status_code == 400
+    store.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the columnar archive: compaction, statistics, transparent queries and crash recovery.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Brain Receiver runs as top-level modules from its own directory.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import event_archive  # noqa: E402
+from event_archive import Archive, ArchiveFile, Compactor, segment_lines  # noqa: E402
+from event_index import EventIndex, decode_cursor, encode_cursor  # noqa: E402
+from event_store import EventStore  # noqa: E402
+
+
+def stamp(minute, second=0):
+    return f"2026-01-01T{minute // 60:02d}:{minute % 60:02d}:{second:02d}+00:00"
+
+
+def entry(minute, device="dev-1", event_type="button_press", raw=None):
+    event = raw or json.dumps({"device_id": device, "event_type": event_type, "seq": minute}, separators=(",", ":"))
+    return f'{{"received_at":"{stamp(minute)}","request_id":"r-{minute}","event":{event}}}'
+
+
+def seqs(results):
+    return [json.loads(line)["event"]["seq"] for _, line in results]
+
+
+@pytest.fixture()
+def store(tmp_path):
+    store = EventStore(tmp_path / "events")
+    yield store
+    store.close()
+
+
+@pytest.fixture()
+def archive(tmp_path):
+    return Archive(tmp_path / "events" / "archive", group_rows=16)
+
+
+def test_compaction_splits_by_hour_and_keeps_lines_byte_for_byte(store, archive):
+    lines = [entry(m, device=f"dev-{m % 4}") for m in range(0, 150, 3)]
+    lines.append(entry(151, raw='{"device_id": "dev-9", "seq": 151}'))  # client spacing survives
+    store.append(lines)
+    store.seal()
+    before = sorted(line for _, line in segment_lines(store.sealed_segments()[0]))
+    stem = store.sealed_segments()[0].name[: -len(".ndjson")]
+    assert Compactor(store, archive).run_once() == {"retired": 0, "segments": 1, "rows": 51}
+    assert [path.name for path in archive.files()] == [
+        f"2026-01-01T00.{stem}.colz",
+        f"2026-01-01T01.{stem}.colz",
+        f"2026-01-01T02.{stem}.colz",
+    ]
+    rows = [line for path in archive.files() for line in map(event_archive.join_row, ArchiveFile(path).rows())]
+    assert sorted(rows) == before
+
+
+def test_later_segments_add_files_without_rewriting_earlier_ones(store, archive):
+    store.append([entry(1), entry(2)])
+    store.seal()
+    compactor = Compactor(store, archive)
+    compactor.run_once()
+    first = archive.files()[0]
+    written = (first.stat().st_ino, first.stat().st_mtime_ns)
+    store.append([entry(3)])
+    store.seal()
+    assert compactor.run_once() == {"retired": 1, "segments": 1, "rows": 1}
+    assert len(archive.files()) == 2
+    assert (first.stat().st_ino, first.stat().st_mtime_ns) == written
+    assert seqs(EventIndex(store, archive=archive).query()) == [1, 2, 3]
+
+
+def test_header_statistics_cover_every_row_group(store, archive):
+    store.append([entry(m, device=f"dev-{m:02d}") for m in range(40)])
+    store.seal()
+    Compactor(store, archive).run_once()
+    header = ArchiveFile(archive.files()[0]).header
+    assert header["rows"] == 40
+    assert header["stats"]["device_id"] == ["dev-00", "dev-39"]
+    assert header["stats"]["seq"] == [0, 39]
+    assert [group["stats"]["received_at"] for group in header["groups"]][0] == [stamp(0), stamp(15)]
+
+
+def test_queries_read_archive_and_segments_together(store, archive):
+    store.append([entry(m, device=f"dev-{m % 2}") for m in range(10)])
+    store.seal()
+    index = EventIndex(store, archive=archive)
+    page = list(index.query(device_id="dev-1"))[:2]
+    Compactor(store, archive).run_once()
+    store.append([entry(m, device=f"dev-{m % 2}") for m in range(10, 14)])
+    assert seqs(index.query(device_id="dev-1")) == [1, 3, 5, 7, 9, 11, 13]
+    assert seqs(index.query(since=stamp(8), until=stamp(11))) == [8, 9, 10, 11]
+    # A cursor taken before compaction still points at the same place.
+    after = decode_cursor(encode_cursor(page[-1][0]))
+    assert seqs(index.query(device_id="dev-1", after=after)) == [5, 7, 9, 11, 13]
+
+
+def test_archived_segment_is_deleted_on_the_next_run(store, archive):
+    store.append([entry(1)])
+    store.seal()
+    compactor = Compactor(store, archive)
+    compactor.run_once()
+    assert len(store.sealed_segments()) == 1
+    assert compactor.run_once()["retired"] == 1
+    assert store.sealed_segments() == []
+    assert seqs(EventIndex(store, archive=archive).query()) == [1]
+
+
+def test_interrupted_compaction_neither_loses_nor_duplicates(store, archive, monkeypatch):
+    store.append([entry(10), entry(70), entry(130)])
+    store.seal()
+    writes = []
+    original = event_archive.write_archive
+
+    def crash_after_first(*args, **kwargs):
+        if writes:
+            raise OSError("disk full")
+        writes.append(args[0])
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(event_archive, "write_archive", crash_after_first)
+    with pytest.raises(OSError):
+        Compactor(store, archive).run_once()
+    index = EventIndex(store, archive=archive)
+    assert seqs(index.query()) == [10, 70, 130]
+    monkeypatch.setattr(event_archive, "write_archive", original)
+    Compactor(store, archive).run_once()
+    Compactor(store, archive).run_once()
+    assert store.sealed_segments() == []
+    assert seqs(index.query()) == [10, 70, 130]
+
+
+def test_archive_is_much_smaller_than_the_segments(store, archive):
+    lines = []
+    for n in range(5000):
+        event = {
+            "event_version": "1.0",
+            "device_id": f"esp32-hands-{n % 20:03d}",
+            "event_type": "button_press",
+            "ts": f"2026-01-01T00:{n // 100 % 60:02d}:{n % 60:02d}Z",
+            "seq": n,
+            "payload": {"button": "MENU", "state": "pressed", "ts_ms": 1000 + n},
+        }
+        lines.append(
+            json.dumps(
+                {"received_at": f"2026-01-01T00:{n // 100 % 60:02d}:{n % 60:02d}.{n:06d}+00:00",
+                 "request_id": f"{n:032x}-{n % 100}", "event": event},
+                separators=(",", ":"),
+            )
+        )
+    store.append(lines)
+    store.seal()
+    size = store.sealed_segments()[0].stat().st_size
+    Compactor(store, Archive(archive.directory)).run_once()
+    assert size / sum(path.stat().st_size for path in archive.files()) >= 10
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test the event store index: block pruning, postings, sidecars and cursor paging.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Brain Receiver runs as top-level modules from its own directory.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import event_index  # noqa: E402
+from event_index import EventIndex, decode_cursor, encode_cursor  # noqa: E402
+from event_store import EventStore  # noqa: E402
+
+
+def stamp(second):
+    return f"2026-01-01T00:{second // 60:02d}:{second % 60:02d}+00:00"
+
+
+def entry(second, device="dev-1", event_type="button_press"):
+    event = {"device_id": device, "event_type": event_type, "seq": second}
+    return json.dumps({"received_at": stamp(second), "request_id": f"r-{second}", "event": event}, separators=(",", ":"))
+
+
+def seconds(results):
+    return [json.loads(line)["event"]["seq"] for _, line in results]
+
+
+@pytest.fixture()
+def store(tmp_path):
+    store = EventStore(tmp_path)
+    yield store
+    store.close()
+
+
+def test_query_filters_by_device_type_and_time(store):
+    store.append([entry(s, device=f"dev-{s % 3}", event_type="heartbeat" if s % 2 else "button_press") for s in range(60)])
+    index = EventIndex(store, block_lines=8)
+    assert seconds(index.query(device_id="dev-1")) == list(range(1, 60, 3))
+    assert seconds(index.query(device_id="dev-1", event_type="heartbeat")) == list(range(1, 60, 6))
+    assert seconds(index.query(since=stamp(10), until=stamp(14))) == [10, 11, 12, 13, 14]
+    assert list(index.query(device_id="nobody")) == []
+
+
+def test_query_reads_only_matching_blocks(store, monkeypatch):
+    store.append([entry(s) for s in range(1000)])
+    index = EventIndex(store, block_lines=10)
+    list(index.query())  # build the index
+    reads = []
+    original = EventIndex._block_lines
+
+    def counting(fp, block, postings):
+        reads.append(block[2])
+        return original(fp, block, postings)
+
+    monkeypatch.setattr(EventIndex, "_block_lines", staticmethod(counting))
+    assert seconds(index.query(since=stamp(500), until=stamp(504))) == [500, 501, 502, 503, 504]
+    assert len(reads) == 1
+
+
+def test_active_segment_is_indexed_incrementally(store):
+    index = EventIndex(store)
+    store.append([entry(1)])
+    assert seconds(index.query()) == [1]
+    store.append([entry(2), entry(3)])
+    assert seconds(index.query()) == [1, 2, 3]
+    [segment] = store.segments()
+    assert index.segment(segment).lines == 3
+
+
+def test_sealed_segment_gets_sidecar_used_by_other_readers(store, tmp_path):
+    store.append([entry(1), entry(2, device="dev-2")])
+    store.seal()
+    assert seconds(EventIndex(store).query(device_id="dev-2")) == [2]
+    [sidecar] = tmp_path.glob("*.idx")
+    assert event_index.read_summary(sidecar)["lines"] == 2
+    fresh = EventIndex(store)
+    assert seconds(fresh.query(since=stamp(2))) == [2]
+    assert list(fresh.query(until=stamp(0))) == []
+
+
+def test_query_merges_segments_in_time_order_and_pages_with_cursor(tmp_path):
+    (tmp_path / "events-20260101T000000.000000Z-1.ndjson").write_text(
+        "".join(entry(s) + "\n" for s in (0, 2, 4, 6))
+    )
+    (tmp_path / "events-20260101T000000.000000Z-2.ndjson.active").write_text(
+        "".join(entry(s) + "\n" for s in (1, 3, 5, 7)) + entry(8)[:10]
+    )
+    index = EventIndex(EventStore(tmp_path), block_lines=2)
+    page = list(index.query())[:3]
+    assert seconds(page) == [0, 1, 2]
+    cursor = encode_cursor(page[-1][0])
+    assert seconds(index.query(after=decode_cursor(cursor))) == [3, 4, 5, 6, 7]
+
+
+def test_query_tolerates_lines_slightly_out_of_order(store):
+    store.append([entry(s) for s in (0, 1, 3, 2, 5, 4, 7, 6)])
+    index = EventIndex(store, block_lines=3)
+    assert seconds(index.query()) == list(range(8))
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_concurrent_first_queries_share_one_consistent_index(store):
+    store.append([entry(s, device=f"dev-{s % 5}") for s in range(3000)])
+    index = EventIndex(store, block_lines=16)
+    barrier = threading.Barrier(8)
+    counts = []
+
+    def run(device):
+        barrier.wait()
+        counts.append(len(list(index.query(device_id=device))))
+        counts.append(len(list(index.query())))
+
+    threads = [threading.Thread(target=run, args=(f"dev-{n % 5}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    assert sorted(counts) == [600] * 8 + [3000] * 8
+    [segment] = store.segments()
+    assert index.segment(segment).lines == 3000
+    assert seconds(index.query(device_id="dev-1"))[:3] == [1, 6, 11]
+
+
+def test_segment_sealed_after_listing_is_still_read(store, monkeypatch):
+    store.append([entry(1), entry(2)])
+    listed = store.segments()
+    index = EventIndex(store)
+    assert seconds(index.query()) == [1, 2]
+    store.append([entry(3)])
+    store.seal()  # renamed to .ndjson after the query listed the .active path
+    monkeypatch.setattr(store, "segments", lambda: listed)
+    assert seconds(index.query()) == [1, 2, 3]
+    assert seconds(EventIndex(store).query(since=stamp(2))) == [2, 3]
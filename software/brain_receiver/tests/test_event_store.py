@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the Brain Receiver event store: per-process segments, rolling, sealing and merged reads.
+"""
+
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+# Brain Receiver runs as top-level modules from its own directory.
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import event_store  # noqa: E402
+from event_store import EventStore  # noqa: E402
+
+
+def line(received_at, n):
+    return f'{{"received_at":"{received_at}","request_id":"r-{n}","event":{{}}}}'
+
+
+def test_append_writes_one_active_segment(tmp_path):
+    store = EventStore(tmp_path)
+    store.append([line("2026-01-01T00:00:01+00:00", 1), line("2026-01-01T00:00:02+00:00", 2)])
+    store.append([])
+    [segment] = store.segments()
+    assert segment.name.endswith(f"-{os.getpid()}.ndjson.active")
+    assert segment.read_text().count("\n") == 2
+    assert store.sealed_segments() == []
+
+
+def test_append_fsyncs_once_per_batch(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(event_store.os, "fsync", synced.append)
+    store = EventStore(tmp_path, fsync=True)
+    store.append(["a", "b"])
+    store.append([])
+    assert len(synced) == 1
+
+
+def test_group_fsync_survives_a_roll_closing_the_segment(tmp_path, monkeypatch):
+    real_fsync = os.fsync
+    store = EventStore(tmp_path, fsync=True)
+    rolled = []
+
+    def fsync(fd):
+        if not rolled:  # another thread's append rolls the segment mid-fsync
+            rolled.append(True)
+            store.seal()
+        real_fsync(fd)
+
+    monkeypatch.setattr(event_store.os, "fsync", fsync)
+    store.append(["a"])
+    assert rolled
+    assert [path.name.endswith(".ndjson") for path in store.segments()] == [True]
+    assert list(store.iter_lines()) == [b"a"]
+
+
+def test_segment_rolls_on_size_and_age(tmp_path):
+    now = [1_000.0]
+    store = EventStore(tmp_path, segment_max_bytes=100, segment_max_seconds=60, clock=lambda: now[0])
+    store.append(["x" * 60])
+    store.append(["y" * 60])  # would exceed 100 bytes: rolls first
+    assert len(store.sealed_segments()) == 1
+    now[0] += 61
+    store.append(["z"])  # segment older than 60 s: rolls first
+    assert len(store.sealed_segments()) == 2
+    assert len(store.segments()) == 3
+    assert sorted(store.iter_lines()) == [b"x" * 60, b"y" * 60, b"z"]
+
+
+def test_seal_orphans_drops_torn_tail_and_keeps_live_writers(tmp_path):
+    dead = tmp_path / "events-20260101T000000.000000Z-999999999.ndjson.active"
+    dead.write_bytes(b"complete\npartial")
+    live = tmp_path / f"events-20260101T000000.000000Z-{os.getppid()}.ndjson.active"
+    live.write_bytes(b"busy\n")
+    store = EventStore(tmp_path)
+    assert store.seal_orphans() == 1
+    sealed = tmp_path / "events-20260101T000000.000000Z-999999999.ndjson"
+    assert sealed.read_bytes() == b"complete\n"
+    assert live.exists()
+
+
+def test_torn_line_longer_than_one_read_is_cut_at_the_previous_newline(tmp_path):
+    torn = tmp_path / "events-20260101T000000.000000Z-999999999.ndjson.active"
+    torn.write_bytes(b"first\n" + b"x" * 200_000)
+    whole = tmp_path / "events-20260101T000000.000000Z-999999998.ndjson.active"
+    whole.write_bytes(b"y" * 100_000)
+    assert EventStore(tmp_path).seal_orphans() == 2
+    assert torn.with_name(torn.name[: -len(".active")]).read_bytes() == b"first\n"
+    assert whole.with_name(whole.name[: -len(".active")]).read_bytes() == b""
+
+
+def test_iter_lines_merges_segments_by_received_at(tmp_path):
+    (tmp_path / "events-20260101T000000.000000Z-1.ndjson").write_text(
+        line("2026-01-01T00:00:01+00:00", 1) + "\n" + line("2026-01-01T00:00:04+00:00", 4) + "\n"
+    )
+    (tmp_path / "events-20260101T000000.000000Z-2.ndjson.active").write_text(
+        line("2026-01-01T00:00:02+00:00", 2) + "\n" + line("2026-01-01T00:00:03+00:00", 3) + "\n" + '{"rece'
+    )
+    store = EventStore(tmp_path)
+    stamps = [event_store.received_at(raw) for raw in store.iter_lines()]
+    assert stamps == [f"2026-01-01T00:00:0{n}+00:00".encode() for n in range(1, 5)]
+
+
+def _write_many(directory, worker, count):
+    store = EventStore(directory, segment_max_bytes=4_000)
+    for n in range(count):
+        store.append([line(f"2026-01-01T00:00:00.{n:06d}+00:00", f"{worker}-{n}") for _ in range(3)])
+    store.seal()
+
+
+def test_concurrent_processes_never_interleave_lines(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_write_many, args=(tmp_path, worker, 200)) for worker in range(3)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(30)
+        assert proc.exitcode == 0
+    store = EventStore(tmp_path)
+    lines = list(store.iter_lines())
+    assert len(lines) == 3 * 200 * 3
+    assert all(raw.startswith(b'{"received_at":"') and raw.endswith(b"{}}") for raw in lines)
+    assert store.segments() == store.sealed_segments()
+    assert [event_store.received_at(raw) for raw in lines] == sorted(event_store.received_at(raw) for raw in lines)
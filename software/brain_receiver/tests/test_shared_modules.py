@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Test that the modules Brain Receiver shares with PLA Node match PLA Node's copies.
+"""
+
+from pathlib import Path
+
+import pytest
+
+RECEIVER_DIR = Path(__file__).resolve().parents[1]
+PLA_APP_DIR = Path(__file__).resolve().parents[3] / "pla_node" / "app"
+
+
+def without_sync_note(path):
+    """Module source minus the docstring line naming the other copy."""
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if not line.startswith("Kept in sync with ")]
+
+
+@pytest.mark.parametrize("name", ["codec.py", "event_validator.py"])
+def test_module_matches_pla_node_copy(name):
+    assert without_sync_note(RECEIVER_DIR / name) == without_sync_note(PLA_APP_DIR / name)